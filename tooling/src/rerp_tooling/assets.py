@@ -0,0 +1,129 @@
+"""Build-time precompression of the ``doc/`` and ``static_site/`` image assets.
+
+Services serve their generated OpenAPI documents and static site from the
+image. Compressing them per request costs CPU on every response; shipping
+``<name>.gz`` (and ``<name>.br`` when the optional ``brotli`` package is
+installed) next to each compressible asset lets the runtime serve the
+precompressed variant directly.
+
+Variants are stored content-addressed in ``.rerp-cache/precompressed/`` and
+reused, so an unchanged asset is never compressed twice. Variants that would
+not be smaller than their source, or whose name is already taken by a source
+file, are not emitted. Every staged asset is listed
+in ``static_site/asset-manifest.json`` with its SHA-256, its size and the
+SHA-256 and size of each variant.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+
+try:
+    import brotli
+except ModuleNotFoundError:  # optional: gzip variants only
+    brotli = None
+
+MANIFEST_PATH = "static_site/asset-manifest.json"
+MIN_SIZE = 1024
+COMPRESSIBLE_SUFFIXES = frozenset(
+    {
+        ".css",
+        ".csv",
+        ".html",
+        ".js",
+        ".json",
+        ".map",
+        ".md",
+        ".mjs",
+        ".svg",
+        ".txt",
+        ".wasm",
+        ".xml",
+        ".yaml",
+        ".yml",
+    }
+)
+
+
+def _gzip(data: bytes) -> bytes:
+    # mtime=0 and no file name keep the variant a pure function of its input.
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def encoders() -> list[tuple[str, str, object]]:
+    """``(encoding, suffix, compress)`` for every available encoder."""
+    available = [("gzip", ".gz", _gzip)]
+    if brotli is not None:
+        available.append(("br", ".br", lambda data: brotli.compress(data, quality=11)))
+    return available
+
+
+@dataclass(frozen=True)
+class PrecompressedAssets:
+    """Extra context files (variants and manifest) and the manifest describing them."""
+
+    files: dict[str, Path]
+    manifest: dict
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _write_once(path: Path, data: bytes) -> None:
+    if path.exists():
+        return
+    partial = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.partial")
+    partial.write_bytes(data)
+    os.replace(partial, path)
+
+
+def precompress(files: dict[str, Path], cache: Path) -> PrecompressedAssets:
+    """Compress the compressible entries of ``files`` (context name → source path)."""
+    cache.mkdir(parents=True, exist_ok=True)
+    available = encoders()
+    assets: dict[str, dict] = {}
+    extra: dict[str, Path] = {}
+    totals = {"files": 0, "size": 0, **{encoding: 0 for encoding, _, _ in available}}
+    if MANIFEST_PATH in files:
+        raise ValueError(f"{MANIFEST_PATH} is generated and must not be a source asset")
+    for name, source in sorted(files.items()):
+        data = source.read_bytes()
+        digest = _sha256(data)
+        entry: dict = {"sha256": digest, "size": len(data)}
+        totals["files"] += 1
+        totals["size"] += len(data)
+        compressible = Path(name).suffix.lower() in COMPRESSIBLE_SUFFIXES and len(data) >= MIN_SIZE
+        for encoding, suffix, compress in available:
+            # A variant shipped in the source tree wins; never shadow it.
+            emit = compressible and f"{name}{suffix}" not in files
+            variant = cache / f"{digest}{suffix}"
+            if emit and not variant.exists():
+                _write_once(variant, compress(data))
+            if emit and variant.stat().st_size < len(data):
+                encoded = variant.read_bytes()
+                entry[encoding] = {"sha256": _sha256(encoded), "size": len(encoded)}
+                extra[f"{name}{suffix}"] = variant
+            totals[encoding] += entry.get(encoding, entry)["size"]
+        assets[name] = entry
+
+    manifest = {"version": 1, "assets": assets, "totals": totals}
+    document = (json.dumps(manifest, sort_keys=True, indent=2) + "\n").encode()
+    manifest_file = cache / f"manifest-{_sha256(document)}.json"
+    _write_once(manifest_file, document)
+    extra[MANIFEST_PATH] = manifest_file
+    return PrecompressedAssets(extra, manifest)
+
+
+def summary(manifest: dict) -> str:
+    totals = manifest["totals"]
+    sizes = ", ".join(
+        f"{encoding} {totals[encoding]:,}" for encoding in ("gzip", "br") if encoding in totals
+    )
+    return f"{totals['files']} asset(s), {totals['size']:,} bytes raw; served as {sizes} bytes"
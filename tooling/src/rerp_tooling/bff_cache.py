@@ -0,0 +1,98 @@
+"""Per-service fragment keys that let ``rerp bff generate-system`` skip no-op runs.
+
+The accounting BFF merges nine service specs into one ``openapi_bff.yaml``.
+BRRTRouter's ``generate_bff_spec`` performs the transform (prefixed paths,
+renamed schemas) and the merge in one call, so its intermediate fragments are
+not addressable from here. What RERP can key is each fragment's inputs: the
+SHA-256 of the service spec plus its suite-config entry (``base_path``,
+``gateway_path_style``, ...). A record in ``.rerp-cache/bff/{suite}.json``
+stores those keys with the suite config digest, the generator identity and
+the digest of the generated output. A byte copy of that output is kept next to
+the record.
+
+When no key changed, generation and validation are skipped. A missing or
+hand-edited output is restored from the copy, byte-identical to a full
+rebuild. When a key did change, the suite BFF is regenerated and the changed
+services are named.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from rerp_tooling.cache import cache_dir, content_key, read_json, write_json
+
+VERSION = 1
+
+
+def _digest(document: object) -> str:
+    return hashlib.sha256(json.dumps(document, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def _replace(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    temporary.write_bytes(data)
+    os.replace(temporary, path)
+
+
+class BffCache:
+    """Fragment keys and the last generated output for one suite BFF."""
+
+    def __init__(self, root: Path, suite: str) -> None:
+        self.root = Path(root)
+        self.suite = suite
+        directory = cache_dir(self.root) / "bff"
+        self.path = directory / f"{suite}.json"
+        self.copy = directory / f"{suite}.openapi_bff.yaml"
+        self.recorded = read_json(self.path, VERSION) or {}
+
+    def inputs(self, suite_config: Path, services: dict[str, dict], generator: dict) -> dict:
+        """Fragment keys of ``services`` (resolved suite-config entries) and suite inputs."""
+        fragments = {}
+        for name, service in services.items():
+            entry = {key: value for key, value in service.items() if key != "spec_path"}
+            fragments[name] = _digest({"spec": content_key(service["spec_path"]), "config": entry})
+        return {
+            "suite": _digest({"config": content_key(suite_config), "generator": generator}),
+            "fragments": fragments,
+        }
+
+    def changed(self, inputs: dict) -> list[str]:
+        """Services whose fragment key differs from the record; every one if suite inputs do."""
+        fragments = inputs["fragments"]
+        if self.recorded.get("suite") != inputs["suite"]:
+            return sorted(fragments)
+        recorded = self.recorded.get("fragments") or {}
+        return sorted(
+            (set(recorded) ^ set(fragments))
+            | {name for name in fragments if recorded.get(name) != fragments[name]}
+        )
+
+    def restore(self, inputs: dict, output: Path) -> str | None:
+        """``"current"`` or ``"restored"`` when ``output`` needs no generation, else ``None``."""
+        digest = self.recorded.get("output")
+        if not digest or self.recorded.get("suite") != inputs["suite"] or self.changed(inputs):
+            return None
+        if content_key(output) == digest:
+            return "current"
+        if content_key(self.copy) != digest:
+            return None
+        _replace(Path(output), self.copy.read_bytes())
+        return "restored"
+
+    def record(self, inputs: dict, output: Path) -> None:
+        data = Path(output).read_bytes()
+        try:
+            _replace(self.copy, data)
+        except OSError:
+            return
+        self.recorded = {
+            "version": VERSION,
+            **inputs,
+            "output": hashlib.sha256(data).hexdigest(),
+        }
+        write_json(self.path, self.recorded)
@@ -0,0 +1,66 @@
+"""Shared on-disk cache location and helpers for RERP tooling.
+
+Caches are optimisations only: every reader treats a missing, unreadable or
+foreign-version file as empty, and writers silently give up on read-only
+checkouts.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+# Release binaries are tens to hundreds of MB; hash and copy them in fixed-size
+# chunks so peak memory does not grow with the file.
+CHUNK_SIZE = 1024 * 1024
+
+
+def cache_dir(root: Path) -> Path:
+    """Return the tooling cache directory; ``RERP_CACHE_DIR`` overrides the default."""
+    configured = os.environ.get("RERP_CACHE_DIR", "").strip()
+    return Path(configured) if configured else Path(root) / ".rerp-cache"
+
+
+def file_sha256(path: Path) -> str:
+    """SHA-256 of a file's content, read in ``CHUNK_SIZE`` chunks."""
+    digest = hashlib.sha256()
+    buffer = bytearray(CHUNK_SIZE)
+    view = memoryview(buffer)
+    with Path(path).open("rb") as source:
+        while size := source.readinto(buffer):
+            digest.update(view[:size])
+    return digest.hexdigest()
+
+
+def content_key(path: Path) -> str | None:
+    """``file_sha256`` for cache keys: ``None`` when ``path`` cannot be read."""
+    try:
+        return file_sha256(path)
+    except OSError:
+        return None
+
+
+def read_json(path: Path, version: int) -> dict | None:
+    """Return a versioned JSON cache payload, or ``None`` when unusable."""
+    try:
+        payload = json.loads(Path(path).read_text())
+    except (OSError, ValueError):
+        return None
+    if not isinstance(payload, dict) or payload.get("version") != version:
+        return None
+    return payload
+
+
+def write_json(path: Path, payload: dict) -> bool:
+    """Atomically replace ``path`` with ``payload``; ``False`` if it cannot be written."""
+    path = Path(path)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        temporary.write_text(json.dumps(payload, sort_keys=True) + "\n")
+        os.replace(temporary, path)
+    except OSError:
+        return False
+    return True
@@ -0,0 +1,162 @@
+"""Cached Cargo package metadata for the ``microservices/`` workspace.
+
+Runtime descriptors and the CLI's build translation both need a crate's package
+name and ``[[bin]]`` names. ``CargoWorkspaceIndex`` is the single place that
+reads them: it lists the members of ``microservices/Cargo.toml`` and records,
+for each member manifest, its package name, binary names and gen/impl role.
+
+Entries are keyed by the manifest's ``(mtime_ns, size)`` and persisted in
+``.rerp-cache/cargo-index.json``, so a lookup of an unchanged crate is one
+``stat`` rather than a TOML parse. Manifests outside the workspace member list
+(half-migrated checkouts) are indexed the same way on first lookup.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+
+try:
+    import tomllib
+except ModuleNotFoundError:  # pragma: no cover - Python 3.10 compatibility
+    import tomli as tomllib  # type: ignore[no-redef]
+
+from rerp_tooling.cache import cache_dir, read_json, write_json
+
+
+@dataclass(frozen=True)
+class CrateInfo:
+    """Package metadata for one crate manifest."""
+
+    manifest: Path
+    package_name: str | None
+    binaries: tuple[str, ...]
+    role: str
+
+    @property
+    def binary_name(self) -> str | None:
+        """First ``[[bin]]`` name, falling back to the package name like Cargo."""
+        return self.binaries[0] if self.binaries else self.package_name
+
+
+def _role(manifest: Path) -> str:
+    parent = manifest.parent.name
+    return parent if parent in {"gen", "impl"} else "lib"
+
+
+def _stat_key(path: Path) -> list[int] | None:
+    try:
+        status = path.stat()
+    except OSError:
+        return None
+    return [status.st_mtime_ns, status.st_size]
+
+
+class CargoWorkspaceIndex:
+    """Member path → package/binary/role index for one Cargo workspace."""
+
+    VERSION = 1
+    _cache: dict[Path, CargoWorkspaceIndex] = {}
+
+    def __init__(self, workspace_dir: Path, cache_path: Path | None = None) -> None:
+        self.workspace_dir = Path(workspace_dir).resolve()
+        self.cache_path = cache_path
+        payload = (read_json(cache_path, self.VERSION) if cache_path else None) or {}
+        self._crates: dict[str, dict] = payload.get("crates") or {}
+        self._workspace: dict = payload.get("workspace") or {}
+        self._dirty = False
+        self._members_indexed = False
+
+    @classmethod
+    def for_root(cls, root: Path) -> CargoWorkspaceIndex:
+        """Process-wide index for ``{root}/microservices`` backed by the tooling cache."""
+        root = Path(root).resolve()
+        index = cls._cache.get(root)
+        if index is None:
+            index = cls._cache[root] = cls(
+                root / "microservices", cache_dir(root) / "cargo-index.json"
+            )
+        return index
+
+    def _key(self, manifest: Path) -> str:
+        manifest = Path(manifest).resolve()
+        try:
+            return manifest.relative_to(self.workspace_dir).as_posix()
+        except ValueError:
+            return manifest.as_posix()
+
+    def _path(self, key: str) -> Path:
+        return Path(key) if Path(key).is_absolute() else self.workspace_dir / key
+
+    def member_paths(self) -> list[str]:
+        """Workspace ``members`` from ``Cargo.toml``, re-read when it changes."""
+        manifest = self.workspace_dir / "Cargo.toml"
+        stat = _stat_key(manifest)
+        if "members" not in self._workspace or self._workspace.get("stat") != stat:
+            members: list[str] = []
+            if stat is not None:
+                workspace = tomllib.loads(manifest.read_text()).get("workspace") or {}
+                members = [str(member) for member in workspace.get("members") or []]
+            self._workspace = {"stat": stat, "members": members}
+            self._dirty = True
+        return list(self._workspace["members"])
+
+    def _entry(self, key: str) -> dict | None:
+        manifest = self._path(key)
+        stat = _stat_key(manifest)
+        entry = self._crates.get(key)
+        if entry is not None and entry.get("stat") == stat:
+            return entry if stat is not None else None
+        if stat is None:
+            self._crates.pop(key, None)
+            self._dirty = self._dirty or entry is not None
+            return None
+
+        document = tomllib.loads(manifest.read_text())
+        binaries = [
+            str(binary["name"])
+            for binary in document.get("bin") or []
+            if isinstance(binary, dict) and binary.get("name")
+        ]
+        package_name = (document.get("package") or {}).get("name")
+        entry = {
+            "stat": stat,
+            "package_name": str(package_name) if package_name else None,
+            "binaries": binaries,
+        }
+        self._crates[key] = entry
+        self._dirty = True
+        return entry
+
+    def crate(self, manifest: Path) -> CrateInfo | None:
+        """Metadata for ``manifest``; ``None`` when the manifest does not exist."""
+        if not self._members_indexed:
+            self.members()
+        key = self._key(manifest)
+        entry = self._entry(key)
+        self.save()
+        if entry is None:
+            return None
+        path = self._path(key)
+        return CrateInfo(path, entry["package_name"], tuple(entry["binaries"]), _role(path))
+
+    def members(self) -> dict[str, CrateInfo]:
+        """Every existing workspace member keyed by its member path."""
+        result = {}
+        for member in self.member_paths():
+            entry = self._entry(f"{member}/Cargo.toml")
+            if entry is not None:
+                manifest = self.workspace_dir / member / "Cargo.toml"
+                result[member] = CrateInfo(
+                    manifest, entry["package_name"], tuple(entry["binaries"]), _role(manifest)
+                )
+        self._members_indexed = True
+        self.save()
+        return result
+
+    def save(self) -> None:
+        if not self._dirty or self.cache_path is None:
+            return
+        payload = {"version": self.VERSION, "workspace": self._workspace, "crates": self._crates}
+        if write_json(self.cache_path, payload):
+            self._dirty = False
@@ -18,11 +18,20 @@ accidentally targeting generated crates.
 
 Command mapping (Tiltfile -> raw CLI):
     rerp gen suite <suite> --service <name>   -> brrtrouter gen suite <suite> --service <name>
+    rerp gen suite <suite> --all [--jobs N]   -> every service of the suite on a process pool
     rerp gen stubs <suite> <name> --force     -> brrtrouter gen stubs <suite> <name> --force
     rerp build microservice <name> [--suite]  -> debug host build of the impl package
+    rerp build microservices [<name>...]      -> one cargo build for several impl packages
     rerp docker copy-binary <src> <dest> <bn> -> copy one verified runtime artifact
     rerp docker build-image-simple ...        -> stage one service and use the shared Dockerfile
+    rerp docker build-images [--suite ...]    -> build every delivered image on one base build
+    rerp docker assemble-image ...            -> write an OCI layout without the Docker daemon
+    rerp docker gc [--keep N] [--registry]    -> retention for artifacts, dev images and tags
+    rerp docker publish <img> <repo> --tag T  -> push, or only re-tag when the registry has it
+    rerp docker dev-sync <hash> <artifact>    -> hot-swap the binary into running dev pods
     rerp bff generate-system [--system]       -> writes openapi/{suite}/openapi_bff.yaml
+    rerp bff generate-system --jobs N         -> suites generated and validated concurrently
+    rerp services [--all] [--serve]           -> runtime descriptors (or serve them on a socket)
 """
 
 import json
@@ -38,20 +47,28 @@ _brrtrouter_tooling = __import__("os").environ.get(
 if _brrtrouter_tooling not in sys.path:
     sys.path.insert(0, _brrtrouter_tooling)
 
-from brrtrouter_tooling.cli import gen_cmd, build, docker_cmd, bff  # noqa: E402,I001
-from brrtrouter_tooling.bff.config import load_suite_config  # noqa: E402
-from brrtrouter_tooling.bff.generate import generate_bff_spec  # noqa: E402
-from rerp_tooling.runtime import (  # noqa: E402
-    build_base_image,
-    build_microservice,
-    build_service_image,
-    discover_services,
-    stage_multiarch_context,
-)
-
 
 DEFAULT_SUITE = "accounting"
-HTTP_METHODS = {"get", "post", "put", "patch", "delete", "options", "head", "trace"}
+
+# BRRTRouter's CLI modules pull in its generator, YAML and template stacks. Tilt
+# runs `rerp services` and `rerp docker ...` once per service per rebuild, so
+# they are imported only by the subcommands that delegate to them.
+_BRRTROUTER_CLI_MODULES = ("gen_cmd", "build", "docker_cmd", "bff")
+
+
+def _brrtrouter_cli(name):
+    """Import ``brrtrouter_tooling.cli.<name>`` on first use."""
+    import importlib
+
+    return importlib.import_module(f"brrtrouter_tooling.cli.{name}")
+
+
+def __getattr__(name):
+    # Keep ``rerp_tooling.cli.main.gen_cmd`` and friends addressable (tests and
+    # callers patch them) without importing BRRTRouter at module load.
+    if name in _BRRTROUTER_CLI_MODULES:
+        return _brrtrouter_cli(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def _project_root(start=None):
@@ -92,16 +109,28 @@ def _strip_option(argv, option_name):
     return value, remaining
 
 
+def _undescribed_services(root, descriptors):
+    """``suite/service`` names with an impl crate but no runtime descriptor."""
+    from rerp_tooling.layout import RepositoryLayout
+
+    layout = RepositoryLayout.for_root(root)
+    described = {(descriptor["suite"], descriptor["service"]) for descriptor in descriptors}
+    undescribed = []
+    for suite in layout.suite_names():
+        services = layout.spec_services(suite) + (["bff"] if layout.has_bff_spec(suite) else [])
+        for service in services:
+            if (suite, service) in described:
+                continue
+            if layout.service(suite, service).impl_manifest is not None:
+                undescribed.append(f"{suite}/{service}")
+    return undescribed
+
+
 def _suites_with_bff(project_root=None):
+    from rerp_tooling.layout import RepositoryLayout
+
     root = Path(project_root or _project_root())
-    openapi = root / "openapi"
-    if not openapi.is_dir():
-        return []
-    return sorted(
-        path.name
-        for path in openapi.iterdir()
-        if path.is_dir() and (path / "bff-suite-config.yaml").exists()
-    )
+    return RepositoryLayout.for_root(root).suites_with_bff()
 
 
 def _suite_for_service(service_name, project_root=None, explicit_suite=None):
@@ -118,39 +147,17 @@ def _suite_for_service(service_name, project_root=None, explicit_suite=None):
     if env_suite:
         return env_suite
 
-    root = Path(project_root or _project_root())
-    openapi = root / "openapi"
-    matches = []
-    if openapi.is_dir():
-        for suite_dir in sorted(path for path in openapi.iterdir() if path.is_dir()):
-            if (suite_dir / service_name / "openapi.yaml").exists():
-                matches.append(suite_dir.name)
-            elif (suite_dir / "bff-suite-config.yaml").exists() and service_name == "bff":
-                matches.append(suite_dir.name)
+    from rerp_tooling.layout import RepositoryLayout
+
+    layout = RepositoryLayout.for_root(Path(project_root or _project_root()))
+    matches = layout.suites_for_service(service_name)
     if len(matches) == 1:
         return matches[0]
-    if DEFAULT_SUITE in matches or (openapi / DEFAULT_SUITE).exists():
+    if DEFAULT_SUITE in matches or DEFAULT_SUITE in layout.suite_names():
         return DEFAULT_SUITE
     return matches[0] if matches else DEFAULT_SUITE
 
 
-def _package_name_from_manifest(cargo_toml):
-    if not cargo_toml.exists():
-        return None
-    in_package = False
-    for raw_line in cargo_toml.read_text().splitlines():
-        line = raw_line.strip()
-        if line == "[package]":
-            in_package = True
-            continue
-        if line.startswith("[") and line != "[package]":
-            in_package = False
-        if in_package and line.startswith("name"):
-            _, value = line.split("=", 1)
-            return value.strip().strip('"')
-    return None
-
-
 def _rerp_impl_package_name(suite, service_name, project_root=None):
     """Cargo package name for the implementation crate.
 
@@ -158,10 +165,13 @@ def _rerp_impl_package_name(suite, service_name, project_root=None):
     the current mixed checkout while we converge on the Hauliage convention. The
     fallback is the intended stable convention: ``rerp_{suite}_{service}``.
     """
+    from rerp_tooling.cargo_index import CargoWorkspaceIndex
+
     root = Path(project_root or _project_root())
-    manifest_name = _package_name_from_manifest(
+    crate = CargoWorkspaceIndex.for_root(root).crate(
         root / "microservices" / suite / service_name / "impl" / "Cargo.toml"
     )
+    manifest_name = crate.package_name if crate else None
     return manifest_name or f"rerp_{suite}_{_snake(service_name)}"
 
 
@@ -206,6 +216,8 @@ def _run_microservice_build(argv, project_root=None):
         print(f"Unknown build option(s): {' '.join(remaining)}", file=sys.stderr)
         return 2
     suite = _suite_for_service(service, project_root=root, explicit_suite=suite)
+    from rerp_tooling.runtime import build_microservice
+
     return build_microservice(root, suite, service, release=release)
 
 
@@ -236,6 +248,7 @@ def _translate_docker(argv: list[str]) -> list[str]:
             port = None
             binary_name = None
             no_cache = False
+            dev_sync_only = False
             i = 0
             while i < len(rest):
                 if rest[i] == "--system" and i + 1 < len(rest):
@@ -263,6 +276,7 @@ def _translate_docker(argv: list[str]) -> list[str]:
                 elif rest[i] == "--prune-dangling":
                     i += 1
                 elif rest[i] == "--dev-sync-only":
+                    dev_sync_only = True
                     i += 1
                 else:
                     i += 1
@@ -281,6 +295,8 @@ def _translate_docker(argv: list[str]) -> list[str]:
                 new_argv.append(f"--binary-name={binary_name}")
             if no_cache:
                 new_argv.append("--no-cache")
+            if dev_sync_only:
+                new_argv.append("--dev-sync-only")
             return new_argv
     return argv
 
@@ -302,6 +318,8 @@ def _run_rerp_docker(argv, project_root=None):
                 file=sys.stderr,
             )
             return 2
+        from rerp_tooling.runtime import build_base_image
+
         return build_base_image(root, dry_run="--dry-run" in rest)
 
     if subcommand == "copy-binary":
@@ -319,23 +337,190 @@ def _run_rerp_docker(argv, project_root=None):
         if len(rest) < 2:
             print(
                 "Usage: rerp docker stage-image-context <destination> <artifacts-root> "
-                "--suite <suite> --service <service>",
+                "--suite <suite> --service <service> [--jobs <n>] [--precompress]",
                 file=sys.stderr,
             )
             return 2
         destination, artifacts_root = rest[:2]
         suite, options = _strip_option(rest[2:], "--suite")
         service, options = _strip_option(options, "--service")
+        jobs, options = _strip_option(options, "--jobs")
+        precompress = "--precompress" in options
+        options = [item for item in options if item != "--precompress"]
         if not suite or not service or options:
             print("stage-image-context requires --suite and --service", file=sys.stderr)
             return 2
-        return stage_multiarch_context(root, destination, artifacts_root, suite, service)
+        if jobs is not None and (not jobs.isdigit() or int(jobs) < 1):
+            print("--jobs must be a positive integer", file=sys.stderr)
+            return 2
+        from rerp_tooling.runtime import stage_multiarch_context
+
+        return stage_multiarch_context(
+            root,
+            destination,
+            artifacts_root,
+            suite,
+            service,
+            workers=int(jobs) if jobs else None,
+            precompress=precompress,
+        )
+
+    if subcommand == "build-images":
+        suite, options = _strip_option(rest, "--suite")
+        services, options = _strip_option(options, "--service")
+        jobs, options = _strip_option(options, "--jobs")
+        artifacts_root, options = _strip_option(options, "--artifacts-root")
+        flags = {"--no-cache", "--stream-context", "--skip-base", "--precompress"}
+        selected = {item for item in options if item in flags}
+        options = [item for item in options if item not in flags]
+        if options or (jobs is not None and (not jobs.isdigit() or int(jobs) < 1)):
+            print(
+                "Usage: rerp docker build-images [--suite <suite>] [--service <a,b>] "
+                "[--jobs <n>] [--artifacts-root <dir>] [--no-cache] [--stream-context] "
+                "[--skip-base] [--precompress]",
+                file=sys.stderr,
+            )
+            return 2
+        from rerp_tooling.runtime import build_service_images
+
+        return build_service_images(
+            root,
+            suite=suite,
+            services=[name for name in services.split(",") if name] if services else None,
+            artifacts_root=artifacts_root or "build_artifacts",
+            jobs=int(jobs) if jobs else None,
+            no_cache="--no-cache" in selected,
+            stream_context="--stream-context" in selected,
+            build_base="--skip-base" not in selected,
+            precompress="--precompress" in selected,
+        )
+
+    if subcommand == "assemble-image":
+        if len(rest) < 3:
+            print(
+                "Usage: rerp docker assemble-image <output> <base-layout> <artifacts-root> "
+                "--suite <suite> --service <service> [--arch <a,b>] [--tag <ref>] "
+                "[--tar <file>] [--jobs <n>]",
+                file=sys.stderr,
+            )
+            return 2
+        output, base_layout, artifacts_root = rest[:3]
+        suite, options = _strip_option(rest[3:], "--suite")
+        service, options = _strip_option(options, "--service")
+        architectures, options = _strip_option(options, "--arch")
+        ref_name, options = _strip_option(options, "--tag")
+        tarball, options = _strip_option(options, "--tar")
+        jobs, options = _strip_option(options, "--jobs")
+        if not suite or not service or options:
+            print("assemble-image requires --suite and --service", file=sys.stderr)
+            return 2
+        if jobs is not None and (not jobs.isdigit() or int(jobs) < 1):
+            print("--jobs must be a positive integer", file=sys.stderr)
+            return 2
+        from rerp_tooling.runtime import assemble_oci_image
+
+        return assemble_oci_image(
+            root,
+            output,
+            base_layout,
+            artifacts_root,
+            suite,
+            service,
+            architectures=tuple((architectures or "amd64,arm64,arm").split(",")),
+            ref_name=ref_name,
+            tarball=tarball,
+            workers=int(jobs) if jobs else None,
+        )
+
+    if subcommand == "publish":
+        tag, options = _strip_option(rest, "--tag")
+        if len(options) != 2 or not tag:
+            print(
+                "Usage: rerp docker publish <image> <registry>/<repository> --tag <tag>",
+                file=sys.stderr,
+            )
+            return 2
+        from rerp_tooling.runtime import publish_image
+
+        return publish_image(root, options[0], options[1], tag)
+
+    if subcommand == "dev-sync":
+        suite, options = _strip_option(rest, "--suite")
+        service, options = _strip_option(options, "--service")
+        container, options = _strip_option(options, "--container")
+        kubeconfig, options = _strip_option(options, "--kubeconfig")
+        if len(options) != 2 or not suite or not service:
+            print(
+                "Usage: rerp docker dev-sync <hash> <artifact> --suite <suite> "
+                "--service <service> [--container <name>] [--kubeconfig <file>]",
+                file=sys.stderr,
+            )
+            return 2
+        from rerp_tooling.runtime import dev_sync_service
+
+        return dev_sync_service(
+            root,
+            options[0],
+            options[1],
+            suite,
+            service,
+            container=container,
+            kubeconfig=kubeconfig,
+        )
+
+    if subcommand == "gc":
+        from rerp_tooling.gc import collect
+        from rerp_tooling.runtime import discover_services
+
+        keep, options = _strip_option(rest, "--keep")
+        max_age, options = _strip_option(options, "--max-age")
+        registry, options = _strip_option(options, "--registry")
+        artifacts_root, options = _strip_option(options, "--artifacts-root")
+        flags = {"--dry-run", "--no-images", "--prune-orphans"}
+        selected = {item for item in options if item in flags}
+        options = [item for item in options if item not in flags]
+        try:
+            keep_count = int(keep or 3)
+            max_age_days = float(max_age) if max_age else None
+        except ValueError:
+            keep_count = 0
+        if options or keep_count < 1:
+            print(
+                "Usage: rerp docker gc [--keep <n>] [--max-age <days>] [--registry <host>] "
+                "[--artifacts-root <dir>] [--no-images] [--prune-orphans] [--dry-run]",
+                file=sys.stderr,
+            )
+            return 2
+        descriptors = discover_services(root, require_helm=False, cache=True)
+        binaries = {(descriptor["suite"], descriptor["binary_name"]) for descriptor in descriptors}
+        prune_orphans = "--prune-orphans" in selected
+        if prune_orphans:
+            undescribed = _undescribed_services(root, descriptors)
+            if undescribed:
+                # Their binary names are unknown, so any artifact could be theirs.
+                print(
+                    "Refusing --prune-orphans: cannot describe " + ", ".join(undescribed),
+                    file=sys.stderr,
+                )
+                return 1
+        return collect(
+            root,
+            binaries,
+            artifacts_root=artifacts_root or "build_artifacts",
+            keep=keep_count,
+            max_age=max_age_days * 86400 if max_age_days is not None else None,
+            registry=registry or os.environ.get("RERP_REGISTRY") or None,
+            images="--no-images" not in selected,
+            prune_orphans=prune_orphans,
+            dry_run="--dry-run" in selected,
+        )
 
     if subcommand == "build-image-simple":
         if len(rest) < 4:
             print(
                 "Usage: rerp docker build-image-simple <image> <Dockerfile> <hash> <artifact> "
-                "--suite <suite> --service <service> [--no-cache]",
+                "--suite <suite> --service <service> [--no-cache] [--stream-context] "
+                "[--precompress] [--prune-dangling] [--dev-sync-only [--container <name>]]",
                 file=sys.stderr,
             )
             return 2
@@ -345,15 +530,40 @@ def _run_rerp_docker(argv, project_root=None):
         system, options = _strip_option(options, "--system")
         service, options = _strip_option(options, "--service")
         _binary_name, options = _strip_option(options, "--binary-name")
+        container, options = _strip_option(options, "--container")
+        kubeconfig, options = _strip_option(options, "--kubeconfig")
+        dev_sync_only = "--dev-sync-only" in options
         no_cache = "--no-cache" in options
-        options = [item for item in options if item != "--no-cache"]
+        stream_context = "--stream-context" in options
+        precompress = "--precompress" in options
+        prune = "--prune-dangling" in options
+        flags = {
+            "--no-cache",
+            "--stream-context",
+            "--precompress",
+            "--prune-dangling",
+            "--dev-sync-only",
+        }
+        options = [item for item in options if item not in flags]
         suite = suite or system
         if not suite or not service or options:
             print("build-image-simple requires --suite and --service", file=sys.stderr)
             if options:
                 print(f"Unknown Docker option(s): {' '.join(options)}", file=sys.stderr)
             return 2
-        return build_service_image(
+        from rerp_tooling.runtime import build_service_image, dev_sync_service
+
+        if dev_sync_only:
+            return dev_sync_service(
+                root,
+                hash_path,
+                artifact_path,
+                suite,
+                service,
+                container=container,
+                kubeconfig=kubeconfig,
+            )
+        result = build_service_image(
             root,
             image_name,
             dockerfile,
@@ -362,11 +572,23 @@ def _run_rerp_docker(argv, project_root=None):
             suite,
             service,
             no_cache=no_cache,
+            stream_context=stream_context,
+            precompress=precompress,
         )
+        if result == 0 and prune:
+            from rerp_tooling.gc import prune_dangling
+
+            # Best effort: an image a stopped container still uses must not fail the build.
+            if prune_dangling() != 0:
+                print(
+                    "warning: some dangling RERP images were not pruned; the build succeeded",
+                    file=sys.stderr,
+                )
+        return result
 
     # Preserve non-runtime legacy commands while the release path is migrated.
     try:
-        docker_cmd.run_docker_argv(argv)
+        _brrtrouter_cli("docker_cmd").run_docker_argv(argv)
     except SystemExit as error:
         return int(error.code or 0)
     return 0
@@ -390,7 +612,7 @@ def _bff_generate_system_plans(argv, project_root=None):
         print(f"Error: Unknown argument(s): {' '.join(rest)}", file=sys.stderr)
         print(
             "Usage: rerp bff generate-system [--suite <name>|--system <name>] "
-            "[--openapi-dir <path>] [--output <path>]",
+            "[--openapi-dir <path>] [--output <path>] [--jobs <n>] [--force]",
             file=sys.stderr,
         )
         sys.exit(1)
@@ -416,42 +638,36 @@ def _bff_generate_system_plans(argv, project_root=None):
     return plans
 
 
-def _operation_ids_from_spec(spec_path):
+def _operation_ids_from_spec(spec_path, index=None):
     """Return operationIds from an OpenAPI file.
 
     This is deliberately tiny and local to the wrapper. Its job is not full
     OpenAPI validation; it is a guardrail proving the generated BFF includes the
-    operations from every suite-configured service spec.
+    operations from every suite-configured service spec. ``index`` caches the
+    ids per file content (see ``rerp_tooling.operations``).
     """
-    import yaml
+    from rerp_tooling.operations import OperationIndex
 
-    with Path(spec_path).open() as f:
-        spec = yaml.safe_load(f) or {}
-
-    operation_ids = set()
-    for path_item in (spec.get("paths") or {}).values():
-        if not isinstance(path_item, dict):
-            continue
-        for method, operation in path_item.items():
-            if method not in HTTP_METHODS or not isinstance(operation, dict):
-                continue
-            operation_id = operation.get("operationId")
-            if operation_id:
-                operation_ids.add(operation_id)
-    return operation_ids
+    return set((index or OperationIndex(None)).operation_ids(spec_path))
 
 
-def _validate_bff_operation_coverage(suite_config_path, bff_output_path, project_root=None):
+def _validate_bff_operation_coverage(
+    suite_config_path, bff_output_path, project_root=None, services=None
+):
     """Fail if generated BFF omits operationIds from configured service specs."""
+    from rerp_tooling.operations import OperationIndex
+
     root = Path(project_root or _project_root())
-    config = load_suite_config(Path(suite_config_path), base_dir=root)
-    services = (config.get("_resolved") or {}).get("services") or {}
+    if services is None:
+        services = _bff_suite_services(suite_config_path, root)
 
+    index = OperationIndex.for_root(root)
     expected = set()
     for service in services.values():
-        expected |= _operation_ids_from_spec(service["spec_path"])
+        expected |= _operation_ids_from_spec(service["spec_path"], index)
 
-    actual = _operation_ids_from_spec(bff_output_path)
+    actual = _operation_ids_from_spec(bff_output_path, index)
+    index.save()
     missing = sorted(expected - actual)
     if missing:
         raise RuntimeError(
@@ -460,18 +676,133 @@ def _validate_bff_operation_coverage(suite_config_path, bff_output_path, project
         )
 
 
+def _validate_bff_refs(bff_output_path, project_root=None):
+    """Fail if a local ``$ref`` in the generated BFF is dangling or cyclic.
+
+    Merging service specs renames and hoists components, so a schema the BFF
+    still references can be lost on the way. The suite BFF is indexed once
+    (``rerp_tooling.refs``) and every ``$ref`` is resolved through the table.
+    """
+    from rerp_tooling.refs import RefCycleError, RefIndex
+
+    root = Path(project_root or _project_root())
+    index = RefIndex.for_spec(bff_output_path, root)
+    broken = []
+    for source, target in sorted(index.references.items()):
+        try:
+            index.resolve(target)
+        except (KeyError, RefCycleError) as exc:
+            broken.append(f"{source} -> {exc.args[0]}")
+    if broken:
+        raise RuntimeError("Generated BFF has unresolved $refs: " + "; ".join(broken))
+
+
+def _bff_suite_services(suite_config_path, root):
+    """Resolved ``services`` entries of a bff-suite-config.yaml."""
+    from brrtrouter_tooling.bff.config import load_suite_config
+
+    config = load_suite_config(Path(suite_config_path), base_dir=root)
+    return (config.get("_resolved") or {}).get("services") or {}
+
+
+def _generate_suite_bff(suite, suite_config, output, root, force=False):
+    """Generate one suite BFF and verify its operation coverage and ``$ref``s.
+
+    Skipped when no service fragment key changed since the last run (see
+    ``rerp_tooling.bff_cache``); ``force`` regenerates regardless.
+    """
+    from brrtrouter_tooling.bff.generate import generate_bff_spec
+
+    from rerp_tooling.bff_cache import BffCache
+    from rerp_tooling.gen_stamp import generator_identity
+
+    services = _bff_suite_services(suite_config, root)
+    cache = BffCache(root, suite)
+    inputs = cache.inputs(suite_config, services, generator_identity())
+    state = None if force else cache.restore(inputs, output)
+    if state:
+        print(f"✅ RERP {suite} BFF spec is up to date ({state}): {output}")
+        return
+
+    changed = cache.changed(inputs)
+    reason = f" ({', '.join(changed)} changed)" if changed and not force else ""
+    print(f"🔄 Generating RERP {suite} BFF spec from {suite_config} -> {output}{reason}")
+    generate_bff_spec(suite_config_path=suite_config, output_path=output, base_dir=root)
+    _validate_bff_operation_coverage(suite_config, output, project_root=root, services=services)
+    _validate_bff_refs(output, project_root=root)
+    cache.record(inputs, output)
+
+
+def _bff_suite_worker(task):
+    """Process-pool entry: one suite with its output captured and errors returned."""
+    import contextlib
+    import io
+    import time
+
+    captured = io.StringIO()
+    error = None
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(captured), contextlib.redirect_stderr(captured):
+        try:
+            _generate_suite_bff(*task)
+        except (Exception, SystemExit) as exc:  # reported with the other suites' results
+            error = f"{type(exc).__name__}: {exc}"
+    return captured.getvalue(), error, time.perf_counter() - started
+
+
 def _run_bff_generate_system(argv, project_root=None):
-    """Generate suite BFFs from bff-suite-config.yaml and verify coverage."""
+    """Generate suite BFFs from bff-suite-config.yaml and verify coverage.
+
+    Several suites are generated and validated concurrently, one process per
+    suite up to ``--jobs`` (default: CPU count). Each suite's output is printed
+    as one block, and every failure is reported before exiting non-zero. A
+    single suite runs in-process so its errors propagate unchanged. A suite
+    whose service fragments are unchanged is not regenerated unless ``--force``.
+    """
     root = Path(project_root or _project_root())
+    jobs, argv = _strip_option(argv, "--jobs")
+    force = "--force" in argv
+    argv = [item for item in argv if item != "--force"]
+    if jobs is not None and (not jobs.isdigit() or int(jobs) < 1):
+        print("--jobs must be a positive integer", file=sys.stderr)
+        sys.exit(1)
+
+    tasks = []
     for openapi_dir, suite, output in _bff_generate_system_plans(argv, project_root=root):
         suite_config = openapi_dir / suite / "bff-suite-config.yaml"
         if not suite_config.exists():
             print(f"Error: Suite config not found: {suite_config}", file=sys.stderr)
             sys.exit(1)
+        tasks.append((suite, suite_config, output, root, force))
+
+    if len(tasks) == 1:
+        _generate_suite_bff(*tasks[0])
+        return
+
+    import time
 
-        print(f"🔄 Generating RERP {suite} BFF spec from {suite_config} -> {output}")
-        generate_bff_spec(suite_config_path=suite_config, output_path=output, base_dir=root)
-        _validate_bff_operation_coverage(suite_config, output, project_root=root)
+    workers = min(int(jobs) if jobs else os.cpu_count() or 1, len(tasks))
+    started = time.perf_counter()
+    if workers <= 1:
+        results = [_bff_suite_worker(task) for task in tasks]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_bff_suite_worker, tasks))
+    elapsed = time.perf_counter() - started
+
+    failed = []
+    for (suite, *_), (output, error, _) in zip(tasks, results):
+        sys.stdout.write(output)
+        if error:
+            failed.append(suite)
+            print(f"Error: {suite} BFF: {error}", file=sys.stderr)
+    print(f"Generated {len(tasks)} suite BFF(s) with {workers} worker(s) in {elapsed:.1f}s:")
+    for (suite, *_), (_, error, seconds) in zip(tasks, results):
+        print(f"  {suite:<32} {seconds:8.1f}s  {'failed' if error else 'ok'}")
+    if failed:
+        sys.exit(1)
 
 
 def _translate_bff_generate(argv, project_root=None):
@@ -525,122 +856,179 @@ def _run_pre_commit(argv):
         sys.exit(1)
 
 
-def main():
-    if len(sys.argv) < 2:
-        print("rerp: missing subcommand", file=sys.stderr)
-        print("Available: gen, build, docker, bff, pre-commit", file=sys.stderr)
+def _run_gen(rest):
+    if rest and rest[0] == "suite":
+        # Override BRRTRouter's raw default package names.
+        #
+        # RERP is suite-nested, but should follow Hauliage's proven naming
+        # split: impl package plus a separate `<impl>_gen` generated crate.
+        # This is the guardrail that prevents future regenerations from
+        # turning gen crates back into `<module>_service_api` or, worse,
+        # giving gen crates the same name as implementation binaries.
+        from rerp_tooling.codegen import generate_service, generate_suite, run_generator
+        from rerp_tooling.layout import RepositoryLayout
+
+        suite = rest[1] if len(rest) > 1 else ""
+        service, extra = _strip_option(rest[2:], "--service")
+        jobs, extra = _strip_option(extra, "--jobs")
+        use_stamp = "--no-stamp" not in extra
+        generate_all = "--all" in extra
+        extra = [item for item in extra if item not in {"--no-stamp", "--all"}]
+        root = _project_root()
+
+        if generate_all:
+            if service or (jobs is not None and (not jobs.isdigit() or int(jobs) < 1)):
+                print(
+                    "Usage: rerp gen suite <suite> --all [--jobs <n>] [--no-stamp]",
+                    file=sys.stderr,
+                )
+                sys.exit(2)
+            services = RepositoryLayout.for_root(root).spec_services(suite)
+            if not services:
+                print(f"no services under openapi/{suite}/", file=sys.stderr)
+                sys.exit(1)
+            result = generate_suite(
+                root,
+                suite,
+                services,
+                gen_package_name=_rerp_gen_package_name,
+                impl_package_name=_rerp_impl_package_name,
+                arguments=extra,
+                stamp=use_stamp,
+                jobs=int(jobs) if jobs else None,
+            )
+        elif service:
+            # One service is stamped: the generator is skipped when the spec,
+            # dependency config, generator and package names are unchanged.
+            result = generate_service(
+                root,
+                suite,
+                service,
+                gen_package_name=_rerp_gen_package_name,
+                impl_package_name=_rerp_impl_package_name(suite, service, project_root=root),
+                arguments=extra,
+                stamp=use_stamp,
+            )
+        else:
+            result = run_generator(suite, None, extra, _rerp_gen_package_name)
+        if result != 0:
+            sys.exit(result)
+
+    elif rest and rest[0] in ("stubs", "generate", "generate-stubs"):
+        # For stubs, we also need to pass the correct component-name
+        suite = rest[1] if len(rest) > 1 else ""
+        service = rest[2] if len(rest) > 2 else None
+        force = "--force" in rest
+        sync = "--sync" in rest
+
+        # Rebuild args
+        # run_gen_argv() dispatches from sys.argv[2], exactly as it does
+        # for `gen suite` above. Keep the full command prefix here;
+        # omitting `gen` makes the requested suite look like a subcommand.
+        new_rest = ["brrtrouter", "gen", "stubs", suite]
+        if service:
+            new_rest.append(service)
+        if force:
+            new_rest.append("--force")
+        if sync:
+            new_rest.append("--sync")
+        sys.argv = new_rest
+        _brrtrouter_cli("gen_cmd").run_gen_argv()
+    else:
+        print("rerp gen: unknown subcommand", file=sys.stderr)
         sys.exit(1)
 
-    cmd = sys.argv[1]
-    rest = sys.argv[2:]
-
-    if cmd == "gen":
-        if rest and rest[0] == "suite":
-            # Override BRRTRouter's raw default package names.
-            #
-            # RERP is suite-nested, but should follow Hauliage's proven naming
-            # split: impl package plus a separate `<impl>_gen` generated crate.
-            # This is the guardrail that prevents future regenerations from
-            # turning gen crates back into `<module>_service_api` or, worse,
-            # giving gen crates the same name as implementation binaries.
-            suite = rest[1] if len(rest) > 1 else ""
-            service = None
-            extra = []
-            i = 2
-            while i < len(rest):
-                if rest[i] == "--service" and i + 1 < len(rest):
-                    service = rest[i + 1]
-                    i += 2
-                else:
-                    extra.append(rest[i])
-                    i += 1
 
-            # Rebuild args with suite name, passing --service if provided
-            # run_gen_argv() reads sys.argv[2] as the subcommand, so we need:
-            # sys.argv[0] = 'brrtrouter', sys.argv[1] = 'gen', sys.argv[2] = 'suite'
-            new_rest = ["brrtrouter", "gen", "suite", suite]
-            if service:
-                new_rest += ["--service", service]
-            new_rest += extra
-            sys.argv = new_rest
-
-            # Patch the package-name callbacks used by raw `brrtrouter gen suite`.
-            # Keep this local to the call so other BRRTRouter tooling remains
-            # untouched when the process continues.
-            import brrtrouter_tooling.cli.gen_cmd as gen_mod
-
-            def _one_arg_gen_package_name(sn: str) -> str:
-                return _rerp_gen_package_name(suite, sn)
-
-            original_default = gen_mod.default_gen_package_name
-            original_default_package = gen_mod._default_package_name
-            gen_mod.default_gen_package_name = _one_arg_gen_package_name
-            gen_mod._default_package_name = _rerp_gen_package_name
-
-            try:
-                gen_cmd.run_gen_argv()
-            finally:
-                gen_mod.default_gen_package_name = original_default
-                gen_mod._default_package_name = original_default_package
-
-        elif rest and rest[0] in ("stubs", "generate", "generate-stubs"):
-            # For stubs, we also need to pass the correct component-name
-            suite = rest[1] if len(rest) > 1 else ""
-            service = rest[2] if len(rest) > 2 else None
-            force = "--force" in rest
-            sync = "--sync" in rest
-
-            # Rebuild args
-            # run_gen_argv() dispatches from sys.argv[2], exactly as it does
-            # for `gen suite` above. Keep the full command prefix here;
-            # omitting `gen` makes the requested suite look like a subcommand.
-            new_rest = ["brrtrouter", "gen", "stubs", suite]
-            if service:
-                new_rest.append(service)
-            if force:
-                new_rest.append("--force")
-            if sync:
-                new_rest.append("--sync")
-            sys.argv = new_rest
-            gen_cmd.run_gen_argv()
-        else:
-            print("rerp gen: unknown subcommand", file=sys.stderr)
-            sys.exit(1)
+def _run_microservices_build(argv, project_root=None):
+    """Build several implementation crates (default: every runtime-ready one) in one cargo run."""
+    root = Path(project_root or _project_root())
+    suite, remaining = _strip_option(argv[1:], "--suite")
+    artifacts_root, remaining = _strip_option(remaining, "--artifacts-root")
+    release = "--release" in remaining
+    remaining = [item for item in remaining if item not in {"--release", "--no-release"}]
+    unknown = [item for item in remaining if item.startswith("-")]
+    if unknown:
+        print(
+            "Usage: rerp build microservices [<service>...] [--suite SUITE] [--release] "
+            "[--artifacts-root DIR]",
+            file=sys.stderr,
+        )
+        return 2
+    from rerp_tooling.runtime import build_microservices
+
+    return build_microservices(
+        root,
+        suite=suite,
+        services=remaining or None,
+        release=release,
+        artifacts_root=artifacts_root or "build_artifacts",
+    )
 
-    elif cmd == "build":
-        if rest and rest[0] == "microservice":
-            sys.exit(_run_microservice_build(rest))
-        else:
-            sys.argv = ["brrtrouter"] + ["build"] + rest
-            build.run_build_argv()
 
-    elif cmd == "docker":
-        sys.exit(_run_rerp_docker(rest))
+def _run_build(rest):
+    if rest and rest[0] == "microservices":
+        sys.exit(_run_microservices_build(rest))
+    if rest and rest[0] == "microservice":
+        sys.exit(_run_microservice_build(rest))
+    sys.argv = ["brrtrouter"] + ["build"] + rest
+    _brrtrouter_cli("build").run_build_argv()
 
-    elif cmd == "services":
-        include_all = "--all" in rest
-        print(
-            json.dumps(
-                discover_services(_project_root(), require_helm=not include_all), sort_keys=True
-            )
-        )
 
-    elif cmd == "bff":
-        if rest and rest[0] == "generate-system":
-            _run_bff_generate_system(rest[1:])
-        elif rest and rest[0] == "generate":
-            sys.argv = ["brrtrouter", "bff", "generate"] + _translate_bff_generate(rest[1:])
-            bff.run_bff_generate()
-        else:
-            print("rerp bff: unknown subcommand", file=sys.stderr)
-            sys.exit(1)
+def _run_docker(rest):
+    sys.exit(_run_rerp_docker(rest))
+
 
-    elif cmd == "pre-commit":
-        _run_pre_commit(rest)
+def _run_services(rest):
+    from rerp_tooling.descriptor_daemon import request_descriptors
+    from rerp_tooling.descriptor_daemon import serve as serve_descriptors
+    from rerp_tooling.runtime import discover_services
 
+    root = _project_root()
+    if "--serve" in rest:
+        sys.exit(serve_descriptors(root))
+    include_all = "--all" in rest
+    use_cache = "--no-cache" not in rest
+    descriptors = request_descriptors(root, include_all) if use_cache else None
+    if descriptors is None:
+        descriptors = discover_services(root, require_helm=not include_all, cache=use_cache)
+    print(json.dumps(descriptors, sort_keys=True))
+
+
+def _run_bff(rest):
+    if rest and rest[0] == "generate-system":
+        _run_bff_generate_system(rest[1:])
+    elif rest and rest[0] == "generate":
+        sys.argv = ["brrtrouter", "bff", "generate"] + _translate_bff_generate(rest[1:])
+        _brrtrouter_cli("bff").run_bff_generate()
     else:
+        print("rerp bff: unknown subcommand", file=sys.stderr)
+        sys.exit(1)
+
+
+# Subcommand registry. Handlers import their own heavy dependencies so that a
+# lightweight command never pays for another command's imports.
+COMMANDS = {
+    "gen": _run_gen,
+    "build": _run_build,
+    "docker": _run_docker,
+    "services": _run_services,
+    "bff": _run_bff,
+    "pre-commit": _run_pre_commit,
+}
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("rerp: missing subcommand", file=sys.stderr)
+        print(f"Available: {', '.join(COMMANDS)}", file=sys.stderr)
+        sys.exit(1)
+
+    cmd = sys.argv[1]
+    handler = COMMANDS.get(cmd)
+    if handler is None:
         print(f'rerp: unknown command "{cmd}"', file=sys.stderr)
         sys.exit(1)
+    handler(sys.argv[2:])
 
 
 if __name__ == "__main__":
@@ -0,0 +1,164 @@
+"""Re-entrant service code generation on top of BRRTRouter's ``gen suite``.
+
+BRRTRouter's generator reads its arguments from ``sys.argv`` and its
+package-name callbacks from the module globals ``default_gen_package_name``
+and ``_default_package_name`` of ``brrtrouter_tooling.cli.gen_cmd``.
+``generate_service`` takes the callbacks as parameters. It installs them and
+the argv under a process-wide lock for exactly one generator call, then
+restores all three, so the process is unchanged once it returns.
+
+``generate_suite`` regenerates many services over a process pool. Every
+worker has its own copy of those globals, so services generate in parallel and
+each worker pays BRRTRouter's import cost once for all the services it handles.
+"""
+
+from __future__ import annotations
+
+import importlib
+import os
+import sys
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from rerp_tooling.gen_stamp import GenStamp, generator_identity
+
+_GENERATOR_LOCK = threading.RLock()
+_GEN_WORKERS = os.cpu_count() or 1
+
+
+def _generator_module():
+    return importlib.import_module("brrtrouter_tooling.cli.gen_cmd")
+
+
+def run_generator(
+    suite: str,
+    service: str | None,
+    arguments: list[str],
+    gen_package_name: Callable[[str, str], str],
+) -> int:
+    """Run ``brrtrouter gen suite`` once with RERP's package-name callback."""
+    gen_mod = _generator_module()
+    argv = ["brrtrouter", "gen", "suite", suite]
+    if service:
+        argv += ["--service", service]
+    argv += list(arguments)
+    with _GENERATOR_LOCK:
+        saved = (sys.argv, gen_mod.default_gen_package_name, gen_mod._default_package_name)
+        sys.argv = argv
+        gen_mod.default_gen_package_name = lambda name: gen_package_name(suite, name)
+        gen_mod._default_package_name = gen_package_name
+        try:
+            gen_mod.run_gen_argv()
+        except SystemExit as error:
+            if error.code not in (None, 0):
+                return error.code if isinstance(error.code, int) else 1
+        finally:
+            sys.argv, gen_mod.default_gen_package_name, gen_mod._default_package_name = saved
+    return 0
+
+
+def generate_service(
+    root: Path,
+    suite: str,
+    service: str,
+    *,
+    gen_package_name: Callable[[str, str], str],
+    impl_package_name: str | None = None,
+    arguments: list[str] | tuple[str, ...] = (),
+    stamp: bool = True,
+) -> int:
+    """Generate one service, skipping the generator when its stamp is current.
+
+    ``gen_package_name(suite, service)`` names the generated crate and
+    ``impl_package_name`` is the implementation crate, recorded in the stamp.
+    ``--force`` ignores a current stamp; ``--dry-run`` never uses one.
+    """
+    arguments = list(arguments)
+    if not stamp or "--dry-run" in arguments:
+        return run_generator(suite, service, arguments, gen_package_name)
+
+    generation = GenStamp(root, suite, service)
+    packages = {"gen": gen_package_name(suite, service), "impl": impl_package_name}
+    inputs = generation.inputs(
+        packages, [item for item in arguments if item != "--force"], generator_identity()
+    )
+    if "--force" not in arguments and generation.is_current(inputs):
+        print(f"{suite}/{service} generated code is up to date (stamp {inputs[:12]})")
+        return 0
+    previous = generation.snapshot()
+    result = run_generator(suite, service, arguments, gen_package_name)
+    if result != 0:
+        return result
+    restored = generation.restore_unchanged(previous)
+    generation.record(inputs)
+    print(f"{suite}/{service}: kept the mtime of {restored} unchanged generated file(s)")
+    return 0
+
+
+def _init_worker(path: list[str]) -> None:
+    # Spawned workers need the BRRTRouter tooling path the CLI prepended.
+    sys.path[:] = path
+
+
+def _timed(options: dict) -> tuple[int, float]:
+    started = time.perf_counter()
+    try:
+        result = generate_service(**options)
+    except (Exception, SystemExit) as exc:  # reported with the other services' results
+        name = f"{options['suite']}/{options['service']}"
+        print(f"{name}: {type(exc).__name__}: {exc}", file=sys.stderr)
+        result = 1
+    return result, time.perf_counter() - started
+
+
+def generate_suite(
+    root: Path,
+    suite: str,
+    services: list[str],
+    *,
+    gen_package_name: Callable[[str, str], str],
+    impl_package_name: Callable[[str, str], str] | None = None,
+    arguments: list[str] | tuple[str, ...] = (),
+    stamp: bool = True,
+    jobs: int | None = None,
+) -> int:
+    """Generate ``services`` of ``suite`` concurrently, one process per core.
+
+    Callbacks must be picklable (module-level functions) to reach the workers.
+    """
+    tasks = [
+        {
+            "root": root,
+            "suite": suite,
+            "service": service,
+            "gen_package_name": gen_package_name,
+            "impl_package_name": impl_package_name(suite, service) if impl_package_name else None,
+            "arguments": list(arguments),
+            "stamp": stamp,
+        }
+        for service in services
+    ]
+    workers = min(jobs or _GEN_WORKERS, len(tasks))
+    started = time.perf_counter()
+    if workers <= 1:
+        results = [_timed(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(list(sys.path),)
+        ) as pool:
+            results = list(pool.map(_timed, tasks))
+    elapsed = time.perf_counter() - started
+
+    failed = 0
+    print(
+        f"Generated {len(tasks)} {suite} service(s) with {max(workers, 1)} worker(s) "
+        f"in {elapsed:.1f}s:"
+    )
+    for service, (result, seconds) in zip(services, results):
+        status = "ok" if result == 0 else f"failed ({result})"
+        failed += result != 0
+        print(f"  {service:<32} {seconds:8.1f}s  {status}")
+    return 1 if failed else 0
@@ -0,0 +1,419 @@
+"""Long-running runtime descriptor daemon for Tilt, CI and agent shells.
+
+``rerp services --serve`` keeps the descriptor set in memory, refreshes it when
+the inputs ``describe_service`` reads change, and answers JSON-line queries on a
+Unix socket (``.rerp-cache/services.sock`` by default):
+
+    {"command": "descriptors", "all": false, "root": "/path/to/rerp"}
+    {"command": "describe", "suite": "accounting", "service": "invoice"}
+    {"command": "ping"}
+
+Requests that name a ``root`` are refused unless it is the daemon's checkout,
+because ``RERP_CACHE_DIR`` can put several checkouts behind one socket.
+Before answering, the daemon refreshes synchronously when its watcher has seen
+changes it has not refreshed yet, so an edit is never answered from the
+previous descriptor set while the debounced refresh is still pending.
+
+Changes are picked up from inotify on Linux (``openapi/``, the
+``microservices/{suite}/{service}/{impl,gen}`` directories and
+``helm/rerp-microservice/values``) and by polling the same directories
+elsewhere. Refreshes go through ``DescriptorCache``, so only services whose
+inputs changed are re-described.
+
+The client half (``query``/``request_descriptors``) only imports the standard
+library so callers pay no more than interpreter startup; when no daemon is
+listening they return ``None`` and the caller falls back to in-process
+discovery.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import socket
+import struct
+import sys
+import threading
+import time
+from pathlib import Path
+
+from rerp_tooling.cache import cache_dir
+
+SOCKET_NAME = "services.sock"
+
+
+def default_socket_path(root: Path) -> Path:
+    """Socket beside the descriptor cache, honouring ``RERP_CACHE_DIR``."""
+    return cache_dir(Path(root).resolve()) / SOCKET_NAME
+
+
+def query(socket_path: Path, request: dict, timeout: float = 2.0):
+    """Send one request to a running daemon; ``None`` when nothing is listening."""
+    if not Path(socket_path).exists():
+        return None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.settimeout(timeout)
+            client.connect(str(socket_path))
+            client.sendall(json.dumps(request).encode() + b"\n")
+            client.shutdown(socket.SHUT_WR)
+            chunks = []
+            while True:
+                chunk = client.recv(65536)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+    except OSError:
+        return None
+    try:
+        response = json.loads(b"".join(chunks))
+    except ValueError:
+        return None
+    if not response.get("ok"):
+        raise RuntimeError(response.get("error") or "descriptor daemon request failed")
+    return response.get("result")
+
+
+def request_descriptors(root: Path, include_all: bool = False, socket_path: Path | None = None):
+    """Descriptors from a running daemon for ``root``, or ``None`` to fall back."""
+    root = Path(root).resolve()
+    request = {"command": "descriptors", "all": include_all, "root": str(root)}
+    try:
+        return query(socket_path or default_socket_path(root), request)
+    except RuntimeError:
+        # A daemon for another checkout, or one that cannot answer: discover in-process.
+        return None
+
+
+# inotify(7) constants; ctypes keeps the watcher free of third-party packages.
+_IN_MODIFY = 0x00000002
+_IN_ATTRIB = 0x00000004
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_MOVE_SELF = 0x00000800
+_IN_Q_OVERFLOW = 0x00004000
+_IN_ISDIR = 0x40000000
+_WATCH_MASK = (
+    _IN_MODIFY
+    | _IN_ATTRIB
+    | _IN_CLOSE_WRITE
+    | _IN_MOVED_FROM
+    | _IN_MOVED_TO
+    | _IN_CREATE
+    | _IN_DELETE
+    | _IN_DELETE_SELF
+    | _IN_MOVE_SELF
+)
+
+
+def watched_directories(root: Path) -> list[Path]:
+    """Directories whose entries or files feed ``describe_service``."""
+    directories = [
+        root / "openapi",
+        root / "microservices",
+        root / "helm" / "rerp-microservice" / "values",
+    ]
+    for suite in _subdirectories(root / "openapi"):
+        directories.append(suite)
+        directories.extend(_subdirectories(suite))
+    for suite in _subdirectories(root / "microservices"):
+        directories.append(suite)
+        for service in _subdirectories(suite):
+            directories.append(service)
+            directories.extend(
+                path for path in (service / "impl", service / "gen") if path.is_dir()
+            )
+    return [path for path in directories if path.is_dir()]
+
+
+def _subdirectories(path: Path) -> list[Path]:
+    try:
+        with os.scandir(path) as entries:
+            return sorted(Path(entry.path) for entry in entries if entry.is_dir())
+    except OSError:
+        return []
+
+
+class PollingWatcher:
+    """Portable watcher: compares directory and file mtimes on an interval."""
+
+    def __init__(self, root: Path, interval: float = 1.0) -> None:
+        self.root = root
+        self.interval = interval
+        self._snapshot = self._take_snapshot()
+
+    def _take_snapshot(self) -> dict[str, tuple[int, int]]:
+        snapshot = {}
+        for directory in watched_directories(self.root):
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.is_file():
+                            status = entry.stat()
+                            snapshot[entry.path] = (status.st_mtime_ns, status.st_size)
+                status = directory.stat()
+            except OSError:
+                continue
+            snapshot[str(directory)] = (status.st_mtime_ns, 0)
+        return snapshot
+
+    def wait(self, timeout: float) -> bool:
+        """Block up to ``timeout`` seconds; ``True`` when the watched tree changed."""
+        time.sleep(min(timeout, self.interval))
+        snapshot = self._take_snapshot()
+        changed = snapshot != self._snapshot
+        self._snapshot = snapshot
+        return changed
+
+    def pending(self) -> bool:
+        """``True`` when the tree changed since the last refresh."""
+        return self._take_snapshot() != self._snapshot
+
+    def mark_refreshed(self) -> None:
+        """Called before each refresh; later changes count as pending again."""
+        self._snapshot = self._take_snapshot()
+
+    def close(self) -> None:
+        return None
+
+
+class InotifyWatcher:
+    """Linux watcher backed by ``inotify_add_watch`` on the descriptor inputs."""
+
+    def __init__(self, root: Path, debounce: float = 0.1) -> None:
+        import ctypes
+        import ctypes.util
+
+        self.root = root
+        self.debounce = debounce
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+        self._fd = self._libc.inotify_init1(os.O_CLOEXEC | os.O_NONBLOCK)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._watched: set[str] = set()
+        self._busy = False
+        self._unrefreshed = False
+        self._add_watches()
+
+    def _add_watches(self) -> None:
+        for directory in watched_directories(self.root):
+            if str(directory) in self._watched:
+                continue
+            if self._libc.inotify_add_watch(self._fd, os.fsencode(directory), _WATCH_MASK) >= 0:
+                self._watched.add(str(directory))
+
+    def _read_masks(self) -> list[int]:
+        masks = []
+        try:
+            buffer = os.read(self._fd, 65536)
+        except BlockingIOError:
+            return masks
+        offset = 0
+        while offset + 16 <= len(buffer):
+            _wd, mask, _cookie, length = struct.unpack_from("iIII", buffer, offset)
+            masks.append(mask)
+            offset += 16 + length
+        return masks
+
+    def wait(self, timeout: float) -> bool:
+        import select
+
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return False
+        # Set before reading so ``pending`` never misses an event in flight.
+        self._busy = True
+        masks: list[int] = []
+        try:
+            masks = self._read_masks()
+            # Editors and git write in bursts; coalesce them into one refresh.
+            while select.select([self._fd], [], [], self.debounce)[0]:
+                masks.extend(self._read_masks())
+            if any(mask & (_IN_ISDIR | _IN_Q_OVERFLOW | _IN_DELETE_SELF) for mask in masks):
+                # New suites or services need their own watches.
+                self._watched.clear()
+                self._add_watches()
+        finally:
+            self._unrefreshed = self._unrefreshed or bool(masks)
+            self._busy = False
+        return bool(masks)
+
+    def pending(self) -> bool:
+        """``True`` while events are queued, being debounced, or not yet refreshed."""
+        import select
+
+        if self._busy or self._unrefreshed:
+            return True
+        return bool(select.select([self._fd], [], [], 0)[0])
+
+    def mark_refreshed(self) -> None:
+        """Called before each refresh; later events count as pending again."""
+        self._unrefreshed = False
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+def default_watcher(root: Path):
+    try:
+        return InotifyWatcher(root)
+    except (OSError, AttributeError):
+        return PollingWatcher(root)
+
+
+class DescriptorDaemon:
+    """In-memory descriptor set served over a Unix socket."""
+
+    def __init__(self, root: Path, socket_path: Path | None = None, watcher=None) -> None:
+        from rerp_tooling.runtime import DescriptorCache
+
+        self.root = Path(root).resolve()
+        self.socket_path = Path(socket_path or default_socket_path(self.root))
+        self.watcher = watcher
+        self._cache = DescriptorCache.for_root(self.root)
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._server = None
+        self.descriptors: list[dict[str, str]] = []
+        self.refresh()
+
+    def refresh(self) -> None:
+        """Rescan the layout; ``DescriptorCache`` re-describes only changed services."""
+        from rerp_tooling.layout import RepositoryLayout
+        from rerp_tooling.runtime import discover_services
+
+        with self._lock:
+            if self.watcher is not None:
+                self.watcher.mark_refreshed()
+            RepositoryLayout.invalidate(self.root)
+            self.descriptors = discover_services(self.root, require_helm=False, cache=self._cache)
+
+    def handle(self, request: dict):
+        command = request.get("command")
+        requested_root = request.get("root")
+        if requested_root and Path(requested_root).resolve() != self.root:
+            raise LookupError(f"descriptor daemon serves {self.root}, not {requested_root}")
+        if command != "ping" and self.watcher is not None and self.watcher.pending():
+            self.refresh()
+        with self._lock:
+            descriptors = list(self.descriptors)
+        if command == "ping":
+            return {"root": str(self.root), "services": len(descriptors)}
+        if command == "descriptors":
+            if request.get("all"):
+                return descriptors
+            return [item for item in descriptors if "helm_values" in item]
+        if command == "describe":
+            for item in descriptors:
+                if (item["suite"], item["service"]) == (
+                    request.get("suite"),
+                    request.get("service"),
+                ):
+                    return item
+            raise LookupError(f"unknown service {request.get('suite')}/{request.get('service')}")
+        raise ValueError(f"unknown descriptor daemon command: {command!r}")
+
+    def _watch(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                if self.watcher.wait(0.5):
+                    self.refresh()
+            except Exception as error:  # noqa: BLE001 - keep serving the last good set
+                print(f"descriptor refresh failed: {error}", file=sys.stderr)
+
+    def serve_forever(self) -> None:
+        import socketserver
+
+        daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self) -> None:
+                try:
+                    result = daemon.handle(json.loads(self.rfile.readline() or b"{}"))
+                    response = {"ok": True, "result": result}
+                except Exception as error:  # noqa: BLE001 - report to the client
+                    response = {"ok": False, "error": str(error)}
+                self.wfile.write(json.dumps(response, sort_keys=True).encode() + b"\n")
+
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        if self.socket_path.exists():
+            if query(self.socket_path, {"command": "ping"}) is not None:
+                raise RuntimeError(f"descriptor daemon already listening on {self.socket_path}")
+            self.socket_path.unlink()
+        if self.watcher is None:
+            self.watcher = default_watcher(self.root)
+        watch_thread = threading.Thread(
+            target=self._watch, name="rerp-descriptor-watch", daemon=True
+        )
+        watch_thread.start()
+        self._server = socketserver.ThreadingUnixStreamServer(str(self.socket_path), Handler)
+        self._server.daemon_threads = True
+        try:
+            self._server.serve_forever(poll_interval=0.2)
+        finally:
+            self._stopped.set()
+            self._server.server_close()
+            watch_thread.join(timeout=2)
+            self.watcher.close()
+            try:
+                self.socket_path.unlink()
+            except OSError:
+                pass
+
+    def shutdown(self) -> None:
+        self._stopped.set()
+        if self._server is not None:
+            self._server.shutdown()
+
+
+def serve(root: Path, socket_path: Path | None = None) -> int:
+    """Run the daemon in the foreground until interrupted or terminated."""
+    import signal
+
+    def _terminate(_signum, _frame):
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGTERM, _terminate)
+    daemon = DescriptorDaemon(root, socket_path)
+    print(
+        f"Serving {len(daemon.descriptors)} RERP runtime descriptors on {daemon.socket_path}",
+        flush=True,
+    )
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        return 0
+    except RuntimeError as error:
+        print(str(error), file=sys.stderr)
+        return 1
+    return 0
+
+
+def _main() -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="RERP runtime descriptor daemon and client")
+    parser.add_argument("command", choices=["serve", "descriptors"])
+    parser.add_argument("--root", type=Path, default=Path.cwd())
+    parser.add_argument("--socket", type=Path, help="daemon socket path")
+    parser.add_argument("--all", action="store_true", help="include services without Helm values")
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        return serve(args.root, args.socket)
+    descriptors = request_descriptors(args.root, args.all, args.socket)
+    if descriptors is None:
+        # No daemon: answer in-process, still through the on-disk cache.
+        from rerp_tooling.runtime import discover_services
+
+        descriptors = discover_services(args.root, require_helm=not args.all, cache=True)
+    print(json.dumps(descriptors, sort_keys=True))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(_main())
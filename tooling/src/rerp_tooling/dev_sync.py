@@ -0,0 +1,174 @@
+"""Hot-swap a rebuilt service binary into its running dev containers.
+
+The runtime image starts services through ``docker/base/dev-entrypoint.sh``,
+which runs the binary as a child and restarts it on SIGHUP. A dev sync uses
+that instead of an image build, push, Flux image-policy update and rollout:
+
+1. The artifact is verified against its ``.sha256`` sidecar.
+2. Containers already running that digest are skipped.
+3. The binary is copied to ``/app/.service.partial`` and its SHA-256 is checked
+   again inside the container.
+4. The copy is renamed over ``/app/service`` and PID 1 gets ``SIGHUP``.
+
+The swap lives only as long as the container. The next published image makes
+it durable, and a pod restart before then runs the image's binary again.
+
+Targets are a local container (``docker cp``/``docker exec``) or every running
+pod of the service's Deployment (``kubectl cp``/``kubectl exec``). The pods are
+found through the ``app`` label and namespace in its Helm values.
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+from dataclasses import dataclass
+from pathlib import Path
+
+APP_BINARY = "/app/service"
+PARTIAL_BINARY = "/app/.service.partial"
+ENTRYPOINT_PID = "1"
+
+# $1 expected digest, $2 partial copy, $3 live binary, $4 entrypoint PID.
+_SWAP_SCRIPT = """set -e
+actual=$(sha256sum "$2" | cut -d ' ' -f 1)
+if [ "$actual" != "$1" ]; then
+    rm -f "$2"
+    echo "copied binary has digest $actual, expected $1" >&2
+    exit 3
+fi
+chmod 0755 "$2"
+mv -f "$2" "$3"
+kill -HUP "$4"
+"""
+
+
+class DevSyncError(RuntimeError):
+    """A container could not be found or refused the new binary."""
+
+
+@dataclass(frozen=True)
+class DockerTarget:
+    """One local container, addressed by name or ID."""
+
+    container: str
+
+    def containers(self, runner) -> list[str]:
+        return [self.container]
+
+    def copy(self, container: str, source: Path, destination: str) -> list[str]:
+        return ["docker", "cp", str(source), f"{container}:{destination}"]
+
+    def exec(self, container: str, command: list[str]) -> list[str]:
+        return ["docker", "exec", container, *command]
+
+
+@dataclass(frozen=True)
+class KubernetesTarget:
+    """Every running pod of one Deployment (``app=<name>`` in ``namespace``)."""
+
+    namespace: str
+    app: str
+    kubeconfig: str | None = None
+
+    def _kubectl(self) -> list[str]:
+        kubeconfig = ["--kubeconfig", self.kubeconfig] if self.kubeconfig else []
+        return ["kubectl", *kubeconfig, "--namespace", self.namespace]
+
+    def containers(self, runner) -> list[str]:
+        command = [
+            *self._kubectl(),
+            "get",
+            "pods",
+            "--selector",
+            f"app={self.app}",
+            "--field-selector",
+            "status.phase=Running",
+            "--output",
+            "jsonpath={.items[*].metadata.name}",
+        ]
+        result = runner(command, capture_output=True, text=True, check=False)
+        if result.returncode != 0:
+            raise DevSyncError(result.stderr.strip() or f"{' '.join(command)} failed")
+        return result.stdout.split()
+
+    def copy(self, container: str, source: Path, destination: str) -> list[str]:
+        return [
+            *self._kubectl(),
+            "cp",
+            "--container",
+            self.app,
+            str(source),
+            f"{container}:{destination}",
+        ]
+
+    def exec(self, container: str, command: list[str]) -> list[str]:
+        return [*self._kubectl(), "exec", container, "--container", self.app, "--", *command]
+
+
+def kubernetes_target(
+    root: Path, descriptor: dict[str, str], kubeconfig: str | None = None
+) -> KubernetesTarget:
+    """Deployment of ``descriptor`` as the Helm chart names it."""
+    values: dict = {}
+    if descriptor.get("helm_values"):
+        import yaml
+
+        values = yaml.safe_load((root / descriptor["helm_values"]).read_text()) or {}
+    app = (values.get("service") or {}).get("name") or descriptor["service"]
+    namespace = (values.get("deployment") or {}).get("namespace") or "rerp"
+    return KubernetesTarget(namespace, app, kubeconfig)
+
+
+def _run(runner, command: list[str]) -> subprocess.CompletedProcess:
+    try:
+        return runner(command, capture_output=True, text=True, check=False)
+    except OSError as error:
+        raise DevSyncError(f"{command[0]}: {error}") from None
+
+
+def _running_digest(target, container: str, runner) -> str:
+    result = _run(runner, target.exec(container, ["sha256sum", APP_BINARY]))
+    return result.stdout.split()[0] if result.returncode == 0 and result.stdout else ""
+
+
+def sync_container(target, container: str, artifact: Path, digest: str, runner) -> bool:
+    """Swap ``artifact`` into ``container``; ``False`` when it already runs ``digest``."""
+    if _running_digest(target, container, runner) == digest:
+        return False
+    for command in (
+        target.copy(container, artifact, PARTIAL_BINARY),
+        target.exec(
+            container,
+            ["sh", "-c", _SWAP_SCRIPT, "sh", digest, PARTIAL_BINARY, APP_BINARY, ENTRYPOINT_PID],
+        ),
+    ):
+        result = _run(runner, command)
+        if result.returncode != 0:
+            raise DevSyncError(result.stderr.strip() or f"{' '.join(command)} failed")
+    return True
+
+
+def sync_binary(artifact: Path, digest: str, target, runner=subprocess.run) -> int:
+    """Push a verified ``artifact`` into every container of ``target``."""
+    try:
+        containers = target.containers(runner)
+    except DevSyncError as error:
+        print(f"dev sync: {error}", file=os.sys.stderr)
+        return 1
+    if not containers:
+        print("dev sync: no running container to update", file=os.sys.stderr)
+        return 1
+    failures = 0
+    for container in containers:
+        try:
+            swapped = sync_container(target, container, artifact, digest, runner)
+        except DevSyncError as error:
+            failures += 1
+            print(f"dev sync {container}: {error}", file=os.sys.stderr)
+            continue
+        if swapped:
+            print(f"Synced {artifact.name} ({digest[:12]}) into {container}; restarting")
+        else:
+            print(f"{container} already runs {artifact.name} ({digest[:12]})")
+    return 1 if failures else 0
@@ -0,0 +1,307 @@
+"""Retention for build artifacts, local ``rerp-*`` images and registry dev tags.
+
+Every Tilt cycle pushes a ``dev-<nanos>`` tag and rebuilds binaries under
+``build_artifacts/``. ``rerp docker gc`` keeps the newest ``keep`` dev tags of
+each image. With ``max_age`` it also drops tags older than that, but always
+keeps the newest one. It covers three places:
+
+* ``build_artifacts/<arch>/<suite>/``: each binary is overwritten in place, so
+  there are no generations to expire. Abandoned ``.partial`` copies older than
+  an hour are removed. Binaries that no current service builds, with their
+  ``.sha256`` and ``.verified.json`` sidecars, are removed only when
+  ``prune_orphans`` is set.
+* Local Docker images: ``dev-<nanos>`` tags of ``rerp-*`` repositories beyond
+  retention, and untagged images labelled ``io.rerp.service``. Other tags such
+  as ``tilt`` and ``latest`` are never touched.
+* Registry dev tags, when a registry is given. Manifests are deleted by digest
+  unless a retained tag shares the digest. Bytes are reported for blobs no
+  retained tag references; the registry's own ``garbage-collect`` frees them.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import subprocess
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from rerp_tooling.registry import RegistryClient, RegistryError
+
+DEV_TAG = re.compile(r"^dev-(\d+)$")
+_SIDECARS = (".sha256", ".verified.json")
+# A younger ``.partial`` may belong to a copy that is still running.
+PARTIAL_GRACE_SECONDS = 3600
+
+
+@dataclass(frozen=True)
+class Removal:
+    kind: str
+    target: str
+    size: int
+
+
+def format_bytes(size: int) -> str:
+    value = float(size)
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if value < 1024 or unit == "GiB":
+            return f"{value:.0f} {unit}" if unit == "B" else f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{size} B"  # pragma: no cover
+
+
+def _expired(generations: list, keep: int, max_age: float | None, now: float, age) -> list:
+    """Generations (newest first) outside retention; the newest is always kept."""
+    expired = []
+    for position, generation in enumerate(generations):
+        if position == 0:
+            continue
+        if position >= keep or (max_age is not None and now - age(generation) > max_age):
+            expired.append(generation)
+    return expired
+
+
+def artifact_removals(
+    artifacts_root: Path,
+    binaries: set[tuple[str, str]],
+    *,
+    prune_orphans: bool = False,
+    now: float | None = None,
+) -> list[Removal]:
+    """Plan removals below ``{artifacts_root}/<arch>/<suite>/`` for ``(suite, binary)`` pairs.
+
+    ``binaries`` must name every binary the tree builds; files matching none of
+    them are orphans and are only planned when ``prune_orphans`` is set.
+    """
+    now = time.time() if now is None else now
+    removals = []
+    for arch_dir in sorted(path for path in artifacts_root.glob("*") if path.is_dir()):
+        for suite_dir in sorted(path for path in arch_dir.glob("*") if path.is_dir()):
+            suite = suite_dir.name
+            for path in sorted(suite_dir.iterdir()):
+                if not path.is_file():
+                    continue
+                status = path.stat()
+                if path.name.endswith(".partial"):
+                    if now - status.st_mtime > PARTIAL_GRACE_SECONDS:
+                        removals.append(Removal("artifact", str(path), status.st_size))
+                    continue
+                if not prune_orphans or path.name.endswith(_SIDECARS):
+                    continue
+                if (suite, path.name) in binaries:
+                    continue
+                for candidate in [path, *(Path(f"{path}{suffix}") for suffix in _SIDECARS)]:
+                    if candidate.is_file():
+                        size = candidate.stat().st_size
+                        removals.append(Removal("artifact", str(candidate), size))
+    return removals
+
+
+def _docker(runner, arguments: list[str]) -> str:
+    try:
+        result = runner(["docker", *arguments], capture_output=True, text=True, check=False)
+    except OSError:
+        return ""
+    return result.stdout if result.returncode == 0 else ""
+
+
+def _dangling_images(runner) -> list[str]:
+    filters = ["--filter", "dangling=true", "--filter", "label=io.rerp.service"]
+    output = _docker(runner, ["image", "ls", "--quiet", *filters])
+    return list(dict.fromkeys(output.split()))
+
+
+def _image_sizes(runner, image_ids: set[str]) -> dict[str, int]:
+    sizes = {}
+    if not image_ids:
+        return sizes
+    output = _docker(
+        runner, ["image", "inspect", "--format", "{{.Id}}\t{{.Size}}", *sorted(image_ids)]
+    )
+    for line in output.splitlines():
+        full_id, _, size = line.partition("\t")
+        for image_id in image_ids:
+            if full_id.removeprefix("sha256:").startswith(image_id.removeprefix("sha256:")):
+                sizes[image_id] = int(size or 0)
+    return sizes
+
+
+def image_removals(
+    runner=subprocess.run, *, keep: int, max_age: float | None = None, now: float | None = None
+) -> list[Removal]:
+    """Plan ``docker rmi`` targets for expired dev tags and dangling RERP images."""
+    now = time.time() if now is None else now
+    rows = [
+        line.split("\t")
+        for line in _docker(
+            runner, ["image", "ls", "--format", "{{.Repository}}\t{{.Tag}}\t{{.ID}}"]
+        ).splitlines()
+        if line.count("\t") == 2
+    ]
+    tags: dict[str, list[tuple[int, str]]] = {}
+    images: dict[str, set[str]] = {}
+    for repository, tag, image_id in rows:
+        if not repository.rsplit("/", 1)[-1].startswith("rerp-"):
+            continue
+        images.setdefault(image_id, set()).add(f"{repository}:{tag}")
+        match = DEV_TAG.match(tag)
+        if match:
+            tags.setdefault(repository, []).append((int(match.group(1)), image_id))
+
+    targets: list[tuple[str, str]] = []
+    for repository, generations in tags.items():
+        generations.sort(reverse=True)
+        for stamp, image_id in _expired(
+            generations, keep, max_age, now, lambda generation: generation[0] / 1e9
+        ):
+            targets.append((f"{repository}:dev-{stamp}", image_id))
+    removed_refs = {reference for reference, _ in targets}
+    dangling = _dangling_images(runner)
+    targets.extend((image_id, image_id) for image_id in dangling)
+
+    # An image's bytes are only released once none of its RERP tags remain.
+    freed = {
+        image_id
+        for _, image_id in targets
+        if image_id in dangling or images.get(image_id, set()) <= removed_refs
+    }
+    sizes = _image_sizes(runner, freed)
+    removals = []
+    counted = set()
+    for reference, image_id in targets:
+        size = sizes.get(image_id, 0) if image_id in freed and image_id not in counted else 0
+        counted.add(image_id)
+        removals.append(Removal("image", reference, size))
+    return removals
+
+
+def registry_removals(
+    client: RegistryClient,
+    *,
+    keep: int,
+    max_age: float | None = None,
+    now: float | None = None,
+) -> list[Removal]:
+    """Plan manifest deletions for expired ``dev-<nanos>`` tags of ``rerp-*`` repositories."""
+    now = time.time() if now is None else now
+    removals = []
+    for repository in client.catalog():
+        if not repository.rsplit("/", 1)[-1].startswith("rerp-"):
+            continue
+        tags = client.tags(repository)
+        generations = sorted(
+            ((int(match.group(1)), tag) for tag in tags if (match := DEV_TAG.match(tag))),
+            reverse=True,
+        )
+        expired = _expired(generations, keep, max_age, now, lambda item: item[0] / 1e9)
+        if not expired:
+            continue
+        expired_tags = {tag for _, tag in expired}
+        digests = {tag: client.manifest(repository, tag)[0] for tag in tags}
+        retained = {digests[tag] for tag in tags if tag not in expired_tags}
+        retained_blobs: set[str] = set()
+        for digest in retained:
+            retained_blobs.update(client.blob_sizes(repository, digest))
+        counted: set[str] = set()
+        for _, tag in expired:
+            digest = digests[tag]
+            if digest in retained or digest in counted:
+                continue
+            blobs = client.blob_sizes(repository, digest)
+            size = sum(
+                value
+                for blob, value in blobs.items()
+                if blob not in retained_blobs and blob not in counted
+            )
+            counted.update(blobs)
+            counted.add(digest)
+            removals.append(Removal("registry", f"{repository}@{digest} ({tag})", size))
+    return removals
+
+
+def prune_dangling(runner=subprocess.run) -> int:
+    """Remove untagged RERP service images left behind by rebuilds of the same tag."""
+    dangling = _dangling_images(runner)
+    sizes = _image_sizes(runner, set(dangling))
+    reclaimed = 0
+    failures = 0
+    for image_id in dangling:
+        try:
+            _apply(Removal("image", image_id, sizes.get(image_id, 0)), runner, None)
+        except OSError as error:
+            failures += 1
+            print(f"could not remove {image_id}: {error}", file=os.sys.stderr)
+            continue
+        reclaimed += sizes.get(image_id, 0)
+    if dangling:
+        print(f"Pruned {len(dangling) - failures} dangling image(s), {format_bytes(reclaimed)}")
+    return 1 if failures else 0
+
+
+def _apply(removal: Removal, runner, client: RegistryClient | None) -> None:
+    if removal.kind == "artifact":
+        os.unlink(removal.target)
+    elif removal.kind == "image":
+        result = runner(
+            ["docker", "rmi", removal.target], capture_output=True, text=True, check=False
+        )
+        if result.returncode != 0:
+            raise OSError(result.stderr.strip() or f"docker rmi {removal.target} failed")
+    else:
+        repository, _, rest = removal.target.partition("@")
+        client.delete_manifest(repository, rest.split(" ", 1)[0])
+
+
+def collect(
+    root: Path,
+    binaries: set[tuple[str, str]],
+    *,
+    artifacts_root: str | Path = "build_artifacts",
+    keep: int = 3,
+    max_age: float | None = None,
+    registry: str | None = None,
+    images: bool = True,
+    prune_orphans: bool = False,
+    dry_run: bool = False,
+    runner=subprocess.run,
+    client: RegistryClient | None = None,
+) -> int:
+    """Plan and apply every removal, then report the bytes reclaimed per category."""
+    artifacts = Path(artifacts_root)
+    artifacts = artifacts if artifacts.is_absolute() else root / artifacts
+    removals = artifact_removals(artifacts, binaries, prune_orphans=prune_orphans)
+    if images:
+        removals.extend(image_removals(runner, keep=keep, max_age=max_age))
+    if registry or client:
+        client = client or RegistryClient(registry)
+        try:
+            removals.extend(registry_removals(client, keep=keep, max_age=max_age))
+        except RegistryError as error:
+            print(f"registry: {error}", file=os.sys.stderr)
+            client = None
+
+    totals: dict[str, list[int]] = {kind: [0, 0] for kind in ("artifact", "image", "registry")}
+    failures = 0
+    for removal in removals:
+        if not dry_run:
+            try:
+                _apply(removal, runner, client)
+            except (OSError, RegistryError) as error:
+                failures += 1
+                print(f"could not remove {removal.target}: {error}", file=os.sys.stderr)
+                continue
+        print(f"{'would remove' if dry_run else 'removed'} {removal.kind} {removal.target}")
+        totals[removal.kind][0] += 1
+        totals[removal.kind][1] += removal.size
+
+    reclaimed = sum(size for _, size in totals.values())
+    labels = {"artifact": "artifacts", "image": "images", "registry": "registry"}
+    details = ", ".join(
+        f"{labels[kind]} {format_bytes(size)} ({count})" for kind, (count, size) in totals.items()
+    )
+    verb = "Would reclaim" if dry_run else "Reclaimed"
+    print(f"{verb} {format_bytes(reclaimed)}: {details}")
+    if totals["registry"][0] and not dry_run:
+        print("Run the registry's garbage-collect to release deleted registry blobs.")
+    return 1 if failures else 0
@@ -0,0 +1,187 @@
+"""Content stamps that let ``rerp gen suite`` skip no-op regenerations.
+
+Tilt re-runs ``rerp gen suite <suite> --service <name>`` whenever the spec or
+``tooling/pyproject.toml`` is touched. Regeneration rewrites ``gen/`` and the
+generated ``impl/config`` even when nothing changed, and the new mtimes make
+cargo recompile the service and everything downstream of it.
+
+A stamp in ``.rerp-cache/gen-stamps/`` records the SHA-256 of the generation
+inputs, plus ``(size, mtime_ns, sha256)`` for every output file:
+
+* the spec and its ``brrtrouter-dependencies.toml`` (service and suite level);
+* the generator identity: the ``brrtrouter-tooling`` version, a digest of the
+  installed ``brrtrouter_tooling`` package files (code and templates, since an
+  editable install keeps its version across edits) and its ``pyproject.toml``,
+  and the stat of ``$BRRTROUTER_ROOT/target/debug/brrtrouter-gen`` when that
+  binary exists;
+* the gen/impl package names RERP's naming callbacks produce for the service;
+* any extra arguments forwarded to the generator.
+
+When the inputs match and every recorded output is still on disk unchanged,
+generation is skipped. When it does run, outputs whose content is
+byte-identical to the previous generation get their old mtime back, so cargo
+only sees files that really changed.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from rerp_tooling.cache import cache_dir, content_key, read_json, write_json
+
+VERSION = 1
+
+
+def _source_digest(package_dir: Path) -> str:
+    """SHA-256 over every file of an installed package plus its ``pyproject.toml``.
+
+    Editable installs keep their version when code or templates change, so the
+    version alone cannot identify the generator.
+    """
+    digest = hashlib.sha256()
+    files = [
+        path
+        for path in package_dir.rglob("*")
+        if path.is_file() and "__pycache__" not in path.parts
+    ]
+    for candidate in (package_dir.parent, package_dir.parent.parent):
+        if (candidate / "pyproject.toml").is_file():
+            files.append(candidate / "pyproject.toml")
+            break
+    for path in sorted(files):
+        digest.update(path.relative_to(package_dir.parent.parent).as_posix().encode())
+        digest.update(b"\0")
+        digest.update((content_key(path) or "").encode())
+    return digest.hexdigest()
+
+
+_IDENTITIES: dict[str, dict[str, object]] = {}
+
+
+def generator_identity() -> dict[str, object]:
+    """Identity of the generator that ``gen suite`` will run.
+
+    Covers the ``brrtrouter-tooling`` version, a digest of the installed
+    ``brrtrouter_tooling`` sources and templates, and the stat of
+    ``$BRRTROUTER_ROOT/target/debug/brrtrouter-gen`` when that binary exists.
+    The source digest is computed once per process.
+    """
+    from importlib.metadata import PackageNotFoundError, version
+    from importlib.util import find_spec
+
+    try:
+        identity: dict[str, object] = {"brrtrouter-tooling": version("brrtrouter-tooling")}
+    except PackageNotFoundError:
+        identity = {"brrtrouter-tooling": None}
+    spec = find_spec("brrtrouter_tooling")
+    locations = list(spec.submodule_search_locations or []) if spec else []
+    if locations:
+        package_dir = Path(locations[0]).resolve()
+        key = str(package_dir)
+        if key not in _IDENTITIES:
+            _IDENTITIES[key] = {"sources": _source_digest(package_dir)}
+        identity.update(_IDENTITIES[key])
+    brrtrouter_root = os.environ.get("BRRTROUTER_ROOT", "").strip()
+    if brrtrouter_root:
+        try:
+            status = (Path(brrtrouter_root) / "target" / "debug" / "brrtrouter-gen").stat()
+            identity["brrtrouter-gen"] = [status.st_size, status.st_mtime_ns]
+        except OSError:
+            pass
+    return identity
+
+
+class GenStamp:
+    """Generation stamp for one ``{suite}/{service}``."""
+
+    def __init__(self, root: Path, suite: str, service: str) -> None:
+        self.root = Path(root)
+        self.suite = suite
+        self.service = service
+        self.path = cache_dir(self.root) / "gen-stamps" / f"{suite}--{service}.json"
+        self.recorded = read_json(self.path, VERSION) or {}
+
+    def _spec(self) -> Path:
+        spec_name = "openapi_bff.yaml" if self.service == "bff" else f"{self.service}/openapi.yaml"
+        return self.root / "openapi" / self.suite / spec_name
+
+    def _output_roots(self) -> list[Path]:
+        service_root = self.root / "microservices" / self.suite / self.service
+        return [service_root / "gen", service_root / "impl" / "config"]
+
+    def inputs(self, packages: dict[str, str], arguments: list[str], generator: dict) -> str:
+        """SHA-256 over every input that shapes the generated output."""
+        spec = self._spec()
+        sources = [
+            spec,
+            spec.parent / "brrtrouter-dependencies.toml",
+            self.root / "openapi" / self.suite / "brrtrouter-dependencies.toml",
+        ]
+        document = {
+            "files": {
+                path.relative_to(self.root).as_posix(): content_key(path) for path in sources
+            },
+            "generator": generator,
+            "packages": packages,
+            "arguments": arguments,
+        }
+        return hashlib.sha256(json.dumps(document, sort_keys=True).encode()).hexdigest()
+
+    def _output_files(self) -> dict[str, os.stat_result]:
+        files = {}
+        for output_root in self._output_roots():
+            for directory, _, names in os.walk(output_root):
+                for name in names:
+                    path = Path(directory) / name
+                    try:
+                        files[path.relative_to(self.root).as_posix()] = path.stat()
+                    except OSError:
+                        continue
+        return files
+
+    def snapshot(self) -> dict[str, list]:
+        """``{path: [size, mtime_ns, sha256]}`` of the current outputs.
+
+        Files whose stat still matches the stamp reuse its recorded digest.
+        """
+        recorded = self.recorded.get("outputs") or {}
+        outputs = {}
+        for name, status in self._output_files().items():
+            previous = recorded.get(name)
+            if previous and previous[:2] == [status.st_size, status.st_mtime_ns]:
+                outputs[name] = previous
+            else:
+                outputs[name] = [status.st_size, status.st_mtime_ns, content_key(self.root / name)]
+        return outputs
+
+    def is_current(self, inputs: str) -> bool:
+        """True when ``inputs`` match and no recorded output was changed or removed."""
+        if self.recorded.get("inputs") != inputs:
+            return False
+        current = {
+            name: [status.st_size, status.st_mtime_ns]
+            for name, status in self._output_files().items()
+        }
+        recorded = self.recorded.get("outputs") or {}
+        return bool(recorded) and current == {
+            name: entry[:2] for name, entry in recorded.items()
+        }
+
+    def restore_unchanged(self, previous: dict[str, list]) -> int:
+        """Give regenerated files identical to ``previous`` their old mtime back."""
+        restored = 0
+        for name, status in self._output_files().items():
+            before = previous.get(name)
+            if not before or before[1] == status.st_mtime_ns or before[0] != status.st_size:
+                continue
+            if content_key(self.root / name) == before[2]:
+                os.utime(self.root / name, ns=(status.st_atime_ns, before[1]))
+                restored += 1
+        return restored
+
+    def record(self, inputs: str) -> None:
+        self.recorded = {"version": VERSION, "inputs": inputs, "outputs": self.snapshot()}
+        write_json(self.path, self.recorded)
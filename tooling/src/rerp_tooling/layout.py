@@ -0,0 +1,191 @@
+"""Single-pass index of RERP's suite-nested repository layout.
+
+Runtime discovery and the CLI path resolvers used to probe ``openapi/``,
+``microservices/`` and ``helm/rerp-microservice/values`` independently, often
+once per service. ``RepositoryLayout`` walks those trees once with
+``os.scandir`` and answers every layout question from memory:
+
+    openapi/{suite}/{service}/openapi.yaml
+    openapi/{suite}/openapi_bff.yaml, openapi/{suite}/bff-suite-config.yaml
+    microservices/{suite}/{service}/{impl,gen}/Cargo.toml, impl/config/
+    helm/rerp-microservice/values/*.yaml
+
+Layouts are cached per resolved root for the life of the process. Long-running
+callers that watch the tree must call ``RepositoryLayout.invalidate``.
+"""
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+
+HELM_VALUES_DIR = Path("helm") / "rerp-microservice" / "values"
+
+
+def _entries(path: Path) -> list[os.DirEntry]:
+    try:
+        with os.scandir(path) as iterator:
+            return list(iterator)
+    except OSError:
+        return []
+
+
+@dataclass(frozen=True)
+class ServicePaths:
+    """Resolved paths for one ``{suite}/{service}``; ``None`` marks a missing input."""
+
+    suite: str
+    service: str
+    service_root: Path
+    spec: Path | None
+    impl_manifest: Path | None
+    gen_manifest: Path | None
+    config_dir: Path
+    helm_values: Path | None
+
+
+@dataclass
+class SuiteLayout:
+    """What one suite contributes to ``openapi/`` and ``microservices/``."""
+
+    name: str
+    in_openapi: bool = False
+    spec_services: set[str] = field(default_factory=set)
+    has_bff_spec: bool = False
+    has_bff_config: bool = False
+    # service -> names present below microservices/{suite}/{service}/{impl,gen}
+    impl_entries: dict[str, set[str]] = field(default_factory=dict)
+    gen_entries: dict[str, set[str]] = field(default_factory=dict)
+
+
+class RepositoryLayout:
+    """Suite → service → spec/impl/gen/config/helm index built from one walk."""
+
+    _cache: dict[Path, RepositoryLayout] = {}
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self.suites: dict[str, SuiteLayout] = {}
+        self.helm_values: set[str] = set()
+        self._scan()
+
+    @classmethod
+    def for_root(cls, root: Path) -> RepositoryLayout:
+        root = Path(root).resolve()
+        layout = cls._cache.get(root)
+        if layout is None:
+            layout = cls._cache[root] = cls(root)
+        return layout
+
+    @classmethod
+    def invalidate(cls, root: Path | None = None) -> None:
+        """Drop cached layouts so the next ``for_root`` rescans the tree."""
+        if root is None:
+            cls._cache.clear()
+        else:
+            cls._cache.pop(Path(root).resolve(), None)
+
+    def _suite(self, name: str) -> SuiteLayout:
+        return self.suites.setdefault(name, SuiteLayout(name))
+
+    def _scan(self) -> None:
+        for suite_entry in _entries(self.root / "openapi"):
+            if not suite_entry.is_dir():
+                continue
+            suite = self._suite(suite_entry.name)
+            suite.in_openapi = True
+            for entry in _entries(Path(suite_entry.path)):
+                if entry.is_dir():
+                    if any(
+                        child.name == "openapi.yaml" and child.is_file()
+                        for child in _entries(Path(entry.path))
+                    ):
+                        suite.spec_services.add(entry.name)
+                elif entry.name == "openapi_bff.yaml":
+                    suite.has_bff_spec = True
+                elif entry.name == "bff-suite-config.yaml":
+                    suite.has_bff_config = True
+
+        for suite_entry in _entries(self.root / "microservices"):
+            if not suite_entry.is_dir():
+                continue
+            suite = None
+            for service_entry in _entries(Path(suite_entry.path)):
+                if not service_entry.is_dir():
+                    continue
+                for crate_entry in _entries(Path(service_entry.path)):
+                    if crate_entry.name not in {"impl", "gen"} or not crate_entry.is_dir():
+                        continue
+                    names = {
+                        child.name
+                        for child in _entries(Path(crate_entry.path))
+                        if child.name != "config" or child.is_dir()
+                    }
+                    suite = suite or self._suite(suite_entry.name)
+                    crates = suite.impl_entries if crate_entry.name == "impl" else suite.gen_entries
+                    crates[service_entry.name] = names
+
+        self.helm_values = {
+            entry.name for entry in _entries(self.root / HELM_VALUES_DIR) if entry.is_file()
+        }
+
+    def suite_names(self) -> list[str]:
+        """Suites with an ``openapi/{suite}`` directory, sorted."""
+        return sorted(name for name, suite in self.suites.items() if suite.in_openapi)
+
+    def spec_services(self, suite: str) -> list[str]:
+        """Services owning ``openapi/{suite}/{service}/openapi.yaml``, sorted."""
+        layout = self.suites.get(suite)
+        return sorted(layout.spec_services) if layout else []
+
+    def has_bff_spec(self, suite: str) -> bool:
+        layout = self.suites.get(suite)
+        return bool(layout and layout.has_bff_spec)
+
+    def suites_with_bff(self) -> list[str]:
+        """Suites with a ``bff-suite-config.yaml``, sorted."""
+        return sorted(name for name, suite in self.suites.items() if suite.has_bff_config)
+
+    def suites_for_service(self, service: str) -> list[str]:
+        """Suites that own ``service`` by spec (or, for ``bff``, by suite config)."""
+        return sorted(
+            name
+            for name, suite in self.suites.items()
+            if service in suite.spec_services or (service == "bff" and suite.has_bff_config)
+        )
+
+    def helm_values_path(self, suite: str, service: str) -> Path | None:
+        values_dir = self.root / HELM_VALUES_DIR
+        if f"{suite}-{service}.yaml" in self.helm_values:
+            return values_dir / f"{suite}-{service}.yaml"
+        if suite == "accounting" and f"{service}.yaml" in self.helm_values:
+            return values_dir / f"{service}.yaml"
+        return None
+
+    def service(self, suite: str, service: str) -> ServicePaths:
+        """Resolve every runtime path for ``{suite}/{service}`` without touching disk."""
+        layout = self.suites.get(suite) or SuiteLayout(suite)
+        service_root = self.root / "microservices" / suite / service
+        spec = None
+        if service in layout.spec_services:
+            spec = self.root / "openapi" / suite / service / "openapi.yaml"
+        elif service == "bff" and layout.has_bff_spec:
+            spec = self.root / "openapi" / suite / "openapi_bff.yaml"
+        impl_entries = layout.impl_entries.get(service, set())
+        gen_entries = layout.gen_entries.get(service, set())
+        config_parent = "impl" if "config" in impl_entries else "gen"
+        return ServicePaths(
+            suite=suite,
+            service=service,
+            service_root=service_root,
+            spec=spec,
+            impl_manifest=service_root / "impl" / "Cargo.toml"
+            if "Cargo.toml" in impl_entries
+            else None,
+            gen_manifest=service_root / "gen" / "Cargo.toml"
+            if "Cargo.toml" in gen_entries
+            else None,
+            config_dir=service_root / config_parent / "config",
+            helm_values=self.helm_values_path(suite, service),
+        )
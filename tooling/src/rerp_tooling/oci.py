@@ -0,0 +1,358 @@
+"""Daemonless OCI image assembly on top of an exported base image.
+
+A RERP service image is ``rerp-base:latest`` plus a handful of copied layers
+(the binary, ``config/``, ``doc/`` and ``static_site/``). ``OciLayout`` reads a
+base image from an OCI image layout directory, for example one written by
+``docker buildx build --output type=oci,tar=false`` or
+``skopeo copy docker-daemon:rerp-base:latest oci:base``. It then writes those
+layers, a new image config and a manifest straight into another layout, with no
+Docker daemon or network involved.
+
+Layers are reproducible: entries are sorted, mtimes are zero, ownership is
+``0:0`` and gzip headers carry no name or timestamp. The same inputs therefore
+always produce the same blob digests. ``LayerCache`` maps a layer's input key
+to the blob it produced, so an unchanged layer whose blob is already in the
+output layout is reused without being re-tarred or re-compressed.
+"""
+
+from __future__ import annotations
+
+import copy
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import tarfile
+import tempfile
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+
+from rerp_tooling.cache import file_sha256, read_json, write_json
+
+OCI_LAYOUT_VERSION = "1.0.0"
+MEDIA_TYPE_INDEX = "application/vnd.oci.image.index.v1+json"
+MEDIA_TYPE_MANIFEST = "application/vnd.oci.image.manifest.v1+json"
+MEDIA_TYPE_CONFIG = "application/vnd.oci.image.config.v1+json"
+MEDIA_TYPE_LAYER = "application/vnd.oci.image.layer.v1.tar+gzip"
+_INDEX_MEDIA_TYPES = {
+    MEDIA_TYPE_INDEX,
+    "application/vnd.docker.distribution.manifest.list.v2+json",
+}
+_EPOCH = "1970-01-01T00:00:00Z"
+
+
+@dataclass(frozen=True)
+class LayerFile:
+    """One entry of a layer; ``source=None`` marks a directory.
+
+    ``sha256`` may carry an already verified content digest so the layer key
+    does not need to hash ``source`` again.
+    """
+
+    path: str
+    source: Path | None
+    mode: int
+    sha256: str | None = None
+
+
+@dataclass(frozen=True)
+class Layer:
+    created_by: str
+    files: tuple[LayerFile, ...]
+
+
+@dataclass(frozen=True)
+class LayerBlob:
+    descriptor: dict
+    diff_id: str
+    reused: bool
+
+
+def layer_key(layer: Layer) -> str:
+    """Digest of everything that determines a layer's bytes."""
+    key = hashlib.sha256(f"rerp-layer-v1\0{layer.created_by}\0".encode())
+    for item in sorted(layer.files, key=lambda item: item.path):
+        content = "directory" if item.source is None else item.sha256 or file_sha256(item.source)
+        key.update(f"{item.path}\0{item.mode:o}\0{content}\0".encode())
+    return key.hexdigest()
+
+
+class _DigestWriter:
+    """Write-through file wrapper that tracks the SHA-256 and size of what passes."""
+
+    def __init__(self, target) -> None:
+        self._target = target
+        self.digest = hashlib.sha256()
+        self.size = 0
+
+    def write(self, data) -> int:
+        self.digest.update(data)
+        self.size += len(data)
+        return self._target.write(data)
+
+    def flush(self) -> None:
+        self._target.flush()
+
+
+def reproducible_tar_info(name: str, mode: int, size: int | None = None) -> tarfile.TarInfo:
+    """Tar header with ownership and mtime zeroed; ``size=None`` marks a directory."""
+    info = tarfile.TarInfo(name)
+    info.mtime = 0
+    info.uid = info.gid = 0
+    info.uname = info.gname = ""
+    info.mode = mode
+    if size is None:
+        info.type = tarfile.DIRTYPE
+    else:
+        info.size = size
+    return info
+
+
+def _tar_info(item: LayerFile) -> tarfile.TarInfo:
+    size = None if item.source is None else item.source.stat().st_size
+    return reproducible_tar_info(item.path, item.mode, size)
+
+
+class OciLayout:
+    """An OCI image layout directory (``oci-layout``, ``index.json``, ``blobs/``)."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+
+    @classmethod
+    def create(cls, path: Path) -> OciLayout:
+        layout = cls(path)
+        (layout.path / "blobs" / "sha256").mkdir(parents=True, exist_ok=True)
+        marker = layout.path / "oci-layout"
+        if not marker.exists():
+            marker.write_text(json.dumps({"imageLayoutVersion": OCI_LAYOUT_VERSION}) + "\n")
+        return layout
+
+    def blob_path(self, digest: str) -> Path:
+        algorithm, _, encoded = digest.partition(":")
+        return self.path / "blobs" / algorithm / encoded
+
+    def has_blob(self, digest: str) -> bool:
+        return self.blob_path(digest).is_file()
+
+    def read_json(self, descriptor: dict) -> dict:
+        return json.loads(self.blob_path(descriptor["digest"]).read_bytes())
+
+    def index(self) -> dict:
+        return json.loads((self.path / "index.json").read_text())
+
+    def put_bytes(self, data: bytes, media_type: str) -> dict:
+        digest = f"sha256:{hashlib.sha256(data).hexdigest()}"
+        target = self.blob_path(digest)
+        if not target.is_file():
+            partial = target.with_name(f".{target.name}.{threading.get_ident()}.partial")
+            partial.write_bytes(data)
+            os.replace(partial, target)
+        return {"mediaType": media_type, "digest": digest, "size": len(data)}
+
+    def put_json(self, document: dict, media_type: str) -> dict:
+        data = json.dumps(document, sort_keys=True, separators=(",", ":")).encode()
+        return self.put_bytes(data, media_type)
+
+    def import_blob(self, source: OciLayout, descriptor: dict) -> None:
+        """Hardlink (or copy) a blob from ``source`` unless this layout already has it."""
+        target = self.blob_path(descriptor["digest"])
+        if target.is_file():
+            return
+        partial = target.with_name(f".{target.name}.{threading.get_ident()}.partial")
+        try:
+            os.link(source.blob_path(descriptor["digest"]), partial)
+        except OSError:
+            shutil.copyfile(source.blob_path(descriptor["digest"]), partial)
+        os.replace(partial, target)
+
+    def write_layer(self, layer: Layer) -> tuple[dict, str]:
+        """Write ``layer`` as a reproducible gzip tar; returns ``(descriptor, diff_id)``."""
+        blobs = self.path / "blobs" / "sha256"
+        with tempfile.NamedTemporaryFile(dir=blobs, prefix=".layer-", delete=False) as raw:
+            partial = Path(raw.name)
+            try:
+                compressed = _DigestWriter(raw)
+                with gzip.GzipFile(filename="", mode="wb", fileobj=compressed, mtime=0) as stream:
+                    uncompressed = _DigestWriter(stream)
+                    with tarfile.open(
+                        fileobj=uncompressed, mode="w|", format=tarfile.PAX_FORMAT
+                    ) as archive:
+                        for item in sorted(layer.files, key=lambda item: item.path):
+                            info = _tar_info(item)
+                            if item.source is None:
+                                archive.addfile(info)
+                            else:
+                                with item.source.open("rb") as handle:
+                                    archive.addfile(info, handle)
+            except BaseException:
+                partial.unlink(missing_ok=True)
+                raise
+        digest = f"sha256:{compressed.digest.hexdigest()}"
+        os.replace(partial, self.blob_path(digest))
+        descriptor = {"mediaType": MEDIA_TYPE_LAYER, "digest": digest, "size": compressed.size}
+        return descriptor, f"sha256:{uncompressed.digest.hexdigest()}"
+
+    def manifests(self, descriptor: dict | None = None) -> list[dict]:
+        """Image manifest descriptors reachable from ``index.json``, nested indexes flattened."""
+        document = self.index() if descriptor is None else self.read_json(descriptor)
+        result = []
+        for child in document.get("manifests") or []:
+            if child.get("mediaType") in _INDEX_MEDIA_TYPES:
+                result.extend(self.manifests(child))
+            else:
+                result.append(child)
+        return result
+
+    def image_for_platform(self, platform: dict) -> tuple[dict, dict, dict]:
+        """``(descriptor, manifest, config)`` of the image built for ``platform``."""
+        candidates = []
+        for descriptor in self.manifests():
+            manifest = self.read_json(descriptor)
+            config = self.read_json(manifest["config"])
+            found = descriptor.get("platform") or {
+                "os": config.get("os"),
+                "architecture": config.get("architecture"),
+                "variant": config.get("variant"),
+            }
+            if found.get("os", "linux") != platform["os"]:
+                continue
+            if found.get("architecture") != platform["architecture"]:
+                continue
+            candidates.append((descriptor, manifest, config, found.get("variant")))
+        wanted = platform.get("variant")
+        for descriptor, manifest, config, variant in candidates:
+            if variant == wanted or (wanted is None or variant is None) and len(candidates) == 1:
+                return descriptor, manifest, config
+        rendered = "/".join(value for value in platform.values() if value)
+        raise LookupError(f"base layout {self.path} has no image for {rendered}")
+
+    def write_index(self, manifests: list[dict], ref_name: str | None = None) -> dict:
+        """Point ``index.json`` at an image index over ``manifests``."""
+        index = self.put_json(
+            {"schemaVersion": 2, "mediaType": MEDIA_TYPE_INDEX, "manifests": manifests},
+            MEDIA_TYPE_INDEX,
+        )
+        if ref_name:
+            index["annotations"] = {"org.opencontainers.image.ref.name": ref_name}
+        top = {"schemaVersion": 2, "mediaType": MEDIA_TYPE_INDEX, "manifests": [index]}
+        partial = self.path / ".index.json.partial"
+        partial.write_text(json.dumps(top, sort_keys=True, indent=2) + "\n")
+        os.replace(partial, self.path / "index.json")
+        return index
+
+    def reachable_blobs(self) -> set[str]:
+        """Digests of every blob referenced from ``index.json``."""
+        reachable = set()
+        pending = list(self.index().get("manifests") or [])
+        while pending:
+            descriptor = pending.pop()
+            if descriptor["digest"] in reachable:
+                continue
+            reachable.add(descriptor["digest"])
+            if descriptor.get("mediaType") in _INDEX_MEDIA_TYPES:
+                pending.extend(self.read_json(descriptor).get("manifests") or [])
+            elif "manifest" in descriptor.get("mediaType", ""):
+                manifest = self.read_json(descriptor)
+                pending.append(manifest["config"])
+                pending.extend(manifest.get("layers") or [])
+        return reachable
+
+    def write_tarball(self, destination: Path) -> None:
+        """Write the reachable part of the layout as a deterministic tar archive."""
+        names = ["oci-layout", "index.json"] + sorted(
+            self.blob_path(digest).relative_to(self.path).as_posix()
+            for digest in self.reachable_blobs()
+        )
+        partial = destination.with_name(f".{destination.name}.partial")
+        with tarfile.open(partial, mode="w", format=tarfile.PAX_FORMAT) as archive:
+            for directory in ("blobs", "blobs/sha256"):
+                archive.addfile(_tar_info(LayerFile(directory, None, 0o755)))
+            for name in names:
+                with (self.path / name).open("rb") as handle:
+                    archive.addfile(_tar_info(LayerFile(name, self.path / name, 0o644)), handle)
+        os.replace(partial, destination)
+
+
+class LayerCache:
+    """Layer input key → blob descriptor and diff_id, persisted as JSON."""
+
+    VERSION = 1
+
+    def __init__(self, path: Path | None = None) -> None:
+        self.path = path
+        payload = (read_json(path, self.VERSION) if path else None) or {}
+        self._layers: dict[str, dict] = payload.get("layers") or {}
+        self._lock = threading.Lock()
+
+    def layer(self, output: OciLayout, layer: Layer) -> LayerBlob:
+        """Blob for ``layer`` in ``output``, written only when no matching blob exists."""
+        key = layer_key(layer)
+        with self._lock:
+            entry = self._layers.get(key)
+        if entry is not None and output.has_blob(entry["descriptor"]["digest"]):
+            return LayerBlob(entry["descriptor"], entry["diff_id"], reused=True)
+        descriptor, diff_id = output.write_layer(layer)
+        with self._lock:
+            self._layers[key] = {"descriptor": descriptor, "diff_id": diff_id}
+        return LayerBlob(descriptor, diff_id, reused=False)
+
+    def save(self) -> None:
+        if self.path is not None:
+            write_json(self.path, {"version": self.VERSION, "layers": self._layers})
+
+
+def assemble_image(
+    base: OciLayout,
+    output: OciLayout,
+    platform: dict,
+    layers: list[LayerBlob],
+    history: list[str],
+    *,
+    labels: dict[str, str] | None = None,
+    env: dict[str, str] | None = None,
+    exposed_ports: list[str] | None = None,
+    entrypoint: list[str] | None = None,
+) -> dict:
+    """Write the base image for ``platform`` plus ``layers``; returns a manifest descriptor."""
+    base_descriptor, base_manifest, base_config = base.image_for_platform(platform)
+    for descriptor in base_manifest.get("layers") or []:
+        output.import_blob(base, descriptor)
+
+    image = copy.deepcopy(base_config)
+    image["created"] = _EPOCH
+    settings = image.setdefault("config", {})
+    if labels:
+        settings["Labels"] = {**(settings.get("Labels") or {}), **labels}
+    if env:
+        merged = dict(item.split("=", 1) for item in settings.get("Env") or [] if "=" in item)
+        merged.update(env)
+        settings["Env"] = [f"{name}={value}" for name, value in merged.items()]
+    if exposed_ports:
+        settings["ExposedPorts"] = {
+            **(settings.get("ExposedPorts") or {}),
+            **{port: {} for port in exposed_ports},
+        }
+    if entrypoint is not None:
+        settings["Entrypoint"] = entrypoint
+        settings.pop("Cmd", None)  # like Dockerfile ENTRYPOINT, drop the inherited CMD
+    rootfs = image.setdefault("rootfs", {"type": "layers", "diff_ids": []})
+    rootfs["diff_ids"] = list(rootfs.get("diff_ids") or []) + [blob.diff_id for blob in layers]
+    image["history"] = list(image.get("history") or []) + [
+        {"created": _EPOCH, "created_by": created_by} for created_by in history
+    ]
+
+    config = output.put_json(image, MEDIA_TYPE_CONFIG)
+    manifest = {
+        "schemaVersion": 2,
+        "mediaType": MEDIA_TYPE_MANIFEST,
+        "config": config,
+        "layers": list(base_manifest.get("layers") or []) + [blob.descriptor for blob in layers],
+    }
+    descriptor = output.put_json(manifest, MEDIA_TYPE_MANIFEST)
+    descriptor["platform"] = base_descriptor.get("platform") or {
+        key: value for key, value in platform.items() if value
+    }
+    return descriptor
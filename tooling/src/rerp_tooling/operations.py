@@ -0,0 +1,181 @@
+"""Fast, cached ``operationId`` extraction from OpenAPI documents.
+
+``rerp bff generate-system`` checks that the generated suite BFF (about 24k
+lines and 250 operations for accounting) contains every operationId of every
+configured service spec. Loading each document with the pure-Python
+``yaml.safe_load`` made YAML parsing most of that validation time.
+
+``scan_operation_ids`` walks the YAML event stream and never builds the
+document tree. It visits only ``paths`` → path item → HTTP method →
+``operationId`` and skips everything else by nesting depth, using libyaml's
+parser when PyYAML was built with it. Documents with aliases or merge keys
+where operations are expected fall back to a full (``CSafeLoader`` when
+available) load through ``rerp_tooling.specs.load_spec``, which shares the
+parsed document with other commands.
+
+``OperationIndex`` caches the result per file content SHA-256 in
+``.rerp-cache/operation-ids.json``, so unchanged specs are only hashed. A run
+whose lookups all hit does not rewrite the file.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import time
+from pathlib import Path
+
+from rerp_tooling.cache import cache_dir, read_json, write_json
+from rerp_tooling.specs import load_spec
+
+HTTP_METHODS = frozenset({"get", "post", "put", "patch", "delete", "options", "head", "trace"})
+_NULLS = frozenset({"", "~", "null", "Null", "NULL"})
+
+
+class _NeedsFullLoad(Exception):
+    """The event scan met a construct only a full load resolves (alias, merge key)."""
+
+
+def _loader(yaml, name: str):
+    return getattr(yaml, f"C{name}", None) or getattr(yaml, name)
+
+
+def _skip(yaml, events, event) -> None:
+    """Consume the rest of the node that starts with ``event``."""
+    if not isinstance(event, (yaml.MappingStartEvent, yaml.SequenceStartEvent)):
+        return
+    depth = 1
+    while depth:
+        current = next(events)
+        if isinstance(current, (yaml.MappingStartEvent, yaml.SequenceStartEvent)):
+            depth += 1
+        elif isinstance(current, (yaml.MappingEndEvent, yaml.SequenceEndEvent)):
+            depth -= 1
+
+
+def _pairs(yaml, events):
+    """``(key, value start event)`` for the mapping being read.
+
+    The caller must consume (or ``_skip``) each value before asking for the next.
+    """
+    while True:
+        key = next(events)
+        if isinstance(key, yaml.MappingEndEvent):
+            return
+        if isinstance(key, yaml.ScalarEvent):
+            if key.value == "<<" and key.implicit[0]:
+                raise _NeedsFullLoad
+            yield key.value, next(events)
+        else:
+            _skip(yaml, events, key)
+            _skip(yaml, events, next(events))
+
+
+def _mapping(yaml, event) -> bool:
+    if isinstance(event, yaml.AliasEvent):
+        raise _NeedsFullLoad
+    return isinstance(event, yaml.MappingStartEvent)
+
+
+def scan_operation_ids(data: bytes, load=None) -> frozenset[str]:
+    """operationIds of every HTTP operation under ``paths``.
+
+    ``load`` returns the parsed document when the scan needs a full load;
+    by default ``data`` itself is parsed.
+    """
+    import yaml
+
+    events = iter(yaml.parse(data, Loader=_loader(yaml, "SafeLoader")))
+    found: set[str] = set()
+    try:
+        for event in events:
+            if isinstance(event, yaml.DocumentStartEvent):
+                break
+        root = next(events, None)
+        if not _mapping(yaml, root):
+            return frozenset()
+        for key, paths in _pairs(yaml, events):
+            if key != "paths" or not _mapping(yaml, paths):
+                _skip(yaml, events, paths)
+                continue
+            for _, item in _pairs(yaml, events):
+                if not _mapping(yaml, item):
+                    _skip(yaml, events, item)
+                    continue
+                for method, operation in _pairs(yaml, events):
+                    if method not in HTTP_METHODS or not _mapping(yaml, operation):
+                        _skip(yaml, events, operation)
+                        continue
+                    for field, value in _pairs(yaml, events):
+                        if field == "operationId" and isinstance(value, yaml.ScalarEvent):
+                            if not (value.implicit[0] and value.value in _NULLS):
+                                found.add(value.value)
+                        else:
+                            _skip(yaml, events, value)
+    except _NeedsFullLoad:
+        return document_operation_ids(load()) if load else load_operation_ids(data)
+    return frozenset(found)
+
+
+def load_operation_ids(data: bytes) -> frozenset[str]:
+    """Full-load extraction; the reference behaviour the event scan reproduces."""
+    import yaml
+
+    return document_operation_ids(yaml.load(data, Loader=_loader(yaml, "SafeLoader")) or {})
+
+
+def document_operation_ids(spec: dict) -> frozenset[str]:
+    """operationIds of every HTTP operation under ``paths`` of a parsed document."""
+    found = set()
+    for path_item in (spec.get("paths") or {}).values():
+        if not isinstance(path_item, dict):
+            continue
+        for method, operation in path_item.items():
+            if method not in HTTP_METHODS or not isinstance(operation, dict):
+                continue
+            operation_id = operation.get("operationId")
+            if operation_id:
+                found.add(str(operation_id))
+    return frozenset(found)
+
+
+class OperationIndex:
+    """operationIds per OpenAPI file, cached by content SHA-256."""
+
+    VERSION = 1
+    MAX_ENTRIES = 512
+    RECENCY_SECONDS = 24 * 60 * 60
+
+    def __init__(self, path: Path | None, root: Path | None = None) -> None:
+        self.path = path
+        self.root = root
+        self.dirty = False
+        payload = (read_json(path, self.VERSION) if path else None) or {}
+        self.entries: dict[str, dict] = payload.get("files") or {}
+
+    @classmethod
+    def for_root(cls, root: Path) -> OperationIndex:
+        return cls(cache_dir(root) / "operation-ids.json", root)
+
+    def operation_ids(self, spec_path: str | Path) -> frozenset[str]:
+        data = Path(spec_path).read_bytes()
+        digest = hashlib.sha256(data).hexdigest()
+        entry = self.entries.get(digest)
+        now = time.time()
+        if entry is None:
+            found = scan_operation_ids(data, lambda: load_spec(spec_path, self.root))
+            entry = self.entries[digest] = {"operation_ids": sorted(found)}
+            entry["used"] = now
+            self.dirty = True
+        elif now - entry.get("used", 0) > self.RECENCY_SECONDS:
+            # Recency only orders eviction; refresh it at most daily so hits stay read-only.
+            entry["used"] = now
+            self.dirty = True
+        return frozenset(entry["operation_ids"])
+
+    def save(self) -> None:
+        if not self.dirty or self.path is None:
+            return
+        newest = sorted(self.entries.items(), key=lambda item: item[1].get("used", 0))
+        self.entries = dict(newest[-self.MAX_ENTRIES :])
+        if write_json(self.path, {"version": self.VERSION, "files": self.entries}):
+            self.dirty = False
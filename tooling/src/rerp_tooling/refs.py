@@ -0,0 +1,151 @@
+"""``$ref`` index for OpenAPI documents.
+
+Suite and BFF specs reference ``#/components/schemas`` heavily, and walking the
+tree to resolve the same schema again for every use dominates coverage checks,
+diffs and example validation over large specs. ``RefIndex`` walks a document
+once and builds three tables:
+
+* ``nodes``: JSON pointer (``#/components/schemas/Invoice``, RFC 6901
+  escaping) → node, for every mapping, list and scalar;
+* ``references``: pointer of each ``$ref`` object → the pointer it targets;
+* ``referrers``: the reverse, target pointer → pointers of the ``$ref``
+  objects that name it ("who references this schema").
+
+``resolve`` follows ``$ref`` chains through the table, memoised and with cycle
+detection. ``reachable`` is the transitive set of pointers a subtree
+references; recursive schemas are fine there. ``RefIndex.for_spec(path)``
+loads a spec through ``rerp_tooling.specs.load_spec``, so an unchanged spec is
+read back from the parsed-spec cache, and reuses one index per spec content
+within a process.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections.abc import Mapping
+from pathlib import Path
+from urllib.parse import unquote
+
+from rerp_tooling.specs import load_spec
+
+# Keyed by document identity: load_spec returns one object per spec content and
+# keeps it alive for the process.
+_INDEXES: dict[int, RefIndex] = {}
+
+
+class RefCycleError(ValueError):
+    """A ``$ref`` chain leads back to itself without reaching a schema."""
+
+
+def _token(key: object) -> str:
+    return str(key).replace("~", "~0").replace("/", "~1")
+
+
+def _pointer(ref: str) -> str:
+    """Normalise a local ``$ref`` (``#/a/b%20c``) to the index's pointer form."""
+    if not ref.startswith("#"):
+        raise ValueError(f"external $ref is not indexed: {ref}")
+    return "#" + unquote(ref[1:])
+
+
+class RefIndex:
+    """Pointer table, forward and reverse ``$ref`` indexes for one document."""
+
+    def __init__(self, document: Mapping) -> None:
+        self.nodes: dict[str, object] = {"#": document}
+        self.references: dict[str, str] = {}
+        self.external: dict[str, str] = {}
+        self.referrers: dict[str, list[str]] = {}
+        self._resolved: dict[str, object] = {}
+        self._reachable: dict[str, frozenset[str]] = {}
+        self._sources: list[str] | None = None
+
+        stack = [("#", document[key], key) for key in reversed(list(document))]
+        while stack:
+            parent, node, key = stack.pop()
+            pointer = f"{parent}/{_token(key)}"
+            self.nodes[pointer] = node
+            if isinstance(node, dict):
+                ref = node.get("$ref")
+                if isinstance(ref, str):
+                    if ref.startswith("#"):
+                        target = _pointer(ref)
+                        self.references[pointer] = target
+                        self.referrers.setdefault(target, []).append(pointer)
+                    else:
+                        self.external[pointer] = ref
+                stack.extend((pointer, node[child], child) for child in reversed(list(node)))
+            elif isinstance(node, list):
+                stack.extend(
+                    (pointer, node[position], position) for position in reversed(range(len(node)))
+                )
+
+    @classmethod
+    def for_spec(cls, path: str | Path, root: Path | None = None) -> RefIndex:
+        """Index of the spec at ``path``; ``root`` selects the parsed-spec cache."""
+        document = load_spec(path, root)
+        index = _INDEXES.get(id(document))
+        if index is None:
+            index = _INDEXES[id(document)] = cls(document)
+        return index
+
+    def resolve(self, ref: str) -> object:
+        """The node ``ref`` names, following ``$ref`` chains to a non-reference node."""
+        pointer = _pointer(ref)
+        if pointer in self._resolved:
+            return self._resolved[pointer]
+        chain = [pointer]
+        while pointer in self.references and pointer not in self._resolved:
+            pointer = self.references[pointer]
+            if pointer in chain:
+                raise RefCycleError(" -> ".join([*chain, pointer]))
+            chain.append(pointer)
+        if pointer in self._resolved:
+            node = self._resolved[pointer]
+        elif pointer in self.nodes:
+            node = self.nodes[pointer]
+        else:
+            raise KeyError(f"unresolved $ref: {' -> '.join(chain)}")
+        for step in chain:
+            self._resolved[step] = node
+        return node
+
+    def schema(self, name: str) -> object:
+        """``#/components/schemas/{name}``, resolved."""
+        return self.resolve(f"#/components/schemas/{_token(name)}")
+
+    def referrers_of(self, ref: str) -> list[str]:
+        """Pointers of the ``$ref`` objects naming ``ref`` directly."""
+        return list(self.referrers.get(_pointer(ref), ()))
+
+    def reachable(self, ref: str = "#") -> frozenset[str]:
+        """Every pointer referenced, transitively, from the subtree at ``ref``."""
+        start = _pointer(ref)
+        if start in self._reachable:
+            return self._reachable[start]
+        seen: set[str] = set()
+        pending = [start]
+        while pending:
+            current = pending.pop()
+            if current in self._reachable:
+                seen |= self._reachable[current]
+                continue
+            for source in self._references_within(current):
+                target = self.references[source]
+                if target not in seen:
+                    seen.add(target)
+                    pending.append(target)
+        result = self._reachable[start] = frozenset(seen)
+        return result
+
+    def _references_within(self, pointer: str) -> list[str]:
+        # Sorted sources put a subtree's $ref objects in one contiguous run.
+        if self._sources is None:
+            self._sources = sorted(self.references)
+        prefix = f"{pointer}/"
+        sources = [pointer] if pointer in self.references else []
+        position = bisect_left(self._sources, prefix)
+        while position < len(self._sources) and self._sources[position].startswith(prefix):
+            sources.append(self._sources[position])
+            position += 1
+        return sources
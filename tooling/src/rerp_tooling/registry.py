@@ -0,0 +1,158 @@
+"""Minimal Docker Registry HTTP API v2 client (standard library only).
+
+RERP's dev loop pushes to a plain local registry (``SHARED_K8S_REGISTRY`` in
+the Tiltfile), so the client supports exactly what the tooling needs and
+nothing else: no token auth, no chunked uploads. A registry given as a bare
+``host:port`` is spoken to over HTTP when the host is loopback or a private
+address, like Docker's own insecure-registry default, and over HTTPS otherwise.
+Pass an explicit ``http://`` or ``https://`` URL to override that.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import ipaddress
+import json
+import urllib.error
+import urllib.parse
+import urllib.request
+
+MANIFEST_MEDIA_TYPES = (
+    "application/vnd.oci.image.index.v1+json",
+    "application/vnd.oci.image.manifest.v1+json",
+    "application/vnd.docker.distribution.manifest.list.v2+json",
+    "application/vnd.docker.distribution.manifest.v2+json",
+)
+INDEX_MEDIA_TYPES = frozenset(
+    {
+        "application/vnd.oci.image.index.v1+json",
+        "application/vnd.docker.distribution.manifest.list.v2+json",
+    }
+)
+
+
+class RegistryError(RuntimeError):
+    """A registry request failed; ``status`` is the HTTP status when there was one."""
+
+    def __init__(self, message: str, status: int | None = None) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+def _digest(body: bytes) -> str:
+    return f"sha256:{hashlib.sha256(body).hexdigest()}"
+
+
+def registry_url(registry: str) -> str:
+    """Base URL for ``registry`` (``host:port`` or an explicit ``http(s)://`` URL)."""
+    if "://" in registry:
+        return registry.rstrip("/")
+    host = urllib.parse.urlsplit(f"//{registry}").hostname or registry
+    try:
+        plain = ipaddress.ip_address(host).is_private
+    except ValueError:
+        plain = host == "localhost" or host.endswith(".localhost")
+    return f"{'http' if plain else 'https'}://{registry}"
+
+
+class RegistryClient:
+    """Catalog, tag and manifest calls against one registry."""
+
+    def __init__(self, registry: str, timeout: float = 30.0) -> None:
+        self.registry = registry
+        self.base_url = registry_url(registry)
+        self.timeout = timeout
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        *,
+        headers: dict[str, str] | None = None,
+        data: bytes | None = None,
+    ) -> tuple[int, dict[str, str], bytes]:
+        url = path if "://" in path else f"{self.base_url}{path}"
+        request = urllib.request.Request(url, data=data, method=method, headers=headers or {})
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return response.status, dict(response.headers), response.read()
+        except urllib.error.HTTPError as error:
+            body = error.read().decode(errors="replace").strip()
+            raise RegistryError(
+                f"{method} {url} failed: {error.code} {error.reason} {body}".rstrip(), error.code
+            ) from None
+        except OSError as error:
+            raise RegistryError(f"{method} {url} failed: {error}") from None
+
+    def _paged(self, path: str, key: str) -> list[str]:
+        items: list[str] = []
+        while path:
+            _, headers, body = self.request("GET", path)
+            items.extend(json.loads(body or b"{}").get(key) or [])
+            link = headers.get("Link") or headers.get("link") or ""
+            path = link[link.find("<") + 1 : link.find(">")] if 'rel="next"' in link else ""
+        return items
+
+    def catalog(self) -> list[str]:
+        return self._paged("/v2/_catalog?n=1000", "repositories")
+
+    def tags(self, repository: str) -> list[str]:
+        try:
+            return self._paged(f"/v2/{repository}/tags/list?n=1000", "tags")
+        except RegistryError as error:
+            if error.status == 404:
+                return []
+            raise
+
+    def manifest_bytes(self, repository: str, reference: str) -> tuple[str, str, bytes]:
+        """``(digest, media_type, body)`` of a manifest, exactly as the registry stores it."""
+        _, headers, body = self.request(
+            "GET",
+            f"/v2/{repository}/manifests/{reference}",
+            headers={"Accept": ", ".join(MANIFEST_MEDIA_TYPES)},
+        )
+        headers = {name.lower(): value for name, value in headers.items()}
+        digest = headers.get("docker-content-digest") or _digest(body)
+        media_type = headers.get("content-type") or json.loads(body).get("mediaType", "")
+        return digest, media_type.split(";")[0].strip(), body
+
+    def manifest(self, repository: str, reference: str) -> tuple[str, dict]:
+        """``(digest, document)`` for a tag or digest."""
+        digest, _, body = self.manifest_bytes(repository, reference)
+        return digest, json.loads(body)
+
+    def put_manifest(self, repository: str, tag: str, body: bytes, media_type: str) -> str:
+        """Store ``body`` under ``tag``; with an existing manifest this only adds a tag."""
+        _, headers, _ = self.request(
+            "PUT",
+            f"/v2/{repository}/manifests/{tag}",
+            headers={"Content-Type": media_type},
+            data=body,
+        )
+        headers = {name.lower(): value for name, value in headers.items()}
+        return headers.get("docker-content-digest") or _digest(body)
+
+    def delete_manifest(self, repository: str, digest: str) -> None:
+        try:
+            self.request("DELETE", f"/v2/{repository}/manifests/{digest}")
+        except RegistryError as error:
+            if error.status == 405:
+                raise RegistryError(
+                    f"{self.registry} does not allow deletes "
+                    "(set REGISTRY_STORAGE_DELETE_ENABLED=true)",
+                    error.status,
+                ) from None
+            raise
+
+    def blob_sizes(self, repository: str, digest: str) -> dict[str, int]:
+        """Size of every config and layer blob reachable from a manifest digest."""
+        _, document = self.manifest(repository, digest)
+        sizes: dict[str, int] = {}
+        if document.get("mediaType") in INDEX_MEDIA_TYPES or "manifests" in document:
+            for child in document.get("manifests") or []:
+                sizes.update(self.blob_sizes(repository, child["digest"]))
+            return sizes
+        for descriptor in [document.get("config") or {}, *(document.get("layers") or [])]:
+            if descriptor.get("digest"):
+                sizes[descriptor["digest"]] = int(descriptor.get("size") or 0)
+        return sizes
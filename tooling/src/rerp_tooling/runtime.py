@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import argparse
+import functools
 import hashlib
 import json
 import os
@@ -10,56 +11,62 @@ import platform
 import shutil
 import subprocess
 import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-try:
-    import tomllib
-except ModuleNotFoundError:  # pragma: no cover - Python 3.10 compatibility
-    import tomli as tomllib  # type: ignore[no-redef]
+from rerp_tooling.cache import CHUNK_SIZE, cache_dir, file_sha256, read_json, write_json
+from rerp_tooling.cargo_index import CargoWorkspaceIndex
+from rerp_tooling.layout import RepositoryLayout
 
+# Image staging, OCI assembly, asset compression and dev-sync are imported by the
+# functions that use them: Tilt runs `rerp services` and `rerp docker ...` once
+# per service per rebuild, and most of those commands need none of them.
+if TYPE_CHECKING:
+    import tarfile
 
-def _relative(path: Path, root: Path) -> str:
-    return path.relative_to(root).as_posix()
+    from rerp_tooling.assets import PrecompressedAssets
+    from rerp_tooling.oci import Layer, LayerBlob
 
 
-def _helm_values_path(root: Path, suite: str, service: str) -> Path | None:
-    values_dir = root / "helm" / "rerp-microservice" / "values"
-    suite_path = values_dir / f"{suite}-{service}.yaml"
-    legacy_accounting_path = values_dir / f"{service}.yaml"
-    if suite_path.exists():
-        return suite_path
-    if suite == "accounting" and legacy_accounting_path.exists():
-        return legacy_accounting_path
-    return None
+def _relative(path: Path, root: Path) -> str:
+    return path.relative_to(root).as_posix()
 
 
 def describe_service(root: Path, suite: str, service: str) -> dict[str, str]:
     """Describe one service from its checked-in contract and Cargo manifest."""
     root = root.resolve()
-    service_root = root / "microservices" / suite / service
+    paths = RepositoryLayout.for_root(root).service(suite, service)
+    service_root = paths.service_root
     impl_manifest = service_root / "impl" / "Cargo.toml"
     gen_manifest = service_root / "gen" / "Cargo.toml"
-    spec = root / "openapi" / suite / service / "openapi.yaml"
-    if service == "bff" and not spec.exists():
-        spec = root / "openapi" / suite / "openapi_bff.yaml"
+    spec = paths.spec
+    if spec is None:
+        spec_name = "openapi_bff.yaml" if service == "bff" else f"{service}/openapi.yaml"
+        spec = root / "openapi" / suite / spec_name
 
-    missing = [path for path in (impl_manifest, gen_manifest, spec) if not path.exists()]
+    missing = [
+        expected
+        for expected, found in (
+            (impl_manifest, paths.impl_manifest),
+            (gen_manifest, paths.gen_manifest),
+            (spec, paths.spec),
+        )
+        if found is None
+    ]
     if missing:
         rendered = ", ".join(_relative(path, root) for path in missing)
         raise FileNotFoundError(f"{suite}/{service} is not runtime-ready; missing: {rendered}")
 
-    manifest = tomllib.loads(impl_manifest.read_text())
-    package_name = manifest.get("package", {}).get("name")
-    binaries = manifest.get("bin") or []
-    binary_name = binaries[0].get("name") if binaries else package_name
+    crate = CargoWorkspaceIndex.for_root(root).crate(impl_manifest)
+    package_name = crate.package_name if crate else None
+    binary_name = crate.binary_name if crate else None
     if not package_name or not binary_name:
         raise ValueError(f"cannot determine package/binary from {impl_manifest}")
 
-    config_dir = service_root / "impl" / "config"
-    if not config_dir.is_dir():
-        config_dir = service_root / "gen" / "config"
-
-    helm_values = _helm_values_path(root, suite, service)
+    config_dir = paths.config_dir
+    helm_values = paths.helm_values
     resource_name = service if suite == "accounting" else f"{suite}-{service}"
     result = {
         "suite": suite,
@@ -81,23 +88,118 @@ def describe_service(root: Path, suite: str, service: str) -> dict[str, str]:
     return result
 
 
-def discover_services(root: Path, require_helm: bool = True) -> list[dict[str, str]]:
-    """Discover suite-nested runtime services without a duplicated service list."""
+def _descriptor_inputs(root: Path, suite: str, service: str) -> list[Path]:
+    """Every path whose presence or content can change ``describe_service``."""
+    service_root = root / "microservices" / suite / service
+    values_dir = root / "helm" / "rerp-microservice" / "values"
+    inputs = [
+        service_root / "impl" / "Cargo.toml",
+        service_root / "gen" / "Cargo.toml",
+        service_root / "impl" / "config",
+        root / "openapi" / suite / service / "openapi.yaml",
+        values_dir / f"{suite}-{service}.yaml",
+    ]
+    if service == "bff":
+        inputs.append(root / "openapi" / suite / "openapi_bff.yaml")
+    if suite == "accounting":
+        inputs.append(values_dir / f"{service}.yaml")
+    return inputs
+
+
+def _stat_key(path: Path) -> list[int] | None:
+    try:
+        status = path.stat()
+    except OSError:
+        return None
+    if path.is_dir():
+        return [0, 0]
+    return [status.st_mtime_ns, status.st_size]
+
+
+class DescriptorCache:
+    """On-disk descriptor cache keyed by the stat of every descriptor input.
+
+    Each entry records ``(mtime_ns, size)`` for the service's spec, manifests,
+    config directory and Helm values candidates (``None`` when absent). An entry
+    is reused only while every recorded key still matches, so an unchanged tree
+    costs a handful of ``stat`` calls per service instead of a TOML parse.
+    Services that are not runtime-ready are cached too, as a ``None`` descriptor.
+    """
+
+    VERSION = 1
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.dirty = False
+        payload = read_json(path, self.VERSION) or {}
+        self.entries: dict[str, dict] = payload.get("services") or {}
+
+    @classmethod
+    def for_root(cls, root: Path) -> DescriptorCache:
+        return cls(cache_dir(root) / "runtime-descriptors.json")
+
+    def describe(self, root: Path, suite: str, service: str) -> dict[str, str] | None:
+        """Return the cached descriptor, re-describing only when an input changed."""
+        key = f"{suite}/{service}"
+        inputs = {
+            _relative(path, root): _stat_key(path)
+            for path in _descriptor_inputs(root, suite, service)
+        }
+        entry = self.entries.get(key)
+        if entry is not None and entry.get("inputs") == inputs:
+            return entry.get("descriptor")
+
+        try:
+            descriptor = describe_service(root, suite, service)
+        except FileNotFoundError:
+            descriptor = None
+        self.entries[key] = {"inputs": inputs, "descriptor": descriptor}
+        self.dirty = True
+        return descriptor
+
+    def retain(self, keys: set[str]) -> None:
+        """Forget services that no longer exist in the tree."""
+        stale = set(self.entries) - keys
+        for key in stale:
+            del self.entries[key]
+        self.dirty = self.dirty or bool(stale)
+
+    def save(self) -> None:
+        if self.dirty and write_json(self.path, {"version": self.VERSION, "services": self.entries}):
+            self.dirty = False
+
+
+def discover_services(
+    root: Path, require_helm: bool = True, *, cache: bool | DescriptorCache = False
+) -> list[dict[str, str]]:
+    """Discover suite-nested runtime services without a duplicated service list.
+
+    With ``cache=True`` descriptors are served from ``DescriptorCache`` and only
+    services whose inputs changed since the previous run are re-described.
+    Long-running callers may pass their own ``DescriptorCache`` instance.
+    """
     root = root.resolve()
     discovered: list[dict[str, str]] = []
-    openapi_root = root / "openapi"
-    if not openapi_root.is_dir():
-        return discovered
-
-    for suite_dir in sorted(path for path in openapi_root.iterdir() if path.is_dir()):
-        suite = suite_dir.name
-        for service_dir in sorted(path for path in suite_dir.iterdir() if path.is_dir()):
-            if not (service_dir / "openapi.yaml").exists():
-                continue
-            service = service_dir.name
+    layout = RepositoryLayout.for_root(root)
+    if isinstance(cache, DescriptorCache):
+        descriptor_cache: DescriptorCache | None = cache
+    else:
+        descriptor_cache = DescriptorCache.for_root(root) if cache else None
+    seen: set[str] = set()
+
+    def describe(suite: str, service: str) -> dict[str, str] | None:
+        if descriptor_cache is None:
             try:
-                descriptor = describe_service(root, suite, service)
+                return describe_service(root, suite, service)
             except FileNotFoundError:
+                return None
+        seen.add(f"{suite}/{service}")
+        return descriptor_cache.describe(root, suite, service)
+
+    for suite in layout.suite_names():
+        for service in layout.spec_services(suite):
+            descriptor = describe(suite, service)
+            if descriptor is None:
                 continue
             if require_helm and "helm_values" not in descriptor:
                 continue
@@ -106,14 +208,16 @@ def discover_services(root: Path, require_helm: bool = True) -> list[dict[str, s
         # Suite BFF contracts are generated beside the suite config rather than
         # nested below openapi/<suite>/bff/. Hide that layout exception here so
         # build and deployment consumers receive one descriptor shape.
-        if (suite_dir / "openapi_bff.yaml").exists():
-            try:
-                descriptor = describe_service(root, suite, "bff")
-            except FileNotFoundError:
+        if layout.has_bff_spec(suite):
+            descriptor = describe(suite, "bff")
+            if descriptor is None:
                 continue
             if not require_helm or "helm_values" in descriptor:
                 discovered.append(descriptor)
 
+    if descriptor_cache is not None:
+        descriptor_cache.retain(seen)
+        descriptor_cache.save()
     return discovered
 
 
@@ -132,6 +236,131 @@ def build_microservice(root: Path, suite: str, service: str, release: bool = Fal
     )
 
 
+# Docker architecture name -> Rust target the Tiltfile reads binaries from.
+_RUST_TARGETS = {
+    "amd64": "x86_64-unknown-linux-musl",
+    "arm64": "aarch64-unknown-linux-musl",
+    "arm": "armv7-unknown-linux-musleabihf",
+}
+
+
+def _cargo_build_command(packages: list[str], target: str, release: bool) -> list[str]:
+    # macOS has no musl toolchain; cargo-zigbuild links the Linux targets there.
+    build = "zigbuild" if platform.system() == "Darwin" else "build"
+    command = ["cargo", build, "--target", target]
+    for package in packages:
+        command.extend(["-p", package])
+    return command + (["--release"] if release else [])
+
+
+def _publish_artifact(binary: Path, destination: Path) -> tuple[str | None, bool]:
+    """Copy a cargo output to ``destination`` with its ``.sha256`` sidecar.
+
+    Returns ``(digest, copied)``. The copy keeps the binary's mtime, so a binary
+    cargo did not relink matches its artifact by size and mtime and is skipped
+    unread (digest ``None``). Watchers on the artifact path then only fire for
+    services whose binary changed. Otherwise the binary is hashed while it is
+    copied, in one read.
+    """
+    digest_file = Path(f"{destination}.sha256")
+    status = binary.stat()
+    try:
+        current = destination.stat()
+        if digest_file.is_file() and (current.st_size, current.st_mtime_ns) == (
+            status.st_size,
+            status.st_mtime_ns,
+        ):
+            return None, False
+    except OSError:
+        pass
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    partial = destination.with_name(f".{destination.name}.partial")
+    sidecar = digest_file.with_name(f".{digest_file.name}.partial")
+    try:
+        digest, _ = _hashing_copy(binary, partial)
+        sidecar.write_text(f"{digest}  {destination.name}\n")
+        os.replace(partial, destination)
+        os.replace(sidecar, digest_file)
+    finally:
+        partial.unlink(missing_ok=True)
+        sidecar.unlink(missing_ok=True)
+    _record_digest(destination, destination.stat(), digest)
+    return digest, True
+
+
+def build_microservices(
+    root: Path,
+    *,
+    suite: str | None = None,
+    services: list[str] | None = None,
+    release: bool = False,
+    artifacts_root: str | Path = "build_artifacts",
+    runner=subprocess.run,
+) -> int:
+    """Build several implementation packages in one cargo invocation.
+
+    Services come from ``discover_services`` (optionally narrowed by ``suite``
+    and ``services``). A single ``cargo build -p a -p b ...`` for the host's
+    musl target resolves and compiles the shared dependency graph once instead
+    of once per service, and takes the workspace lock once. Each binary is then
+    copied to ``{artifacts_root}/{arch}/{suite}/{binary}`` with its ``.sha256``
+    sidecar, as ``copy-binary`` would.
+
+    ``build_microservice`` goes through BRRTRouter's
+    ``build_package_with_options``, which takes exactly one package, so it
+    cannot express a multi-package build; this command assembles the same
+    host-target ``cargo build`` (``cargo zigbuild`` on macOS) itself. It
+    expects the host's musl target to be installed already
+    (``rustup target add <target>``).
+    """
+    root = root.resolve()
+    descriptors = [
+        descriptor
+        for descriptor in discover_services(root, require_helm=False, cache=True)
+        if (suite is None or descriptor["suite"] == suite)
+        and (not services or descriptor["service"] in services)
+    ]
+    missing = sorted(set(services or ()) - {descriptor["service"] for descriptor in descriptors})
+    if missing or not descriptors:
+        print(
+            f"no runtime-ready service matches: {', '.join(missing) or suite or 'any'}",
+            file=os.sys.stderr,
+        )
+        return 1
+
+    architecture = _docker_architecture()
+    target = _RUST_TARGETS[architecture]
+    packages = sorted({descriptor["package_name"] for descriptor in descriptors})
+    command = _cargo_build_command(packages, target, release)
+    print(f"Building {len(packages)} package(s) for {target}: {' '.join(packages)}")
+    started = time.perf_counter()
+    try:
+        result = runner(command, cwd=root / "microservices", check=False).returncode
+    except OSError as error:
+        print(f"cargo: {error}", file=os.sys.stderr)
+        return 1
+    if result != 0:
+        return result
+    print(f"cargo finished in {time.perf_counter() - started:.1f}s")
+
+    profile = "release" if release else "debug"
+    output = root / "microservices" / "target" / target / profile
+    artifacts = _resolve(root, artifacts_root) / architecture
+    failed = 0
+    for descriptor in descriptors:
+        binary = output / descriptor["binary_name"]
+        destination = artifacts / descriptor["suite"] / descriptor["binary_name"]
+        try:
+            digest, copied = _publish_artifact(binary, destination)
+        except OSError as error:
+            failed += 1
+            print(f"  {descriptor['service']}: {error}", file=os.sys.stderr)
+            continue
+        state = f"updated, {digest[:12]}" if copied else "unchanged"
+        print(f"  {_relative(destination, root)} ({state})")
+    return 1 if failed else 0
+
+
 def _resolve(root: Path, value: str | Path) -> Path:
     path = Path(value)
     return path if path.is_absolute() else root / path
@@ -155,20 +384,148 @@ def _docker_architecture() -> str:
     raise ValueError(f"unsupported Docker host architecture: {machine}")
 
 
-def _verified_digest(artifact: Path, digest_file: Path) -> str:
-    expected_digest = digest_file.read_text().strip().split()[0]
-    actual_digest = hashlib.sha256(artifact.read_bytes()).hexdigest()
-    if expected_digest != actual_digest:
-        raise ValueError(
-            f"artifact digest mismatch for {artifact}: expected {expected_digest}, got {actual_digest}"
-        )
-    return actual_digest
+def _expected_digest(digest_file: Path) -> str:
+    return digest_file.read_text().strip().split()[0]
+
+
+def _digest_mismatch(artifact: Path, expected: str, actual: str) -> ValueError:
+    return ValueError(
+        f"artifact digest mismatch for {artifact}: expected {expected}, got {actual}"
+    )
 
 
-def _verified_copy(artifact: Path, digest_file: Path, destination: Path) -> str:
-    actual_digest = _verified_digest(artifact, digest_file)
+def _verification_record(artifact: Path) -> Path:
+    return artifact.with_name(f"{artifact.name}.verified.json")
+
+
+def _stat_identity(status: os.stat_result) -> dict[str, int]:
+    return {
+        "device": status.st_dev,
+        "inode": status.st_ino,
+        "size": status.st_size,
+        "mtime_ns": status.st_mtime_ns,
+    }
+
+
+def _cached_digest(artifact: Path) -> str | None:
+    """Digest recorded by an earlier verification if ``artifact`` is unchanged since.
+
+    The sidecar ``<artifact>.verified.json`` stores (device, inode, size,
+    mtime_ns, sha256) after a successful hash, so re-verifying an artifact that
+    ``copy-binary`` has not rewritten costs one ``stat``.
+    """
+    try:
+        record = json.loads(_verification_record(artifact).read_text())
+        status = artifact.stat()
+    except (OSError, ValueError):
+        return None
+    if not isinstance(record, dict) or record.get("sha256") is None:
+        return None
+    if {key: record.get(key) for key in ("device", "inode", "size", "mtime_ns")} != (
+        _stat_identity(status)
+    ):
+        return None
+    return str(record["sha256"])
+
+
+def _record_digest(artifact: Path, status: os.stat_result, digest: str) -> None:
+    try:
+        if _stat_identity(artifact.stat()) != _stat_identity(status):
+            return  # rewritten while hashing; the digest describes older content
+        record = _verification_record(artifact)
+        partial = record.with_name(f".{record.name}.{os.getpid()}.partial")
+        partial.write_text(json.dumps({**_stat_identity(status), "sha256": digest}) + "\n")
+        os.replace(partial, record)
+    except OSError:
+        return  # read-only artifact directories simply re-hash next time
+
+
+def _copy_file(source: Path, destination: Path) -> None:
+    """Copy without routing bytes through Python when the content is already trusted.
+
+    ``os.copy_file_range`` lets the kernel copy (or reflink on btrfs/XFS);
+    ``shutil.copyfile`` falls back to ``sendfile`` where it is unavailable.
+    """
+    copy_file_range = getattr(os, "copy_file_range", None)
+    if copy_file_range is not None:
+        try:
+            with source.open("rb") as reader, destination.open("wb") as writer:
+                remaining = os.fstat(reader.fileno()).st_size
+                while remaining > 0:
+                    copied = copy_file_range(reader.fileno(), writer.fileno(), remaining)
+                    if copied == 0:
+                        break
+                    remaining -= copied
+            if remaining == 0:
+                shutil.copystat(source, destination)
+                return
+        except OSError:
+            pass
+    shutil.copyfile(source, destination)
+    shutil.copystat(source, destination)
+
+
+def _hashing_copy(source: Path, destination: Path) -> tuple[str, os.stat_result]:
+    """Copy ``source`` to ``destination`` and hash it in the same single read.
+
+    Returns the SHA-256 and the ``stat`` of ``source`` as it was read; the copy
+    keeps the source's mtime.
+    """
+    digest = hashlib.sha256()
+    buffer = bytearray(CHUNK_SIZE)
+    view = memoryview(buffer)
+    with source.open("rb") as reader, destination.open("wb") as writer:
+        status = os.fstat(reader.fileno())
+        while size := reader.readinto(buffer):
+            digest.update(view[:size])
+            writer.write(view[:size])
+    shutil.copystat(source, destination)
+    return digest.hexdigest(), status
+
+
+def _verified_copy(
+    artifact: Path, digest_file: Path, destination: Path, *, trusted_digest: str | None = None
+) -> str:
+    """Copy ``artifact`` to ``destination``, verifying it in the same single read.
+
+    The artifact is hashed chunk by chunk while the chunks are written to a
+    partial file beside ``destination``, which only replaces the destination
+    once the digest matches. ``trusted_digest`` (a digest the caller verified
+    against ``digest_file`` already) skips hashing and uses a kernel copy, as
+    does a matching ``_cached_digest`` record; fresh hashes are recorded.
+    """
+    expected_digest = _expected_digest(digest_file)
+    if trusted_digest is None and _cached_digest(artifact) == expected_digest:
+        trusted_digest = expected_digest
     destination.parent.mkdir(parents=True, exist_ok=True)
-    shutil.copy2(artifact, destination)
+    partial = destination.with_name(f".{destination.name}.partial")
+    try:
+        if trusted_digest is not None:
+            if trusted_digest != expected_digest:
+                raise _digest_mismatch(artifact, expected_digest, trusted_digest)
+            _copy_file(artifact, partial)
+            actual_digest = trusted_digest
+        else:
+            actual_digest, status = _hashing_copy(artifact, partial)
+            if actual_digest != expected_digest:
+                raise _digest_mismatch(artifact, expected_digest, actual_digest)
+            _record_digest(artifact, status, actual_digest)
+        os.replace(partial, destination)
+    finally:
+        partial.unlink(missing_ok=True)
+    return actual_digest
+
+
+def _verified_digest(artifact: Path, digest_file: Path) -> str:
+    """Verify ``artifact`` in place (one ``stat`` when a verification record matches)."""
+    expected_digest = _expected_digest(digest_file)
+    if _cached_digest(artifact) == expected_digest:
+        return expected_digest
+    status = artifact.stat()
+    actual_digest = file_sha256(artifact)
+    if actual_digest != expected_digest:
+        raise _digest_mismatch(artifact, expected_digest, actual_digest)
+    _record_digest(artifact, status, actual_digest)
     return actual_digest
 
 
@@ -199,14 +556,115 @@ def build_base_image(root: Path, *, dry_run: bool = False) -> int:
     return subprocess.run(command, cwd=root, check=False).returncode
 
 
+# Records the input key of every staged file so the next stage of the same
+# destination can tell unchanged entries from changed ones.
+_STAGE_MANIFEST = "stage-manifest.json"
+# Context directory -> descriptor key of the source tree staged into it.
+_ASSET_TREES = (("config", "config_dir"), ("doc", "doc_dir"), ("static_site", "static_dir"))
+_STAGE_WORKERS = min(8, os.cpu_count() or 1)
+# Trees the services serve over HTTP, and so the ones worth precompressing.
+_SERVED_TREES = (("doc", "doc_dir"), ("static_site", "static_dir"))
+
+
+def _asset_inputs(source: Path, prefix: str) -> tuple[list[str], dict[str, Path]]:
+    """Directories and files ``_copy_tree_or_empty`` would stage below ``prefix``."""
+    directories = [prefix]
+    files: dict[str, Path] = {}
+    if not source.is_dir():
+        return directories, files
+    for current, subdirectories, filenames in os.walk(source, followlinks=True):
+        relative = Path(current).relative_to(source).as_posix()
+        base = prefix if relative == "." else f"{prefix}/{relative}"
+        directories.extend(f"{base}/{name}" for name in sorted(subdirectories))
+        files.update({f"{base}/{name}": Path(current) / name for name in sorted(filenames)})
+    return directories, files
+
+
+def _precompressed_assets(root: Path, descriptor: dict[str, str]) -> PrecompressedAssets:
+    files: dict[str, Path] = {}
+    from rerp_tooling.assets import precompress as precompress_assets
+
+    for prefix, key in _SERVED_TREES:
+        files.update(_asset_inputs(_resolve(root, descriptor[key]), prefix)[1])
+    return precompress_assets(files, cache_dir(root) / "precompressed")
+
+
+def _read_stage_manifest(context: Path) -> dict[str, dict]:
+    try:
+        payload = json.loads((context / _STAGE_MANIFEST).read_text())
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(payload, dict) or payload.get("version") != 1:
+        return {}
+    return payload.get("files") or {}
+
+
+def _link_unchanged(
+    previous_context: Path,
+    previous: dict[str, dict],
+    relative: str,
+    key: dict,
+    staging: Path,
+) -> bool:
+    """Hardlink ``relative`` from the previous context when its input key is unchanged."""
+    if previous.get(relative) != key:
+        return False
+    target = staging / relative
+    target.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        os.link(previous_context / relative, target)
+    except OSError:
+        return False
+    return True
+
+
+def _stage_binary(
+    artifact: Path, relative: str, previous_context: Path, previous: dict, staging: Path
+) -> tuple[dict[str, dict], int]:
+    digest_file = Path(f"{artifact}.sha256")
+    key = {"sha256": _expected_digest(digest_file)}
+    if _cached_digest(artifact) == key["sha256"] and _link_unchanged(
+        previous_context, previous, relative, key, staging
+    ):
+        return {relative: key}, 1
+    (staging / relative).parent.mkdir(parents=True, exist_ok=True)
+    _verified_copy(artifact, digest_file, staging / relative)
+    return {relative: key}, 0
+
+
+def _stage_files(
+    files: dict[str, Path], previous_context: Path, previous: dict, staging: Path
+) -> tuple[dict[str, dict], int]:
+    entries = {}
+    linked = 0
+    for relative, source in files.items():
+        status = source.stat()
+        entries[relative] = {"size": status.st_size, "mtime_ns": status.st_mtime_ns}
+        if _link_unchanged(previous_context, previous, relative, entries[relative], staging):
+            linked += 1
+            continue
+        (staging / relative).parent.mkdir(parents=True, exist_ok=True)
+        _copy_file(source, staging / relative)
+    return entries, linked
+
+
 def stage_multiarch_context(
     root: Path,
     destination: str | Path,
     artifacts_root: str | Path,
     suite: str,
     service: str,
+    *,
+    workers: int | None = None,
+    precompress: bool = False,
 ) -> int:
-    """Stage one service's verified multi-architecture release context."""
+    """Stage one service's verified multi-architecture release context.
+
+    Binaries and asset trees are staged concurrently on up to ``workers``
+    threads; per-input timings are printed so slow inputs are visible. With
+    ``precompress`` the served trees also get ``.gz``/``.br`` variants and an
+    asset manifest.
+    """
     root = root.resolve()
     descriptor = describe_service(root, suite, service)
     destination_path = _resolve(root, destination).resolve()
@@ -229,32 +687,255 @@ def stage_multiarch_context(
         )
         return 1
 
-    if destination_path.exists():
-        shutil.rmtree(destination_path)
-    destination_path.mkdir(parents=True)
-    digests = {}
-    try:
-        for architecture, artifact in inputs.items():
-            digests[architecture] = _verified_copy(
-                artifact,
-                Path(f"{artifact}.sha256"),
-                destination_path / architecture / "service",
-            )
-    except ValueError as error:
-        print(str(error), file=os.sys.stderr)
-        shutil.rmtree(destination_path)
+    # Each binary and each asset tree is an independent unit of I/O- and
+    # hash-bound work (hashlib releases the GIL), so they run on a bounded pool.
+    tasks = {}
+    for architecture, artifact in inputs.items():
+        relative = f"{architecture}/service"
+        tasks[relative] = functools.partial(_stage_binary, artifact, relative)
+    directories = []
+    for prefix, key in _ASSET_TREES:
+        asset_directories, asset_files = _asset_inputs(_resolve(root, descriptor[key]), prefix)
+        directories.extend(asset_directories)
+        tasks[prefix] = functools.partial(_stage_files, asset_files)
+    tasks["Dockerfile"] = functools.partial(
+        _stage_files, {"Dockerfile": root / "docker" / "microservices" / "Dockerfile"}
+    )
+    precompressed: list[PrecompressedAssets] = []
+    if precompress:
+
+        def stage_precompressed(previous_context: Path, previous: dict, staging: Path):
+            precompressed.append(_precompressed_assets(root, descriptor))
+            return _stage_files(precompressed[0].files, previous_context, previous, staging)
+
+        tasks["precompressed"] = stage_precompressed
+
+    # Stage into a sibling and swap it in, so a failure never leaves a partial
+    # context behind. Entries whose inputs match the previous stage manifest are
+    # hardlinked from the previous context instead of being read again.
+    previous = _read_stage_manifest(destination_path)
+    staging = destination_path.with_name(f".{destination_path.name}.staging")
+    if staging.exists():
+        shutil.rmtree(staging)
+    staging.mkdir(parents=True)
+    for relative in directories:
+        (staging / relative).mkdir(parents=True, exist_ok=True)
+
+    def run(task):
+        started = time.perf_counter()
+        entries, linked = task(destination_path, previous, staging)
+        return entries, linked, time.perf_counter() - started
+
+    manifest: dict[str, dict] = {}
+    timings = []
+    errors = []
+    with ThreadPoolExecutor(max_workers=workers or _STAGE_WORKERS) as pool:
+        futures = {name: pool.submit(run, task) for name, task in tasks.items()}
+        for name, future in futures.items():
+            try:
+                entries, linked, elapsed = future.result()
+            except (OSError, ValueError) as error:
+                errors.append(str(error))
+                continue
+            manifest.update(entries)
+            timings.append((name, len(entries) - linked, linked, elapsed))
+    if errors:
+        for error in errors:
+            print(error, file=os.sys.stderr)
+        shutil.rmtree(staging)
         return 1
 
-    _copy_tree_or_empty(_resolve(root, descriptor["config_dir"]), destination_path / "config")
-    _copy_tree_or_empty(_resolve(root, descriptor["doc_dir"]), destination_path / "doc")
-    _copy_tree_or_empty(_resolve(root, descriptor["static_dir"]), destination_path / "static_site")
-    shutil.copy2(root / "docker" / "microservices" / "Dockerfile", destination_path / "Dockerfile")
-    (destination_path / "artifact-sha256.json").write_text(
-        json.dumps(digests, sort_keys=True) + "\n"
+    digests = {
+        architecture: manifest[f"{architecture}/service"]["sha256"] for architecture in inputs
+    }
+    (staging / "artifact-sha256.json").write_text(json.dumps(digests, sort_keys=True) + "\n")
+    (staging / _STAGE_MANIFEST).write_text(
+        json.dumps({"version": 1, "files": manifest}, sort_keys=True) + "\n"
     )
+    retired = destination_path.with_name(f".{destination_path.name}.previous")
+    if retired.exists():
+        shutil.rmtree(retired)
+    if destination_path.exists():
+        os.replace(destination_path, retired)
+    os.replace(staging, destination_path)
+    shutil.rmtree(retired, ignore_errors=True)
+
+    linked_total = sum(linked for _, _, linked, _ in timings)
+    print(
+        f"Staged {_relative(destination_path, root)}: "
+        f"{len(manifest) - linked_total} written, {linked_total} unchanged (hardlinked)"
+    )
+    for name, written, linked, elapsed in timings:
+        print(f"  {name:<16} {written:>4} written {linked:>4} linked {elapsed * 1000:9.1f} ms")
+    if precompressed:
+        from rerp_tooling.assets import summary as asset_summary
+
+        print(f"Precompressed {asset_summary(precompressed[0].manifest)}")
     return 0
 
 
+# Image label carrying the context fingerprint a service image was built from.
+CONTEXT_FINGERPRINT_LABEL = "io.rerp.context.fingerprint"
+
+
+def _docker_output(command: list[str], root: Path) -> str:
+    """Stdout of a read-only Docker query; empty when Docker is missing or fails."""
+    try:
+        result = subprocess.run(command, cwd=root, capture_output=True, text=True, check=False)
+    except OSError:
+        return ""
+    return result.stdout.strip() if result.returncode == 0 else ""
+
+
+def _context_fingerprint(
+    entries: list[tuple[str, Path | None]],
+    artifact: Path,
+    artifact_digest: str,
+    base_image_id: str,
+    suite: str,
+    service: str,
+) -> str:
+    """SHA-256 over everything that shapes a service image.
+
+    Covers the base image ID, the suite/service build args, the Dockerfile, the
+    artifact digest and the content of every ``config``/``doc``/``static_site``
+    file, keyed by its context path.
+    """
+    fingerprint = hashlib.sha256()
+    for part in ("rerp-context-v1", base_image_id, suite, service):
+        fingerprint.update(part.encode() + b"\0")
+    for name, source in entries:
+        if source is None:
+            content = "directory"
+        elif source == artifact:
+            content = artifact_digest
+        else:
+            content = file_sha256(source)
+        fingerprint.update(f"{name}\0{content}\0".encode())
+    return fingerprint.hexdigest()
+
+
+def _service_image_command(
+    image_name: str, dockerfile: str, suite: str, service: str, digest: str, fingerprint: str
+) -> list[str]:
+    return [
+        "docker",
+        "build",
+        "--tag",
+        _image_tag(image_name),
+        "--file",
+        dockerfile,
+        "--label",
+        f"{CONTEXT_FINGERPRINT_LABEL}={fingerprint}",
+        "--build-arg",
+        "BASE_IMAGE=rerp-base:latest",
+        "--build-arg",
+        f"RERP_SUITE={suite}",
+        "--build-arg",
+        f"RERP_SERVICE={service}",
+        "--build-arg",
+        f"RERP_ARTIFACT_SHA256={digest}",
+    ]
+
+
+class _HashingReader:
+    """File wrapper that feeds every chunk ``tarfile`` reads into a SHA-256."""
+
+    def __init__(self, handle) -> None:
+        self._handle = handle
+        self.digest = hashlib.sha256()
+
+    def read(self, size: int = -1) -> bytes:
+        chunk = self._handle.read(size)
+        self.digest.update(chunk)
+        return chunk
+
+
+def _context_tar_info(name: str, status: os.stat_result | None = None) -> tarfile.TarInfo:
+    """Reproducible tar header; only the executable bit of a file's mode is kept."""
+    from rerp_tooling.oci import reproducible_tar_info
+
+    if status is None:
+        return reproducible_tar_info(name, 0o755)
+    return reproducible_tar_info(name, 0o755 if status.st_mode & 0o111 else 0o644, status.st_size)
+
+
+def _context_entries(
+    root: Path,
+    descriptor: dict[str, str],
+    dockerfile: Path,
+    artifact: Path,
+    extra: dict[str, Path] | None = None,
+) -> list[tuple[str, Path | None]]:
+    """Sorted ``(name, source)`` entries of a service build context; ``None`` marks a directory."""
+    architecture = _docker_architecture()
+    entries: dict[str, Path | None] = {
+        "Dockerfile": dockerfile,
+        architecture: None,
+        f"{architecture}/service": artifact,
+    }
+    for prefix, key in _ASSET_TREES:
+        directories, files = _asset_inputs(_resolve(root, descriptor[key]), prefix)
+        entries.update(dict.fromkeys(directories))
+        entries.update(files)
+    entries.update(extra or {})
+    return sorted(entries.items())
+
+
+def _write_context_tar(
+    stream, entries: list[tuple[str, Path | None]], artifact: Path, expected: str
+) -> None:
+    """Write ``entries`` as a tar stream, verifying ``artifact`` as it is read.
+
+    Raises ``ValueError`` after the artifact entry when its digest does not match,
+    so the caller can abandon the build before Docker sees a complete context.
+    """
+    import tarfile
+
+    trusted = _cached_digest(artifact) == expected
+    with tarfile.open(
+        fileobj=stream, mode="w|", format=tarfile.GNU_FORMAT, copybufsize=CHUNK_SIZE
+    ) as archive:
+        for name, source in entries:
+            if source is None:
+                archive.addfile(_context_tar_info(name))
+                continue
+            with source.open("rb") as handle:
+                status = os.fstat(handle.fileno())
+                info = _context_tar_info(name, status)
+                if source != artifact or trusted:
+                    archive.addfile(info, handle)
+                    continue
+                reader = _HashingReader(handle)
+                archive.addfile(info, reader)
+                actual = reader.digest.hexdigest()
+                if actual != expected:
+                    raise _digest_mismatch(artifact, expected, actual)
+                _record_digest(artifact, status, actual)
+
+
+def _stream_service_image(
+    root: Path,
+    command: list[str],
+    entries: list[tuple[str, Path | None]],
+    artifact: Path,
+    expected: str,
+) -> int:
+    process = subprocess.Popen(command, cwd=root, stdin=subprocess.PIPE)
+    try:
+        _write_context_tar(process.stdin, entries, artifact, expected)
+        process.stdin.close()
+    except BrokenPipeError:
+        pass  # Docker exited early; its return code carries the failure
+    except (OSError, ValueError) as error:
+        # Kill before closing stdin so Docker never builds a truncated context.
+        process.kill()
+        process.wait()
+        print(str(error), file=os.sys.stderr)
+        return 1
+    return process.wait()
+
+
 def build_service_image(
     root: Path,
     image_name: str,
@@ -265,10 +946,25 @@ def build_service_image(
     service: str,
     *,
     no_cache: bool = False,
+    stream_context: bool = False,
+    descriptor: dict[str, str] | None = None,
+    precompress: bool = False,
 ) -> int:
-    """Build one runtime image from a narrow, service-specific temporary context."""
+    """Build one runtime image from a narrow, service-specific context.
+
+    By default the context is staged in a temporary directory. With
+    ``stream_context`` it is written as a deterministic tar (sorted entries,
+    zero mtimes, root ownership) straight from the source files into
+    ``docker build -``, and the artifact is verified while it is streamed.
+    Batch callers that already hold the service's descriptor pass it in.
+
+    Every image is labelled with a fingerprint of its inputs. Unless
+    ``no_cache`` is set, a local image carrying the same fingerprint is retagged
+    instead of rebuilt. ``precompress`` adds ``.gz``/``.br`` variants of the
+    served assets and ``static_site/asset-manifest.json`` to the context.
+    """
     root = root.resolve()
-    descriptor = describe_service(root, suite, service)
+    descriptor = descriptor or describe_service(root, suite, service)
     dockerfile_path = _resolve(root, dockerfile)
     artifact = _resolve(root, artifact_path)
     digest_file = _resolve(root, hash_path)
@@ -278,41 +974,396 @@ def build_service_image(
             print(f"missing image input: {path}", file=os.sys.stderr)
             return 1
 
-    try:
-        actual_digest = _verified_digest(artifact, digest_file)
-    except ValueError as error:
-        print(str(error), file=os.sys.stderr)
-        return 1
+    # The fingerprint uses the digest the artifact must have; it is only trusted
+    # once the artifact has been verified against it (below, or while building).
+    expected = _expected_digest(digest_file)
+    extra: dict[str, Path] = {}
+    if precompress:
+        from rerp_tooling.assets import summary as asset_summary
+
+        assets = _precompressed_assets(root, descriptor)
+        extra = assets.files
+        print(f"Precompressed {asset_summary(assets.manifest)}")
+    entries = _context_entries(root, descriptor, dockerfile_path, artifact, extra)
+    base_image_id = _docker_output(
+        ["docker", "image", "inspect", "--format", "{{.Id}}", "rerp-base:latest"], root
+    )
+    fingerprint = _context_fingerprint(entries, artifact, expected, base_image_id, suite, service)
+    if not no_cache:
+        existing = _docker_output(
+            [
+                "docker",
+                "images",
+                "--quiet",
+                "--no-trunc",
+                "--filter",
+                f"label={CONTEXT_FINGERPRINT_LABEL}={fingerprint}",
+            ],
+            root,
+        ).split()
+        if existing:
+            try:
+                _verified_digest(artifact, digest_file)
+            except ValueError as error:
+                print(str(error), file=os.sys.stderr)
+                return 1
+            tag = _image_tag(image_name)
+            print(f"{tag} is up to date (context {fingerprint[:12]}); tagging {existing[0]}")
+            command = ["docker", "tag", existing[0], tag]
+            return subprocess.run(command, cwd=root, check=False).returncode
+
+    if stream_context:
+        command = _service_image_command(
+            image_name, "Dockerfile", suite, service, expected, fingerprint
+        )
+        if no_cache:
+            command.append("--no-cache")
+        command.append("-")
+        return _stream_service_image(root, command, entries, artifact, expected)
 
     with tempfile.TemporaryDirectory(prefix="rerp-image-") as temporary:
         context = Path(temporary)
-        _verified_copy(artifact, digest_file, context / _docker_architecture() / "service")
+        try:
+            actual_digest = _verified_copy(
+                artifact, digest_file, context / _docker_architecture() / "service"
+            )
+        except ValueError as error:
+            print(str(error), file=os.sys.stderr)
+            return 1
         _copy_tree_or_empty(_resolve(root, descriptor["config_dir"]), context / "config")
         _copy_tree_or_empty(_resolve(root, descriptor["doc_dir"]), context / "doc")
         _copy_tree_or_empty(_resolve(root, descriptor["static_dir"]), context / "static_site")
+        for name, source in extra.items():
+            _copy_file(source, context / name)
 
-        command = [
-            "docker",
-            "build",
-            "--tag",
-            _image_tag(image_name),
-            "--file",
-            str(dockerfile_path),
-            "--build-arg",
-            "BASE_IMAGE=rerp-base:latest",
-            "--build-arg",
-            f"RERP_SUITE={suite}",
-            "--build-arg",
-            f"RERP_SERVICE={service}",
-            "--build-arg",
-            f"RERP_ARTIFACT_SHA256={actual_digest}",
-        ]
+        command = _service_image_command(
+            image_name, str(dockerfile_path), suite, service, actual_digest, fingerprint
+        )
         if no_cache:
             command.append("--no-cache")
         command.append(str(context))
         return subprocess.run(command, cwd=root, check=False).returncode
 
 
+_BUILD_WORKERS = min(4, os.cpu_count() or 1)
+
+
+def build_service_images(
+    root: Path,
+    *,
+    suite: str | None = None,
+    services: list[str] | None = None,
+    artifacts_root: str | Path = "build_artifacts",
+    jobs: int | None = None,
+    no_cache: bool = False,
+    stream_context: bool = False,
+    build_base: bool = True,
+    precompress: bool = False,
+) -> int:
+    """Build every delivered service image concurrently on top of one base build.
+
+    Services come from ``discover_services`` (optionally narrowed by ``suite``
+    and ``services``); each uses ``{artifacts_root}/{arch}/{suite}/{binary}``
+    and its ``.sha256`` sidecar, as ``copy-binary`` writes them. A per-service
+    timing summary is printed once every build has finished.
+    """
+    root = root.resolve()
+    descriptors = [
+        descriptor
+        for descriptor in discover_services(root, cache=True)
+        if (suite is None or descriptor["suite"] == suite)
+        and (not services or descriptor["service"] in services)
+    ]
+    missing = sorted(set(services or ()) - {descriptor["service"] for descriptor in descriptors})
+    if missing or not descriptors:
+        print(
+            f"no delivered service matches: {', '.join(missing) or suite or 'any'}",
+            file=os.sys.stderr,
+        )
+        return 1
+    if build_base:
+        result = build_base_image(root)
+        if result != 0:
+            print("rerp-base:latest failed to build; no service images built", file=os.sys.stderr)
+            return result
+
+    artifacts = _resolve(root, artifacts_root) / _docker_architecture()
+    dockerfile = root / "docker" / "microservices" / "Dockerfile"
+
+    def build(descriptor: dict[str, str]) -> tuple[int, float]:
+        started = time.perf_counter()
+        artifact = artifacts / descriptor["suite"] / descriptor["binary_name"]
+        try:
+            result = build_service_image(
+                root,
+                descriptor["image_name"],
+                dockerfile,
+                Path(f"{artifact}.sha256"),
+                artifact,
+                descriptor["suite"],
+                descriptor["service"],
+                no_cache=no_cache,
+                stream_context=stream_context,
+                descriptor=descriptor,
+                precompress=precompress,
+            )
+        except Exception as error:  # noqa: BLE001 - one failed build must not lose the summary
+            print(f"{descriptor['image_name']}: {error}", file=os.sys.stderr)
+            result = 1
+        return result, time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=jobs or _BUILD_WORKERS) as pool:
+        results = list(pool.map(build, descriptors))
+    elapsed = time.perf_counter() - started
+
+    failed = 0
+    print(f"Built {len(descriptors)} image(s) in {elapsed:.1f}s:")
+    for descriptor, (result, seconds) in zip(descriptors, results):
+        status = "ok" if result == 0 else f"failed ({result})"
+        failed += result != 0
+        print(f"  {descriptor['image_name']:<40} {seconds:8.1f}s  {status}")
+    return 1 if failed else 0
+
+
+def publish_image(root: Path, image: str, target: str, tag: str) -> int:
+    """Publish local ``image`` as ``{target}:{tag}``, skipping uploads the registry has.
+
+    ``target`` is ``registry/repository``. When the local image records a repo
+    digest for ``target`` that the registry still holds (the image was pushed
+    before and has not been rebuilt), the manifest is re-tagged through the
+    Registry API and no layer is uploaded. Otherwise this is ``docker tag`` plus
+    ``docker push``.
+    """
+    # urllib/http.client/ssl cost tens of milliseconds; only publish needs them.
+    from rerp_tooling.registry import RegistryClient, RegistryError
+
+    root = root.resolve()
+    registry, _, repository = target.partition("/")
+    if not registry or not repository:
+        print(f"publish target must be <registry>/<repository>: {target}", file=os.sys.stderr)
+        return 2
+    reference = f"{target}:{tag}"
+    inspect = ["docker", "image", "inspect", "--format", "{{json .RepoDigests}}", image]
+    try:
+        repo_digests = json.loads(_docker_output(inspect, root) or "[]")
+    except ValueError:
+        repo_digests = []
+    client = RegistryClient(registry)
+    for repo_digest in repo_digests or []:
+        name, _, digest = repo_digest.partition("@")
+        if name != target:
+            continue
+        try:
+            _, media_type, body = client.manifest_bytes(repository, digest)
+            client.put_manifest(repository, tag, body, media_type)
+        except RegistryError as error:
+            if error.status != 404:
+                print(f"registry tag failed, pushing instead: {error}", file=os.sys.stderr)
+            continue
+        print(f"Tagged {reference} -> {digest}; {registry} already has it, nothing uploaded")
+        return 0
+
+    for command in (["docker", "tag", image, reference], ["docker", "push", reference]):
+        result = subprocess.run(command, cwd=root, check=False).returncode
+        if result != 0:
+            return result
+    return 0
+
+
+def dev_sync_service(
+    root: Path,
+    hash_path: str | Path,
+    artifact_path: str | Path,
+    suite: str,
+    service: str,
+    *,
+    container: str | None = None,
+    kubeconfig: str | None = None,
+    runner=subprocess.run,
+) -> int:
+    """Hot-swap a verified artifact into the service's running dev containers.
+
+    ``container`` selects one local Docker container; otherwise every running
+    pod of the service's Deployment is updated (see ``rerp_tooling.dev_sync``).
+    """
+    root = root.resolve()
+    artifact = _resolve(root, artifact_path)
+    digest_file = _resolve(root, hash_path)
+    for path in (artifact, digest_file):
+        if not path.exists():
+            print(f"missing dev-sync input: {path}", file=os.sys.stderr)
+            return 1
+    try:
+        digest = _verified_digest(artifact, digest_file)
+    except ValueError as error:
+        print(str(error), file=os.sys.stderr)
+        return 1
+    from rerp_tooling.dev_sync import DockerTarget, kubernetes_target, sync_binary
+
+    if container:
+        target = DockerTarget(container)
+    else:
+        try:
+            descriptor = describe_service(root, suite, service)
+        except (FileNotFoundError, ValueError) as error:
+            print(f"cannot dev-sync {suite}/{service}: {error}", file=os.sys.stderr)
+            return 1
+        target = kubernetes_target(root, descriptor, kubeconfig)
+    return sync_binary(artifact, digest, target, runner)
+
+
+# Docker architecture name -> OCI platform of the matching base image.
+_OCI_PLATFORMS = {
+    "amd64": {"os": "linux", "architecture": "amd64"},
+    "arm64": {"os": "linux", "architecture": "arm64"},
+    "arm": {"os": "linux", "architecture": "arm", "variant": "v7"},
+}
+# Mirrors docker/microservices/Dockerfile; keep the two in step.
+_SERVICE_ENV = {"RUST_BACKTRACE": "1", "RUST_LOG": "debug"}
+_SERVICE_ENTRYPOINT = [
+    "/dev-entrypoint.sh",
+    "/app/service",
+    "--spec",
+    "/app/doc/openapi.yaml",
+    "--doc-dir",
+    "/app/doc",
+    "--static-dir",
+    "/app/static_site",
+    "--config",
+    "/app/config/config.yaml",
+]
+
+
+def _asset_layer(source: Path, prefix: str) -> Layer:
+    from rerp_tooling.oci import Layer, LayerFile
+
+    directories, files = _asset_inputs(source, prefix)
+    entries = [LayerFile(f"app/{relative}", None, 0o755) for relative in directories[1:]]
+    for relative, path in files.items():
+        mode = 0o755 if path.stat().st_mode & 0o111 else 0o644
+        entries.append(LayerFile(f"app/{relative}", path, mode))
+    return Layer(f"COPY {prefix}/ /app/{prefix}/", tuple(entries))
+
+
+def assemble_oci_image(
+    root: Path,
+    output: str | Path,
+    base_layout: str | Path,
+    artifacts_root: str | Path,
+    suite: str,
+    service: str,
+    *,
+    architectures: tuple[str, ...] = ("amd64", "arm64", "arm"),
+    ref_name: str | None = None,
+    tarball: str | Path | None = None,
+    workers: int | None = None,
+) -> int:
+    """Assemble a multi-architecture service image as an OCI layout, without Docker.
+
+    The base image for each architecture is read from the OCI layout
+    ``base_layout``; the binary (``{artifacts_root}/{arch}/{binary}``, verified
+    against its ``.sha256``) and the asset trees become reproducible layers
+    written into ``output``. Layers whose inputs match an earlier assembly reuse
+    its blob by digest.
+    """
+    from rerp_tooling.oci import Layer, LayerCache, LayerFile, OciLayout, assemble_image
+
+    root = root.resolve()
+    descriptor = describe_service(root, suite, service)
+    base = OciLayout(_resolve(root, base_layout))
+    if not (base.path / "index.json").is_file():
+        print(f"missing base OCI layout: {base.path}", file=os.sys.stderr)
+        return 1
+    unknown = [architecture for architecture in architectures if architecture not in _OCI_PLATFORMS]
+    if unknown:
+        print(f"unsupported architecture(s): {', '.join(unknown)}", file=os.sys.stderr)
+        return 2
+    artifacts = _resolve(root, artifacts_root)
+    inputs = {
+        architecture: artifacts / architecture / descriptor["binary_name"]
+        for architecture in architectures
+    }
+    missing = [
+        path for path in inputs.values() if not path.exists() or not Path(f"{path}.sha256").exists()
+    ]
+    if missing:
+        print("missing image input: " + ", ".join(map(str, missing)), file=os.sys.stderr)
+        return 1
+
+    layout = OciLayout.create(_resolve(root, output))
+    cache = LayerCache(cache_dir(root) / "oci-layers.json")
+
+    def binary_layer(artifact: Path) -> tuple[LayerBlob, str]:
+        digest = _verified_digest(artifact, Path(f"{artifact}.sha256"))
+        layer = Layer(
+            "COPY ${TARGETARCH}/service /app/service",
+            (LayerFile("app/service", artifact, 0o755, sha256=digest),),
+        )
+        return cache.layer(layout, layer), digest
+
+    def asset_layer(source: Path, prefix: str) -> LayerBlob:
+        return cache.layer(layout, _asset_layer(source, prefix))
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers or _STAGE_WORKERS) as pool:
+        binaries = {
+            architecture: pool.submit(binary_layer, artifact)
+            for architecture, artifact in inputs.items()
+        }
+        assets = [
+            pool.submit(asset_layer, _resolve(root, descriptor[key]), prefix)
+            for prefix, key in _ASSET_TREES
+        ]
+        try:
+            asset_blobs = [future.result() for future in assets]
+            binary_blobs = {name: future.result() for name, future in binaries.items()}
+        except (OSError, ValueError) as error:
+            print(str(error), file=os.sys.stderr)
+            return 1
+    cache.save()
+
+    history = ["COPY ${TARGETARCH}/service /app/service"]
+    history.extend(f"COPY {prefix}/ /app/{prefix}/" for prefix, _ in _ASSET_TREES)
+    manifests = []
+    try:
+        for architecture in architectures:
+            blob, digest = binary_blobs[architecture]
+            manifests.append(
+                assemble_image(
+                    base,
+                    layout,
+                    _OCI_PLATFORMS[architecture],
+                    [blob, *asset_blobs],
+                    history,
+                    labels={
+                        "org.opencontainers.image.title": f"RERP {suite}/{service}",
+                        "io.rerp.suite": suite,
+                        "io.rerp.service": service,
+                        "io.rerp.artifact.sha256": digest,
+                    },
+                    env=_SERVICE_ENV,
+                    exposed_ports=["8080/tcp"],
+                    entrypoint=_SERVICE_ENTRYPOINT,
+                )
+            )
+    except (LookupError, OSError) as error:
+        print(str(error), file=os.sys.stderr)
+        return 1
+    index = layout.write_index(manifests, ref_name or descriptor["image_name"])
+    if tarball:
+        layout.write_tarball(_resolve(root, tarball))
+
+    blobs = [blob for blob, _ in binary_blobs.values()] + asset_blobs
+    reused = sum(blob.reused for blob in blobs)
+    print(
+        f"Assembled {descriptor['image_name']} ({', '.join(architectures)}) in "
+        f"{layout.path}: {index['digest']}, {len(blobs) - reused} layer(s) "
+        f"written, {reused} reused, {time.perf_counter() - started:.2f}s"
+    )
+    return 0
+
+
 def _main() -> int:
     parser = argparse.ArgumentParser(description="RERP runtime descriptor helper")
     parser.add_argument("command", choices=["descriptors", "describe"])
@@ -320,10 +1371,25 @@ def _main() -> int:
     parser.add_argument("--all", action="store_true", help="include services without Helm values")
     parser.add_argument("--suite")
     parser.add_argument("--service")
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="ignore the descriptor daemon and cache, and do not update the cache",
+    )
+    parser.add_argument("--socket", type=Path, help="descriptor daemon socket path")
     args = parser.parse_args()
 
     if args.command == "descriptors":
-        print(json.dumps(discover_services(args.root, require_helm=not args.all), sort_keys=True))
+        descriptors = None
+        if not args.no_cache:
+            from rerp_tooling.descriptor_daemon import request_descriptors
+
+            descriptors = request_descriptors(args.root, args.all, args.socket)
+        if descriptors is None:
+            descriptors = discover_services(
+                args.root, require_helm=not args.all, cache=not args.no_cache
+            )
+        print(json.dumps(descriptors, sort_keys=True))
         return 0
     if not args.suite or not args.service:
         parser.error("describe requires --suite and --service")
@@ -0,0 +1,114 @@
+"""Parsed OpenAPI documents shared across ``rerp`` invocations.
+
+``openapi/accounting/openapi.yaml`` is about 11k lines, and the suite BFF is
+larger. Parsing either with PyYAML costs far more than reading back an already
+parsed copy, and tooling commands parse the same unchanged files on every dev
+cycle.
+
+``load_spec(path)`` keys each document by the SHA-256 of its bytes. The parsed
+document is kept in ``.rerp-cache/specs/{sha256}.marshal`` (``RERP_CACHE_DIR``
+overrides the directory) together with the loader identity (this module's
+``VERSION``, the Python and PyYAML versions and the loader class). ``marshal``
+only builds plain data, so a corrupt or foreign entry is a cache miss, never
+code execution, and unlike JSON it keeps integer keys such as ``200:``
+response codes. Documents ``marshal`` cannot store (YAML timestamps become
+``datetime`` objects) are parsed on every run. Within one process, the same
+content is returned as the same object.
+
+Documents are shared between callers and must be treated as read-only.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import marshal
+import os
+import sys
+from pathlib import Path
+
+from rerp_tooling.cache import cache_dir
+
+VERSION = 1
+MAX_ENTRIES = 256
+
+_LOADED: dict[tuple[str, tuple], dict] = {}
+
+
+def _loader():
+    import yaml
+
+    loader = getattr(yaml, "CSafeLoader", None) or yaml.SafeLoader
+    identity = (VERSION, tuple(sys.version_info[:2]), yaml.__version__, loader.__name__)
+    return yaml, loader, identity
+
+
+def _spec_root(path: Path) -> Path:
+    for candidate in path.parents:
+        if (candidate / "openapi").is_dir() and (candidate / "microservices").is_dir():
+            return candidate
+    return path.parent
+
+
+def _parse(yaml, loader, path: Path, data: bytes) -> dict:
+    document = yaml.load(data, Loader=loader)
+    if document is None:
+        return {}
+    if not isinstance(document, dict):
+        raise ValueError(f"{path} is not an OpenAPI document (top level is not a mapping)")
+    return document
+
+
+def _read(entry: Path, identity: tuple) -> dict | None:
+    try:
+        cached_identity, document = marshal.loads(entry.read_bytes())
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    if cached_identity != identity or not isinstance(document, dict):
+        return None
+    try:
+        os.utime(entry)  # recently used entries survive pruning
+    except OSError:
+        pass
+    return document
+
+
+def _write(entry: Path, identity: tuple, document: dict) -> None:
+    try:
+        data = marshal.dumps((identity, document))
+    except ValueError:  # e.g. YAML timestamps; parse this document every time
+        return
+    try:
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        temporary = entry.with_name(f"{entry.name}.{os.getpid()}.tmp")
+        temporary.write_bytes(data)
+        os.replace(temporary, entry)
+        entries = sorted(entry.parent.glob("*.marshal"), key=lambda item: item.stat().st_mtime)
+        for stale in entries[:-MAX_ENTRIES]:
+            stale.unlink()
+    except OSError:
+        pass
+
+
+def load_spec(path: str | Path, root: Path | None = None, *, cache: bool = True) -> dict:
+    """Return the parsed OpenAPI document at ``path``.
+
+    ``root`` selects the cache directory; by default it is the RERP checkout
+    containing ``path``. ``cache=False`` always parses and writes nothing.
+    """
+    path = Path(path)
+    data = path.read_bytes()
+    digest = hashlib.sha256(data).hexdigest()
+    yaml, loader, identity = _loader()
+    loaded = _LOADED.get((digest, identity)) if cache else None
+    if loaded is not None:
+        return loaded
+
+    entry = cache_dir(root or _spec_root(path.resolve())) / "specs" / f"{digest}.marshal"
+    document = _read(entry, identity) if cache else None
+    if document is None:
+        document = _parse(yaml, loader, path, data)
+        if cache:
+            _write(entry, identity, document)
+    if cache:
+        _LOADED[(digest, identity)] = document
+    return document
@@ -0,0 +1,143 @@
+import hashlib
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+
+def _write_service(root: Path, suite: str, service: str, package: str, binary: str) -> None:
+    spec = root / "openapi" / suite / service / "openapi.yaml"
+    spec.parent.mkdir(parents=True)
+    spec.write_text("openapi: 3.1.0\ninfo: {title: test, version: '1'}\npaths: {}\n")
+    gen = root / "microservices" / suite / service / "gen"
+    (gen / "doc").mkdir(parents=True)
+    (gen / "static_site").mkdir()
+    (gen / "config").mkdir()
+    (gen / "Cargo.toml").write_text(f'[package]\nname = "{package}_gen"\nversion = "0.1.0"\n')
+    impl = root / "microservices" / suite / service / "impl"
+    impl.mkdir(parents=True)
+    (impl / "Cargo.toml").write_text(
+        f'''[package]
+name = "{package}"
+version = "0.1.0"
+
+[[bin]]
+name = "{binary}"
+path = "src/main.rs"
+'''
+    )
+
+
+@pytest.fixture
+def make_service():
+    """``make_service(root, suite, service, package, binary)`` lays out a runtime-ready service."""
+    return _write_service
+
+
+@pytest.fixture
+def invoice_artifacts(tmp_path: Path, make_service) -> Path:
+    """``accounting/invoice`` with a service Dockerfile and an artifact per architecture.
+
+    Returns ``build_artifacts``; each ``{arch}/invoice`` holds its architecture
+    name and a matching ``.sha256`` sidecar.
+    """
+    make_service(tmp_path, "accounting", "invoice", "rerp_accounting_invoice", "invoice")
+    dockerfile = tmp_path / "docker" / "microservices" / "Dockerfile"
+    dockerfile.parent.mkdir(parents=True)
+    dockerfile.write_text("FROM scratch\n")
+    artifacts = tmp_path / "build_artifacts"
+    for architecture in ("amd64", "arm64", "arm"):
+        artifact = artifacts / architecture / "invoice"
+        artifact.parent.mkdir(parents=True)
+        artifact.write_bytes(architecture.encode())
+        Path(f"{artifact}.sha256").write_text(hashlib.sha256(artifact.read_bytes()).hexdigest())
+    return artifacts
+
+
+class FakeRegistry:
+    """State of an in-process Registry v2 API served on 127.0.0.1."""
+
+    def __init__(self, address: str) -> None:
+        self.address = address
+        self.manifests: dict[str, dict] = {}
+        self.tags: dict[str, dict[str, str]] = {}
+        self.deleted: list[tuple[str, str]] = []
+
+    @staticmethod
+    def manifest(*layers: tuple[str, int]) -> tuple[str, dict]:
+        document = {
+            "schemaVersion": 2,
+            "mediaType": "application/vnd.oci.image.manifest.v1+json",
+            "config": {"digest": f"sha256:config-{layers[-1][0]}", "size": 10},
+            "layers": [{"digest": f"sha256:{name}", "size": size} for name, size in layers],
+        }
+        return f"sha256:{hashlib.sha256(json.dumps(document).encode()).hexdigest()}", document
+
+
+class _RegistryHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args) -> None:
+        pass
+
+    @property
+    def state(self) -> FakeRegistry:
+        return self.server.registry
+
+    def _empty(self, status: int, headers: dict | None = None) -> None:
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def _json(self, payload: dict, headers: dict | None = None) -> None:
+        body = json.dumps(payload).encode()
+        self.send_response(200)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        parts = self.path.split("?")[0].split("/")
+        if self.path.startswith("/v2/_catalog"):
+            return self._json({"repositories": sorted(self.state.tags)})
+        repository = "/".join(parts[2:-2])
+        if parts[-2] == "tags":
+            return self._json({"name": repository, "tags": sorted(self.state.tags[repository])})
+        reference = parts[-1]
+        digest = self.state.tags[repository].get(reference, reference)
+        if digest not in self.state.manifests:
+            return self._empty(404)
+        self._json(self.state.manifests[digest], {"Docker-Content-Digest": digest})
+
+    def do_PUT(self) -> None:
+        parts = self.path.split("/")
+        repository, tag = "/".join(parts[2:-2]), parts[-1]
+        document = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        digest = f"sha256:{hashlib.sha256(json.dumps(document).encode()).hexdigest()}"
+        self.state.manifests[digest] = document
+        self.state.tags.setdefault(repository, {})[tag] = digest
+        self._empty(201, {"Docker-Content-Digest": digest})
+
+    def do_DELETE(self) -> None:
+        parts = self.path.split("/")
+        repository, digest = "/".join(parts[2:-2]), parts[-1]
+        self.state.deleted.append((repository, digest))
+        self.state.tags[repository] = {
+            tag: value for tag, value in self.state.tags[repository].items() if value != digest
+        }
+        self._empty(202)
+
+
+@pytest.fixture
+def registry():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _RegistryHandler)
+    server.registry = FakeRegistry(f"127.0.0.1:{server.server_address[1]}")
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server.registry
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,112 @@
+import gzip
+import hashlib
+import json
+from pathlib import Path
+
+import pytest
+
+from rerp_tooling import assets, runtime
+
+
+class _FakeBrotli:
+    @staticmethod
+    def compress(data: bytes, quality: int) -> bytes:
+        return b"br:" + data[:8]
+
+
+def test_precompress_emits_smaller_variants_and_a_manifest(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(assets, "brotli", _FakeBrotli)
+    spec = tmp_path / "openapi.yaml"
+    spec.write_text("paths:\n" + "  /invoices: {get: {operationId: list}}\n" * 200)
+    small = tmp_path / "small.js"
+    small.write_text("x")
+    image = tmp_path / "logo.png"
+    image.write_bytes(b"\x89PNG" + bytes(4096))
+    cache = tmp_path / "cache"
+
+    result = assets.precompress(
+        {"doc/openapi.yaml": spec, "static_site/small.js": small, "static_site/logo.png": image},
+        cache,
+    )
+
+    assert sorted(result.files) == [
+        "doc/openapi.yaml.br",
+        "doc/openapi.yaml.gz",
+        assets.MANIFEST_PATH,
+    ]
+    assert gzip.decompress(result.files["doc/openapi.yaml.gz"].read_bytes()) == spec.read_bytes()
+    entry = result.manifest["assets"]["doc/openapi.yaml"]
+    assert entry["sha256"] == hashlib.sha256(spec.read_bytes()).hexdigest()
+    assert entry["gzip"]["size"] < entry["size"]
+    assert set(result.manifest["assets"]["static_site/small.js"]) == {"sha256", "size"}
+    totals = result.manifest["totals"]
+    assert totals["files"] == 3
+    assert totals["gzip"] == entry["gzip"]["size"] + 1 + image.stat().st_size
+    assert json.loads(result.files[assets.MANIFEST_PATH].read_text()) == result.manifest
+
+    monkeypatch.setattr(assets, "_gzip", lambda data: (_ for _ in ()).throw(AssertionError))
+    assert assets.precompress({"doc/openapi.yaml": spec}, cache).files["doc/openapi.yaml.gz"] == (
+        result.files["doc/openapi.yaml.gz"]
+    )
+
+
+def test_precompress_without_brotli_emits_gzip_only(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(assets, "brotli", None)
+    spec = tmp_path / "openapi.yaml"
+    spec.write_text("openapi: 3.1.0\n" * 200)
+
+    result = assets.precompress({"doc/openapi.yaml": spec}, tmp_path / "cache")
+
+    assert sorted(result.files) == ["doc/openapi.yaml.gz", assets.MANIFEST_PATH]
+    assert "br" not in result.manifest["totals"]
+
+
+def test_precompress_never_shadows_source_files(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(assets, "brotli", _FakeBrotli)
+    spec = tmp_path / "openapi.yaml"
+    spec.write_text("openapi: 3.1.0\n" * 200)
+    shipped = tmp_path / "openapi.yaml.gz"
+    shipped.write_bytes(gzip.compress(spec.read_bytes()))
+
+    result = assets.precompress(
+        {"doc/openapi.yaml": spec, "doc/openapi.yaml.gz": shipped}, tmp_path / "cache"
+    )
+
+    assert sorted(result.files) == ["doc/openapi.yaml.br", assets.MANIFEST_PATH]
+    assert set(result.manifest["assets"]["doc/openapi.yaml"]) == {"sha256", "size", "br"}
+
+    with pytest.raises(ValueError, match="asset-manifest.json"):
+        assets.precompress({assets.MANIFEST_PATH: spec}, tmp_path / "cache")
+
+
+def test_staged_context_carries_precompressed_variants(
+    tmp_path: Path, invoice_artifacts: Path, monkeypatch
+) -> None:
+    monkeypatch.setattr(assets, "brotli", None)
+    doc = tmp_path / "microservices" / "accounting" / "invoice" / "gen" / "doc"
+    (doc / "openapi.yaml").write_text("openapi: 3.1.0\n" * 200)
+    artifacts = invoice_artifacts
+
+    def stage() -> Path:
+        assert (
+            runtime.stage_multiarch_context(
+                tmp_path,
+                ".docker-context/invoice",
+                artifacts,
+                "accounting",
+                "invoice",
+                precompress=True,
+            )
+            == 0
+        )
+        return tmp_path / ".docker-context" / "invoice"
+
+    context = stage()
+    variant = context / "doc" / "openapi.yaml.gz"
+    assert gzip.decompress(variant.read_bytes()) == (doc / "openapi.yaml").read_bytes()
+    manifest = json.loads((context / assets.MANIFEST_PATH).read_text())
+    assert manifest["assets"]["doc/openapi.yaml"]["gzip"]["size"] == variant.stat().st_size
+
+    inode = variant.stat().st_ino
+    assert stage() == context
+    assert (context / "doc" / "openapi.yaml.gz").stat().st_ino == inode
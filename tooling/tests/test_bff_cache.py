@@ -0,0 +1,60 @@
+import importlib
+from pathlib import Path
+
+cli = importlib.import_module("rerp_tooling.cli.main")
+
+
+def _suite(root: Path) -> dict[str, dict]:
+    accounting = root / "openapi" / "accounting"
+    services = {}
+    for name in ("general-ledger", "invoice"):
+        spec = accounting / name / "openapi.yaml"
+        spec.parent.mkdir(parents=True)
+        spec.write_text(f"paths:\n  /{name}:\n    get: {{operationId: list_{name}}}\n")
+        services[name] = {"base_path": f"/api/{name}", "spec_path": spec}
+    (accounting / "bff-suite-config.yaml").write_text("suite: accounting\n")
+    return services
+
+
+def test_generate_system_skips_unchanged_fragments_and_restores_output(
+    tmp_path: Path, monkeypatch, capsys
+) -> None:
+    services = _suite(tmp_path)
+    monkeypatch.setenv("RERP_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(cli, "_bff_suite_services", lambda *a: services)
+    runs: list[str] = []
+
+    def generate_bff_spec(suite_config_path, output_path, base_dir):
+        runs.append(output_path.name)
+        output_path.write_text(
+            "paths:\n"
+            + "".join(Path(s["spec_path"]).read_text().split("\n", 1)[1] for s in services.values())
+        )
+
+    generate = importlib.import_module("brrtrouter_tooling.bff.generate")
+    monkeypatch.setattr(generate, "generate_bff_spec", generate_bff_spec)
+    output = tmp_path / "openapi" / "accounting" / "openapi_bff.yaml"
+
+    def run(*extra: str) -> str:
+        cli._run_bff_generate_system(["--suite", "accounting", *extra], project_root=tmp_path)
+        return capsys.readouterr().out
+
+    run()
+    built = output.read_bytes()
+    assert len(runs) == 1
+
+    assert "up to date (current)" in run()
+    output.write_text("edited by hand\n")
+    assert "up to date (restored)" in run()
+    assert output.read_bytes() == built
+    assert len(runs) == 1
+
+    invoice = services["invoice"]["spec_path"]
+    invoice.write_text(invoice.read_text().replace("list_invoice", "find_invoice"))
+    assert "(invoice changed)" in run()
+    assert len(runs) == 2
+
+    services["general-ledger"]["base_path"] = "/api/ledger"
+    assert "(general-ledger changed)" in run()
+    run("--force")
+    assert len(runs) == 4
@@ -0,0 +1,73 @@
+from pathlib import Path
+
+from rerp_tooling import cargo_index
+from rerp_tooling.cargo_index import CargoWorkspaceIndex
+
+
+def _write(path: Path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+
+
+def _workspace(root: Path) -> Path:
+    workspace = root / "microservices"
+    _write(
+        workspace / "Cargo.toml",
+        '[workspace]\nmembers = [\n    "accounting/core",\n    "accounting/invoice/gen",\n'
+        '    "accounting/invoice/impl",\n    "accounting/missing/impl",\n]\n',
+    )
+    _write(workspace / "accounting/core/Cargo.toml", '[package]\nname = "accounting_core"\n')
+    _write(
+        workspace / "accounting/invoice/gen/Cargo.toml",
+        '[package]\nname = "rerp_accounting_invoice_gen"\n',
+    )
+    _write(
+        workspace / "accounting/invoice/impl/Cargo.toml",
+        '[package]\nname = "rerp_accounting_invoice"\n\n[[bin]]\nname = "invoice"\n'
+        'path = "src/main.rs"\n',
+    )
+    return workspace
+
+
+def test_index_maps_workspace_members_to_packages_binaries_and_roles(tmp_path: Path) -> None:
+    workspace = _workspace(tmp_path)
+
+    members = CargoWorkspaceIndex(workspace).members()
+
+    assert sorted(members) == [
+        "accounting/core",
+        "accounting/invoice/gen",
+        "accounting/invoice/impl",
+    ]
+    assert members["accounting/core"].role == "lib"
+    assert members["accounting/invoice/gen"].role == "gen"
+    assert members["accounting/invoice/gen"].binary_name == "rerp_accounting_invoice_gen"
+    impl = members["accounting/invoice/impl"]
+    assert (impl.package_name, impl.binaries, impl.role) == (
+        "rerp_accounting_invoice",
+        ("invoice",),
+        "impl",
+    )
+
+
+def test_persisted_index_skips_parsing_until_a_manifest_changes(
+    tmp_path: Path, monkeypatch
+) -> None:
+    workspace = _workspace(tmp_path)
+    cache = tmp_path / "cache" / "cargo-index.json"
+    manifest = workspace / "accounting/invoice/impl/Cargo.toml"
+    assert CargoWorkspaceIndex(workspace, cache).crate(manifest).binary_name == "invoice"
+
+    parsed = []
+    original = cargo_index.tomllib.loads
+    monkeypatch.setattr(
+        cargo_index.tomllib, "loads", lambda text: parsed.append(text) or original(text)
+    )
+    fresh = CargoWorkspaceIndex(workspace, cache)
+    assert fresh.crate(manifest).package_name == "rerp_accounting_invoice"
+    assert parsed == []
+
+    manifest.write_text(manifest.read_text().replace('"invoice"', '"invoice_api"'))
+    assert fresh.crate(manifest).binary_name == "invoice_api"
+    assert len(parsed) == 1
+    assert fresh.crate(workspace / "accounting/absent/impl/Cargo.toml") is None
@@ -0,0 +1,81 @@
+"""Import-time budget for the lightweight ``rerp`` subcommands.
+
+Tilt runs ``rerp services`` and ``rerp docker ...`` once per service per
+rebuild, so startup cost is multiplied across every ``local_resource``. These
+tests run ``python -X importtime`` in a fresh interpreter and fail when the CLI
+module starts importing BRRTRouter's generator/BFF stacks (or YAML) eagerly,
+imports a RERP module that only some subcommands need, or when its cumulative
+import time regresses past the budget.
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+# Cumulative ``-X importtime`` microseconds for ``rerp_tooling.cli.main``.
+# Slow CI hosts can raise it with RERP_IMPORT_BUDGET_US instead of editing tests.
+IMPORT_BUDGET_US = int(os.environ.get("RERP_IMPORT_BUDGET_US", "60000"))
+HEAVY_MODULES = ("brrtrouter_tooling", "yaml", "jinja2")
+# Imported by the subcommand handlers that use them, never by the CLI module itself.
+HANDLER_MODULES = (
+    "rerp_tooling.bff_cache",
+    "rerp_tooling.runtime",
+    "rerp_tooling.cargo_index",
+    "rerp_tooling.descriptor_daemon",
+    "rerp_tooling.layout",
+    "rerp_tooling.operations",
+    "rerp_tooling.refs",
+    "rerp_tooling.specs",
+    "rerp_tooling.registry",
+    "tomllib",
+)
+# Image staging, OCI assembly, asset compression and dev-sync stay out of `services`.
+IMAGE_MODULES = (
+    "rerp_tooling.assets",
+    "rerp_tooling.dev_sync",
+    "rerp_tooling.oci",
+    "tarfile",
+)
+
+
+def _importtime(args: list[str], cwd: Path) -> dict[str, int]:
+    env = dict(os.environ, PYTHONPATH=str(SRC), PYTHONDONTWRITEBYTECODE="1")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        cwd=cwd,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, total, name = line.split("|", 2)
+        if total.strip().isdigit():
+            cumulative[name.strip()] = int(total)
+    return cumulative
+
+
+def test_cli_module_import_stays_within_budget(tmp_path: Path) -> None:
+    imported = _importtime(["-c", "import rerp_tooling.cli.main"], tmp_path)
+
+    heavy = sorted(name for name in imported if name.split(".")[0] in HEAVY_MODULES)
+    assert heavy == []
+    assert sorted(name for name in HANDLER_MODULES + IMAGE_MODULES if name in imported) == []
+    assert imported["rerp_tooling.cli.main"] <= IMPORT_BUDGET_US
+
+
+def test_services_subcommand_does_not_import_brrtrouter(tmp_path: Path) -> None:
+    (tmp_path / "openapi").mkdir()
+    (tmp_path / "microservices").mkdir()
+
+    imported = _importtime(["-m", "rerp_tooling.cli.main", "services", "--no-cache"], tmp_path)
+
+    assert sorted(name for name in imported if name.split(".")[0] in HEAVY_MODULES) == []
+    assert sorted(name for name in IMAGE_MODULES if name in imported) == []
@@ -0,0 +1,124 @@
+import importlib
+import multiprocessing
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+from rerp_tooling import codegen
+
+cli = importlib.import_module("rerp_tooling.cli.main")
+
+
+def _spec(root: Path, service: str) -> None:
+    spec = root / "openapi" / "accounting" / service / "openapi.yaml"
+    spec.parent.mkdir(parents=True)
+    spec.write_text(f"openapi: 3.1.0\ninfo: {{title: {service}}}\n")
+
+
+def _fake_generator():
+    gen_mod = codegen._generator_module()
+
+    def run_gen_argv() -> None:
+        suite, service = sys.argv[3], sys.argv[5]
+        crate = gen_mod.default_gen_package_name(service)
+        assert crate == gen_mod._default_package_name(suite, service)
+        gen = Path("microservices") / suite / service / "gen"
+        gen.mkdir(parents=True, exist_ok=True)
+        (gen / "Cargo.toml").write_text(f'[package]\nname = "{crate}"\n# pid {os.getpid()}\n')
+
+    return run_gen_argv
+
+
+def test_generate_service_scopes_argv_and_package_callbacks_to_one_call(
+    tmp_path: Path, monkeypatch
+) -> None:
+    _spec(tmp_path, "invoice")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("RERP_CACHE_DIR", str(tmp_path / "cache"))
+    gen_mod = codegen._generator_module()
+    monkeypatch.setattr(gen_mod, "run_gen_argv", _fake_generator())
+    before = (list(sys.argv), gen_mod.default_gen_package_name, gen_mod._default_package_name)
+
+    for _ in range(2):
+        assert (
+            codegen.generate_service(
+                tmp_path,
+                "accounting",
+                "invoice",
+                gen_package_name=cli._rerp_gen_package_name,
+                stamp=False,
+            )
+            == 0
+        )
+
+    manifest = tmp_path / "microservices" / "accounting" / "invoice" / "gen" / "Cargo.toml"
+    assert 'name = "rerp_accounting_invoice_gen"' in manifest.read_text()
+    assert (sys.argv, gen_mod.default_gen_package_name, gen_mod._default_package_name) == before
+
+
+def test_generate_suite_reports_a_raising_service_with_the_others(
+    tmp_path: Path, monkeypatch, capsys
+) -> None:
+    for service in ("invoice", "payments"):
+        _spec(tmp_path, service)
+    monkeypatch.chdir(tmp_path)
+    generate = _fake_generator()
+
+    def run_gen_argv() -> None:
+        if sys.argv[5] == "invoice":
+            raise FileNotFoundError("templates/Cargo.toml.j2")
+        generate()
+
+    monkeypatch.setattr(codegen._generator_module(), "run_gen_argv", run_gen_argv)
+
+    result = codegen.generate_suite(
+        tmp_path,
+        "accounting",
+        ["invoice", "payments"],
+        gen_package_name=cli._rerp_gen_package_name,
+        stamp=False,
+        jobs=1,
+    )
+
+    assert result == 1
+    captured = capsys.readouterr()
+    assert "accounting/invoice: FileNotFoundError: templates/Cargo.toml.j2" in captured.err
+    assert "Generated 2 accounting service(s)" in captured.out
+    assert "failed (1)" in captured.out
+    assert (tmp_path / "microservices" / "accounting" / "payments" / "gen" / "Cargo.toml").exists()
+
+
+@pytest.mark.skipif(
+    multiprocessing.get_start_method() != "fork",
+    reason="workers inherit the patched generator only when forked",
+)
+def test_gen_suite_all_fans_services_out_over_worker_processes(
+    tmp_path: Path, monkeypatch, capfd
+) -> None:
+    services = ["general-ledger", "invoice", "payments"]
+    for service in services:
+        _spec(tmp_path, service)
+    (tmp_path / "microservices").mkdir()
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("RERP_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(codegen, "generator_identity", lambda: {"brrtrouter-tooling": "1"})
+    monkeypatch.setattr(codegen._generator_module(), "run_gen_argv", _fake_generator())
+
+    monkeypatch.setattr(sys, "argv", ["rerp", "gen", "suite", "accounting", "--all", "--jobs", "3"])
+    cli.main()
+
+    manifests = [
+        (tmp_path / "microservices" / "accounting" / service / "gen" / "Cargo.toml").read_text()
+        for service in services
+    ]
+    assert [manifest.splitlines()[1] for manifest in manifests] == [
+        f'name = "rerp_accounting_{service.replace("-", "_")}_gen"' for service in services
+    ]
+    assert all(f"# pid {os.getpid()}" not in manifest for manifest in manifests)
+    output = capfd.readouterr().out
+    assert "Generated 3 accounting service(s) with 3 worker(s)" in output
+
+    cli.main()
+    assert capfd.readouterr().out.count("generated code is up to date") == 3
@@ -0,0 +1,97 @@
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from rerp_tooling import descriptor_daemon
+
+
+@pytest.fixture
+def accounting_service(tmp_path: Path, make_service):
+    """Lay out a delivered ``accounting/{service}`` (with Helm values) under ``tmp_path``."""
+
+    def add(service: str) -> None:
+        make_service(tmp_path, "accounting", service, f"rerp_accounting_{service}", service)
+        values = tmp_path / "helm" / "rerp-microservice" / "values"
+        values.mkdir(parents=True, exist_ok=True)
+        (values / f"{service}.yaml").write_text("service: {}\n")
+
+    return add
+
+
+class _ManualWatcher:
+    def __init__(self) -> None:
+        self.changed = threading.Event()
+
+    def wait(self, timeout: float) -> bool:
+        fired = self.changed.wait(timeout)
+        self.changed.clear()
+        return fired
+
+    def pending(self) -> bool:
+        return self.changed.is_set()
+
+    def mark_refreshed(self) -> None:
+        self.changed.clear()
+
+    def close(self) -> None:
+        return None
+
+
+def test_daemon_answers_queries_and_refreshes_after_changes(
+    tmp_path: Path, accounting_service
+) -> None:
+    accounting_service("invoice")
+    socket_path = tmp_path / "d.sock"
+    watcher = _ManualWatcher()
+    daemon = descriptor_daemon.DescriptorDaemon(tmp_path, socket_path, watcher=watcher)
+    thread = threading.Thread(target=daemon.serve_forever, daemon=True)
+    thread.start()
+    try:
+        for _ in range(100):
+            if descriptor_daemon.query(socket_path, {"command": "ping"}) is not None:
+                break
+            time.sleep(0.02)
+
+        served = descriptor_daemon.request_descriptors(tmp_path, socket_path=socket_path)
+        assert [item["service"] for item in served] == ["invoice"]
+
+        # A change the watcher has seen but not refreshed yet is picked up before answering.
+        accounting_service("budget")
+        watcher.changed.set()
+        served = descriptor_daemon.request_descriptors(tmp_path, socket_path=socket_path)
+        assert [item["service"] for item in served] == ["budget", "invoice"]
+
+        other = tmp_path / "other-checkout"
+        other.mkdir()
+        assert descriptor_daemon.request_descriptors(other, socket_path=socket_path) is None
+        with pytest.raises(RuntimeError, match="descriptor daemon serves"):
+            descriptor_daemon.query(socket_path, {"command": "ping", "root": str(other)})
+        with pytest.raises(RuntimeError, match="unknown service"):
+            descriptor_daemon.query(
+                socket_path, {"command": "describe", "suite": "accounting", "service": "gl"}
+            )
+    finally:
+        daemon.shutdown()
+        thread.join(timeout=5)
+    assert not socket_path.exists()
+    assert descriptor_daemon.request_descriptors(tmp_path, socket_path=socket_path) is None
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is Linux-only")
+def test_inotify_watcher_reports_manifest_edits(tmp_path: Path, accounting_service) -> None:
+    accounting_service("invoice")
+    watcher = descriptor_daemon.InotifyWatcher(tmp_path, debounce=0.01)
+    try:
+        assert watcher.wait(0.05) is False
+        manifest = tmp_path / "microservices" / "accounting" / "invoice" / "impl" / "Cargo.toml"
+        manifest.write_text(manifest.read_text() + "\n")
+        assert watcher.pending() is True
+        assert watcher.wait(2.0) is True
+        assert watcher.pending() is True
+        watcher.mark_refreshed()
+        assert watcher.pending() is False
+    finally:
+        watcher.close()
@@ -0,0 +1,151 @@
+import hashlib
+import os
+import shutil
+import signal
+import subprocess
+import time
+from pathlib import Path
+
+from rerp_tooling import dev_sync, runtime
+
+ENTRYPOINT = Path(__file__).resolve().parents[2] / "docker" / "base" / "dev-entrypoint.sh"
+
+
+def _binary(path: Path, version: str, log: Path) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(f"#!/bin/sh\necho {version} >> {log}\nexec sleep 30\n")
+    path.chmod(0o755)
+    Path(f"{path}.sha256").write_text(hashlib.sha256(path.read_bytes()).hexdigest())
+    return path
+
+
+def _wait_for(log: Path, expected: list[str]) -> list[str]:
+    lines: list[str] = []
+    for _ in range(100):
+        lines = log.read_text().split() if log.exists() else []
+        if lines == expected:
+            break
+        time.sleep(0.1)
+    return lines
+
+
+class _Container:
+    """A local stand-in for a running service container.
+
+    ``app`` plays ``/app`` and the real ``dev-entrypoint.sh`` plays PID 1;
+    ``docker cp``/``docker exec`` run against them on the host.
+    """
+
+    def __init__(self, app: Path) -> None:
+        self.app = app
+        self.process = subprocess.Popen(
+            ["sh", str(ENTRYPOINT), str(app / "service")],
+            stdout=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+        self.commands: list[list[str]] = []
+
+    def _local(self, argument: str) -> str:
+        if argument == dev_sync.ENTRYPOINT_PID:
+            return str(self.process.pid)
+        return argument.replace("/app/", f"{self.app}/")
+
+    def __call__(self, command, capture_output, text, check):
+        self.commands.append(command)
+        if command[:2] == ["docker", "cp"]:
+            shutil.copy(command[2], self._local(command[3].split(":", 1)[1]))
+            return subprocess.CompletedProcess(command, 0, "", "")
+        assert command[:3] == ["docker", "exec", "invoice-dev"]
+        return subprocess.run(
+            [self._local(argument) for argument in command[3:]],
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+
+    def stop(self) -> None:
+        os.killpg(self.process.pid, signal.SIGKILL)
+        self.process.wait()
+
+
+def test_dev_sync_swaps_the_binary_and_restarts_it_through_the_entrypoint(
+    tmp_path: Path, make_service
+) -> None:
+    make_service(tmp_path, "accounting", "invoice", "rerp_accounting_invoice", "invoice")
+    log = tmp_path / "versions.log"
+    _binary(tmp_path / "container" / "app" / "service", "v1", log)
+    artifact = _binary(tmp_path / "build_artifacts" / "amd64" / "accounting" / "invoice", "v2", log)
+    container = _Container(tmp_path / "container" / "app")
+    try:
+        assert _wait_for(log, ["v1"]) == ["v1"]
+
+        def sync() -> int:
+            return runtime.dev_sync_service(
+                tmp_path,
+                f"{artifact}.sha256",
+                artifact,
+                "accounting",
+                "invoice",
+                container="invoice-dev",
+                runner=container,
+            )
+
+        assert sync() == 0
+        assert _wait_for(log, ["v1", "v2"]) == ["v1", "v2"]
+        assert (container.app / "service").read_bytes() == artifact.read_bytes()
+        assert not (container.app / ".service.partial").exists()
+
+        container.commands.clear()
+        assert sync() == 0
+        assert [command[:4] for command in container.commands] == [
+            ["docker", "exec", "invoice-dev", "sha256sum"]
+        ]
+    finally:
+        container.stop()
+
+
+def test_dev_sync_rejects_a_copy_that_does_not_match_the_sidecar(tmp_path: Path, capsys) -> None:
+    log = tmp_path / "versions.log"
+    artifact = _binary(tmp_path / "invoice", "v2", log)
+    digest = hashlib.sha256(artifact.read_bytes()).hexdigest()
+    commands = []
+
+    def runner(command, capture_output, text, check):
+        commands.append(command)
+        if "get" in command:
+            return subprocess.CompletedProcess(command, 0, "invoice-7d9f invoice-x2k1", "")
+        if "sha256sum" in command:
+            return subprocess.CompletedProcess(command, 0, f"{'0' * 64}  /app/service\n", "")
+        if "sh" in command:
+            return subprocess.CompletedProcess(command, 3, "", "copied binary has digest 00")
+        return subprocess.CompletedProcess(command, 0, "", "")
+
+    target = dev_sync.KubernetesTarget("rerp", "invoice", "shared-k8s.yaml")
+    assert dev_sync.sync_binary(artifact, digest, target, runner) == 1
+
+    kubectl = ["kubectl", "--kubeconfig", "shared-k8s.yaml", "--namespace", "rerp"]
+    assert commands[0][:8] == [*kubectl, "get", "pods", "--selector"]
+    assert commands[2] == [
+        *kubectl,
+        "cp",
+        "--container",
+        "invoice",
+        str(artifact),
+        f"invoice-7d9f:{dev_sync.PARTIAL_BINARY}",
+    ]
+    assert sum("cp" in command for command in commands) == 2
+    assert "invoice-x2k1: copied binary has digest 00" in capsys.readouterr().err
+
+
+def test_dev_sync_reports_an_unknown_service_without_a_traceback(tmp_path: Path, capsys) -> None:
+    artifact = _binary(tmp_path / "invoice", "v2", tmp_path / "versions.log")
+
+    def runner(command, capture_output, text, check):
+        raise AssertionError(f"nothing should run: {command}")
+
+    result = runtime.dev_sync_service(
+        tmp_path, f"{artifact}.sha256", artifact, "accounting", "invioce", runner=runner
+    )
+
+    assert result == 1
+    assert "cannot dev-sync accounting/invioce" in capsys.readouterr().err
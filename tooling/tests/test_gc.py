@@ -0,0 +1,131 @@
+import importlib
+import json
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from rerp_tooling import gc, runtime
+from rerp_tooling.registry import RegistryClient
+
+cli = importlib.import_module("rerp_tooling.cli.main")
+
+
+def _artifact(path: Path, data: bytes, mtime: int) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    os.utime(path, (mtime, mtime))
+
+
+def test_artifact_gc_prunes_orphans_only_on_request(tmp_path: Path, capsys) -> None:
+    suite_dir = tmp_path / "build_artifacts" / "amd64" / "accounting"
+    _artifact(suite_dir / "invoice", b"current", 300)
+    _artifact(suite_dir / "invoice.sha256", b"x" * 64, 300)
+    _artifact(suite_dir / "invoice-worker", b"worker", 50)
+    _artifact(suite_dir / "retired", b"gone", 300)
+    _artifact(suite_dir / "retired.verified.json", b"{}", 300)
+    _artifact(suite_dir / ".invoice.partial", b"half", 300)
+    _artifact(suite_dir / ".worker.partial", b"copying", int(time.time()))
+    binaries = {("accounting", "invoice")}
+
+    assert gc.collect(tmp_path, binaries, images=False) == 0
+    assert "Reclaimed 4 B: artifacts 4 B (1)" in capsys.readouterr().out
+    assert not (suite_dir / ".invoice.partial").exists()
+    assert (suite_dir / "retired").exists()
+
+    assert gc.collect(tmp_path, binaries, images=False, prune_orphans=True, dry_run=True) == 0
+    assert "Would reclaim 12 B" in capsys.readouterr().out
+    assert gc.collect(tmp_path, binaries, images=False, prune_orphans=True) == 0
+    assert sorted(path.name for path in suite_dir.iterdir()) == [
+        ".worker.partial",
+        "invoice",
+        "invoice.sha256",
+    ]
+
+
+class _Result:
+    def __init__(self, stdout: str = "", returncode: int = 0) -> None:
+        self.stdout = stdout
+        self.stderr = ""
+        self.returncode = returncode
+
+
+def test_image_gc_untags_old_dev_tags_and_counts_only_released_images(capsys) -> None:
+    repository = "localhost:5001/rerp-accounting-invoice"
+    listing = "\n".join(
+        [
+            f"{repository}\tdev-3000000000\timg3",
+            f"{repository}\ttilt\timg3",
+            f"{repository}\tdev-2000000000\timg2",
+            f"{repository}\ttilt-old\timg2",
+            f"{repository}\tdev-1000000000\timg1",
+            "postgres\t16\timg9",
+        ]
+    )
+    commands = []
+
+    def runner(command, capture_output, text, check):
+        commands.append(command)
+        if command[:3] == ["docker", "image", "ls"] and "--quiet" in command:
+            return _Result("dangling1\n")
+        if command[:3] == ["docker", "image", "ls"]:
+            return _Result(listing)
+        if command[:3] == ["docker", "image", "inspect"]:
+            return _Result("sha256:img1aaaa\t1000\nsha256:dangling1bbb\t500\n")
+        return _Result()
+
+    assert gc.collect(Path("/nonexistent"), set(), keep=1, runner=runner) == 0
+
+    removed = [command[2] for command in commands if command[:2] == ["docker", "rmi"]]
+    assert removed == [
+        f"{repository}:dev-2000000000",
+        f"{repository}:dev-1000000000",
+        "dangling1",
+    ]
+    assert "images 1.5 KiB (3)" in capsys.readouterr().out
+
+
+def test_registry_gc_deletes_expired_dev_manifests(registry, capsys) -> None:
+    base = ("base", 5000)
+    newest, newest_doc = registry.manifest(base, ("binary-3", 300))
+    middle, middle_doc = registry.manifest(base, ("binary-2", 200))
+    oldest, oldest_doc = registry.manifest(base, ("binary-1", 100))
+    registry.manifests = {newest: newest_doc, middle: middle_doc, oldest: oldest_doc}
+    registry.tags = {
+        "rerp-accounting-invoice": {
+            "dev-3000": newest,
+            "dev-2000": middle,
+            "dev-1000": oldest,
+            "pinned": oldest,
+        },
+        "postgres": {"dev-1": newest},
+    }
+    registry.deleted = []
+
+    collected = gc.collect(
+        Path("/nonexistent"), set(), keep=1, images=False, registry=registry.address
+    )
+    assert collected == 0
+
+    assert registry.deleted == [("rerp-accounting-invoice", middle)]
+    output = capsys.readouterr().out
+    assert "registry 210 B (1)" in output
+    assert "garbage-collect" in output
+    assert RegistryClient(registry.address).tags("rerp-accounting-invoice") == [
+        "dev-1000",
+        "dev-3000",
+        "pinned",
+    ]
+
+
+def test_failed_dangling_prune_does_not_fail_the_image_build(
+    tmp_path: Path, monkeypatch, capsys
+) -> None:
+    monkeypatch.setattr(runtime, "build_service_image", lambda *args, **options: 0)
+    monkeypatch.setattr(gc, "prune_dangling", lambda: 1)
+
+    argv = ["build-image-simple", "rerp-invoice", "Dockerfile", "invoice.sha256", "invoice"]
+    argv += ["--suite", "accounting", "--service", "invoice", "--prune-dangling"]
+    assert cli._run_rerp_docker(argv, project_root=tmp_path) == 0
+    assert "were not pruned; the build succeeded" in capsys.readouterr().err
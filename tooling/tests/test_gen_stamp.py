@@ -0,0 +1,95 @@
+import importlib
+import os
+import sys
+from pathlib import Path
+
+from rerp_tooling import codegen, gen_stamp
+
+cli = importlib.import_module("rerp_tooling.cli.main")
+
+
+def _generator(root: Path, runs: list[str]):
+    def run_gen_argv() -> None:
+        spec = (root / "openapi" / "accounting" / "invoice" / "openapi.yaml").read_text()
+        gen = root / "microservices" / "accounting" / "invoice" / "gen"
+        (gen / "src").mkdir(parents=True, exist_ok=True)
+        (gen / "src" / "lib.rs").write_text("pub mod handlers;\n")
+        (gen / "src" / "handlers.rs").write_text(f"// {spec.strip()}\n")
+        runs.append(" ".join(sys.argv))
+        raise SystemExit(0)
+
+    return run_gen_argv
+
+
+def _mtimes(root: Path) -> dict[str, int]:
+    src = root / "microservices" / "accounting" / "invoice" / "gen" / "src"
+    return {path.name: path.stat().st_mtime_ns for path in src.iterdir()}
+
+
+def test_gen_suite_skips_matching_stamps_and_keeps_unchanged_mtimes(
+    tmp_path: Path, monkeypatch, capsys
+) -> None:
+    spec = tmp_path / "openapi" / "accounting" / "invoice" / "openapi.yaml"
+    spec.parent.mkdir(parents=True)
+    spec.write_text("v1")
+    (tmp_path / "microservices").mkdir()
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("RERP_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(codegen, "generator_identity", lambda: {"brrtrouter-tooling": "1"})
+    runs: list[str] = []
+    monkeypatch.setattr(cli.gen_cmd, "run_gen_argv", _generator(tmp_path, runs))
+    argv = ["rerp", "gen", "suite", "accounting", "--service", "invoice"]
+
+    def gen(*extra: str) -> None:
+        monkeypatch.setattr(sys, "argv", [*argv, *extra])
+        cli.main()
+
+    src = tmp_path / "microservices" / "accounting" / "invoice" / "gen" / "src"
+    src.mkdir(parents=True)
+    (src / "lib.rs").write_text("pub mod handlers;\n")
+    os.utime(src / "lib.rs", ns=(1_000_000_000, 1_000_000_000))
+
+    gen()
+    assert runs == ["brrtrouter gen suite accounting --service invoice"]
+    assert _mtimes(tmp_path)["lib.rs"] == 1_000_000_000
+    assert "kept the mtime of 1 unchanged" in capsys.readouterr().out
+
+    gen()
+    assert len(runs) == 1
+    assert "up to date" in capsys.readouterr().out
+
+    handlers = _mtimes(tmp_path)["handlers.rs"]
+    spec.write_text("v2")
+    gen()
+    assert len(runs) == 2
+    assert _mtimes(tmp_path)["lib.rs"] == 1_000_000_000
+    assert "// v2" in (src / "handlers.rs").read_text()
+    assert _mtimes(tmp_path)["handlers.rs"] >= handlers
+
+    (src / "lib.rs").write_text("edited by hand\n")
+    gen()
+    assert len(runs) == 3
+    assert (src / "lib.rs").read_text() == "pub mod handlers;\n"
+
+    gen("--no-stamp")
+    assert len(runs) == 4
+
+
+def test_generator_identity_follows_edits_to_an_editable_install(tmp_path: Path) -> None:
+    package = tmp_path / "tooling" / "src" / "brrtrouter_tooling"
+    (package / "templates").mkdir(parents=True)
+    (package / "templates" / "handler.rs.txt").write_text("fn handler() {}\n")
+    (package / "__init__.py").write_text("")
+    (tmp_path / "tooling" / "pyproject.toml").write_text('version = "0.1.0"\n')
+    digest = gen_stamp._source_digest(package)
+
+    (package / "__pycache__").mkdir()
+    (package / "__pycache__" / "x.pyc").write_bytes(b"cache")
+    assert gen_stamp._source_digest(package) == digest
+
+    (package / "templates" / "handler.rs.txt").write_text("fn handler() { todo!() }\n")
+    edited = gen_stamp._source_digest(package)
+    assert edited != digest
+
+    (tmp_path / "tooling" / "pyproject.toml").write_text('version = "0.1.0"\n# deps\n')
+    assert gen_stamp._source_digest(package) != edited
@@ -0,0 +1,52 @@
+from pathlib import Path
+
+from rerp_tooling.layout import RepositoryLayout
+
+
+def _touch(path: Path, text: str = "") -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+
+
+def test_layout_indexes_suites_services_and_runtime_paths(tmp_path: Path) -> None:
+    _touch(tmp_path / "openapi" / "accounting" / "invoice" / "openapi.yaml")
+    _touch(tmp_path / "openapi" / "accounting" / "openapi_bff.yaml")
+    _touch(tmp_path / "openapi" / "accounting" / "bff-suite-config.yaml")
+    _touch(tmp_path / "openapi" / "documents" / "render" / "openapi.yaml")
+    (tmp_path / "openapi" / "documents" / "drafts").mkdir()
+    _touch(tmp_path / "microservices" / "accounting" / "invoice" / "impl" / "Cargo.toml")
+    (tmp_path / "microservices" / "accounting" / "invoice" / "impl" / "config").mkdir()
+    _touch(tmp_path / "microservices" / "accounting" / "invoice" / "gen" / "Cargo.toml")
+    _touch(tmp_path / "microservices" / "documents" / "render" / "impl" / "Cargo.toml")
+    _touch(tmp_path / "helm" / "rerp-microservice" / "values" / "invoice.yaml")
+    _touch(tmp_path / "helm" / "rerp-microservice" / "values" / "documents-render.yaml")
+
+    layout = RepositoryLayout(tmp_path)
+
+    assert layout.suite_names() == ["accounting", "documents"]
+    assert layout.spec_services("documents") == ["render"]
+    assert layout.suites_with_bff() == ["accounting"]
+    assert layout.suites_for_service("bff") == ["accounting"]
+    invoice = layout.service("accounting", "invoice")
+    assert invoice.config_dir == tmp_path / "microservices/accounting/invoice/impl/config"
+    assert invoice.helm_values == tmp_path / "helm/rerp-microservice/values/invoice.yaml"
+    render = layout.service("documents", "render")
+    assert render.gen_manifest is None
+    assert render.config_dir == tmp_path / "microservices/documents/render/gen/config"
+    assert render.helm_values == tmp_path / "helm/rerp-microservice/values/documents-render.yaml"
+    assert layout.service("accounting", "bff").spec == (
+        tmp_path / "openapi/accounting/openapi_bff.yaml"
+    )
+
+
+def test_layout_is_cached_per_root_until_invalidated(tmp_path: Path) -> None:
+    _touch(tmp_path / "openapi" / "accounting" / "invoice" / "openapi.yaml")
+    first = RepositoryLayout.for_root(tmp_path)
+    _touch(tmp_path / "openapi" / "accounting" / "budget" / "openapi.yaml")
+
+    assert RepositoryLayout.for_root(tmp_path / ".") is first
+    RepositoryLayout.invalidate(tmp_path)
+    assert RepositoryLayout.for_root(tmp_path).spec_services("accounting") == [
+        "budget",
+        "invoice",
+    ]
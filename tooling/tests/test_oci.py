@@ -0,0 +1,137 @@
+import gzip
+import hashlib
+import io
+import tarfile
+from pathlib import Path
+
+import pytest
+
+from rerp_tooling import runtime
+from rerp_tooling.oci import MEDIA_TYPE_CONFIG, MEDIA_TYPE_MANIFEST, OciLayout
+
+PLATFORMS = {
+    "amd64": {"os": "linux", "architecture": "amd64"},
+    "arm64": {"os": "linux", "architecture": "arm64"},
+    "arm": {"os": "linux", "architecture": "arm", "variant": "v7"},
+}
+
+
+def _base_layout(path: Path) -> OciLayout:
+    layout = OciLayout.create(path)
+    manifests = []
+    for architecture, platform in PLATFORMS.items():
+        buffer = io.BytesIO()
+        with tarfile.open(fileobj=buffer, mode="w") as archive:
+            data = architecture.encode()
+            info = tarfile.TarInfo("etc/os-release")
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+        layer = layout.put_bytes(
+            gzip.compress(buffer.getvalue(), mtime=0),
+            "application/vnd.oci.image.layer.v1.tar+gzip",
+        )
+        config = layout.put_json(
+            {
+                **platform,
+                "config": {"Env": ["TZ=UTC", "RUST_LOG=info"], "Cmd": ["/bin/sh"]},
+                "rootfs": {
+                    "type": "layers",
+                    "diff_ids": [f"sha256:{hashlib.sha256(buffer.getvalue()).hexdigest()}"],
+                },
+            },
+            MEDIA_TYPE_CONFIG,
+        )
+        manifest = layout.put_json(
+            {"schemaVersion": 2, "config": config, "layers": [layer]}, MEDIA_TYPE_MANIFEST
+        )
+        manifests.append({**manifest, "platform": platform})
+    layout.write_index(manifests, "rerp-base:latest")
+    return layout
+
+
+@pytest.fixture
+def repository(tmp_path: Path, invoice_artifacts: Path) -> Path:
+    """``invoice_artifacts`` plus doc/static inputs and an exported base layout."""
+    gen = tmp_path / "microservices" / "accounting" / "invoice" / "gen"
+    (gen / "doc" / "openapi.yaml").write_text("openapi: 3.1.0\n")
+    (gen / "static_site" / "assets").mkdir()
+    (gen / "static_site" / "assets" / "app.js").write_text("console.log(1)\n")
+    _base_layout(tmp_path / "base")
+    return invoice_artifacts
+
+
+def _assemble(root: Path, output: str, **options) -> int:
+    return runtime.assemble_oci_image(
+        root, output, "base", "build_artifacts", "accounting", "invoice", **options
+    )
+
+
+def test_assembled_image_layers_service_inputs_on_the_base(tmp_path: Path, repository) -> None:
+
+    assert _assemble(tmp_path, "out") == 0
+
+    layout = OciLayout(tmp_path / "out")
+    manifests = {item["platform"]["architecture"]: item for item in layout.manifests()}
+    assert sorted(manifests) == ["amd64", "arm", "arm64"]
+    assert manifests["arm"]["platform"]["variant"] == "v7"
+
+    manifest = layout.read_json(manifests["arm64"])
+    config = layout.read_json(manifest["config"])
+    assert len(manifest["layers"]) == len(config["rootfs"]["diff_ids"]) == 5
+    for descriptor, diff_id in zip(manifest["layers"], config["rootfs"]["diff_ids"]):
+        blob = layout.blob_path(descriptor["digest"]).read_bytes()
+        assert descriptor["digest"] == f"sha256:{hashlib.sha256(blob).hexdigest()}"
+        assert diff_id == f"sha256:{hashlib.sha256(gzip.decompress(blob)).hexdigest()}"
+
+    settings = config["config"]
+    assert settings["Env"] == ["TZ=UTC", "RUST_LOG=debug", "RUST_BACKTRACE=1"]
+    assert settings["Entrypoint"][:2] == ["/dev-entrypoint.sh", "/app/service"]
+    assert "Cmd" not in settings
+    assert settings["Labels"]["io.rerp.artifact.sha256"] == hashlib.sha256(b"arm64").hexdigest()
+
+    binary = layout.blob_path(manifest["layers"][1]["digest"]).read_bytes()
+    with tarfile.open(fileobj=io.BytesIO(gzip.decompress(binary))) as archive:
+        member = archive.getmember("app/service")
+        assert (member.mode, member.mtime, member.uid) == (0o755, 0, 0)
+        assert archive.extractfile(member).read() == b"arm64"
+    static = layout.blob_path(manifest["layers"][4]["digest"]).read_bytes()
+    with tarfile.open(fileobj=io.BytesIO(gzip.decompress(static))) as archive:
+        assert archive.getnames() == ["app/static_site/assets", "app/static_site/assets/app.js"]
+
+
+def test_assembly_is_reproducible_and_reuses_unchanged_layers(
+    tmp_path: Path, repository, monkeypatch, capsys
+) -> None:
+    monkeypatch.setenv("RERP_CACHE_DIR", str(tmp_path / "cache-one"))
+    assert _assemble(tmp_path, "one") == 0
+    first = OciLayout(tmp_path / "one").index()
+    capsys.readouterr()
+
+    arm = tmp_path / "build_artifacts" / "arm" / "invoice"
+    arm.write_bytes(b"arm-binary-v2")
+    Path(f"{arm}.sha256").write_text(hashlib.sha256(b"arm-binary-v2").hexdigest())
+    assert _assemble(tmp_path, "one") == 0
+    assert "1 layer(s) written, 5 reused" in capsys.readouterr().out
+    changed = OciLayout(tmp_path / "one").index()
+    assert changed != first
+
+    monkeypatch.setenv("RERP_CACHE_DIR", str(tmp_path / "cache-two"))
+    assert _assemble(tmp_path, "two", tarball="two.tar") == 0
+    assert OciLayout(tmp_path / "two").index() == changed
+
+    with tarfile.open(tmp_path / "two.tar") as archive:
+        names = archive.getnames()
+        assert {member.mtime for member in archive.getmembers()} == {0}
+    reachable = OciLayout(tmp_path / "two").reachable_blobs()
+    blobs = {name for name in names if name.startswith("blobs/sha256/")}
+    assert blobs == {f"blobs/sha256/{digest.split(':')[1]}" for digest in reachable}
+
+
+def test_assembly_rejects_artifacts_that_do_not_match_their_digest(
+    tmp_path: Path, repository: Path, capsys
+) -> None:
+    (repository / "amd64" / "invoice").write_bytes(b"tampered")
+
+    assert _assemble(tmp_path, "out") == 1
+    assert "digest mismatch" in capsys.readouterr().err
+    assert not (tmp_path / "out" / "index.json").exists()
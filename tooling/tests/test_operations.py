@@ -0,0 +1,93 @@
+from pathlib import Path
+
+from rerp_tooling import operations
+
+SPEC = """\
+openapi: 3.1.0
+info: {title: invoice, version: "1"}
+x-operationId: not-an-operation
+paths:
+  /invoices:
+    summary: Invoices
+    parameters:
+      - {name: tenant, in: header}
+    get:
+      operationId: list_invoices
+      responses: {"200": {description: ok}}
+    post:
+      tags: [invoices]
+      operationId: create_invoice
+  /invoices/{id}:
+    get: {operationId: get_invoice, parameters: [{name: id, in: path}]}
+    delete:
+      operationId: null
+    x-internal:
+      operationId: ignored
+  /health: ~
+components:
+  schemas:
+    Invoice:
+      properties:
+        get: {operationId: not_an_operation_either}
+"""
+
+ALIASED = """\
+x-shared: &shared {operationId: shared_op}
+paths:
+  /a:
+    get: *shared
+  /b:
+    put:
+      <<: *shared
+      operationId: put_b
+"""
+
+
+def test_event_scan_matches_a_full_load() -> None:
+    data = SPEC.encode()
+    assert operations.scan_operation_ids(data) == {"list_invoices", "create_invoice", "get_invoice"}
+    assert operations.scan_operation_ids(data) == operations.load_operation_ids(data)
+    assert operations.scan_operation_ids(b"") == frozenset()
+    assert operations.scan_operation_ids(b"- a\n- b\n") == frozenset()
+
+
+def test_aliases_and_merge_keys_fall_back_to_a_full_load(tmp_path: Path, monkeypatch) -> None:
+    assert operations.scan_operation_ids(ALIASED.encode()) == {"shared_op", "put_b"}
+
+    monkeypatch.setenv("RERP_CACHE_DIR", str(tmp_path / "cache"))
+    spec = tmp_path / "openapi.yaml"
+    spec.write_text(ALIASED)
+    index = operations.OperationIndex.for_root(tmp_path)
+    assert index.operation_ids(spec) == {"shared_op", "put_b"}
+    assert len(list((tmp_path / "cache" / "specs").glob("*.marshal"))) == 1
+
+
+def test_index_reuses_ids_for_unchanged_content(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setenv("RERP_CACHE_DIR", str(tmp_path / "cache"))
+    spec = tmp_path / "openapi.yaml"
+    spec.write_text(SPEC)
+    index = operations.OperationIndex.for_root(tmp_path)
+    assert index.operation_ids(spec) == {"list_invoices", "create_invoice", "get_invoice"}
+    index.save()
+
+    scans: list[bytes] = []
+    real_scan = operations.scan_operation_ids
+    monkeypatch.setattr(
+        operations,
+        "scan_operation_ids",
+        lambda data, load: scans.append(data) or real_scan(data, load),
+    )
+    spec.touch()
+    index = operations.OperationIndex.for_root(tmp_path)
+    assert index.operation_ids(spec) == {"list_invoices", "create_invoice", "get_invoice"}
+    assert scans == []
+    assert index.dirty is False
+
+    for entry in index.entries.values():
+        entry["used"] -= 2 * index.RECENCY_SECONDS
+    index.operation_ids(spec)
+    assert index.dirty is True
+
+    spec.write_text(SPEC.replace("get_invoice", "fetch_invoice"))
+    assert "fetch_invoice" in index.operation_ids(spec)
+    assert len(scans) == 1
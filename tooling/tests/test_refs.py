@@ -0,0 +1,82 @@
+from pathlib import Path
+
+import pytest
+
+from rerp_tooling import refs
+
+SPEC = """\
+openapi: 3.1.0
+paths:
+  /invoices/{id}:
+    get:
+      operationId: get_invoice
+      responses:
+        200:
+          content:
+            application/json:
+              schema: {$ref: "#/components/schemas/Invoice"}
+components:
+  schemas:
+    Invoice:
+      type: object
+      properties:
+        lines: {type: array, items: {$ref: "#/components/schemas/InvoiceLine"}}
+        customer: {$ref: "#/components/schemas/Party"}
+    InvoiceLine:
+      type: object
+      properties:
+        invoice: {$ref: "#/components/schemas/Invoice"}
+        account: {$ref: "#/components/schemas/Account"}
+    Party: {$ref: "#/components/schemas/Customer"}
+    Customer: {type: object}
+    Account: {$ref: "ledger.yaml#/components/schemas/Account"}
+    Loop: {$ref: "#/components/schemas/Loop~1Back"}
+    Loop/Back: {$ref: "#/components/schemas/Loop"}
+"""
+
+
+@pytest.fixture
+def index(tmp_path: Path, monkeypatch) -> refs.RefIndex:
+    monkeypatch.setattr(refs, "_INDEXES", {})
+    path = tmp_path / "openapi.yaml"
+    path.write_text(SPEC)
+    built = refs.RefIndex.for_spec(path)
+    assert refs.RefIndex.for_spec(path) is built
+    return built
+
+
+def test_pointer_table_and_reverse_index(index: refs.RefIndex) -> None:
+    operation = index.nodes["#/paths/~1invoices~1{id}/get"]
+    assert operation["operationId"] == "get_invoice"
+    schema = "#/paths/~1invoices~1{id}/get/responses/200/content/application~1json/schema"
+    assert index.references[schema] == "#/components/schemas/Invoice"
+    assert index.referrers_of("#/components/schemas/Invoice") == [
+        schema,
+        "#/components/schemas/InvoiceLine/properties/invoice",
+    ]
+    assert index.external == {
+        "#/components/schemas/Account": "ledger.yaml#/components/schemas/Account"
+    }
+
+
+def test_resolve_follows_chains_once_and_detects_cycles(index: refs.RefIndex) -> None:
+    assert index.resolve("#/components/schemas/Party") == {"type": "object"}
+    assert index._resolved["#/components/schemas/Party"] is index.schema("Customer")
+    assert index.resolve("#/components/schemas/Invoice")["type"] == "object"
+    with pytest.raises(refs.RefCycleError, match="Loop~1Back -> #/components/schemas/Loop$"):
+        index.schema("Loop")
+    with pytest.raises(KeyError):
+        index.resolve("#/components/schemas/Missing")
+    with pytest.raises(ValueError, match="external"):
+        index.resolve("ledger.yaml#/components/schemas/Account")
+
+
+def test_reachable_handles_recursive_schemas(index: refs.RefIndex) -> None:
+    assert index.reachable("#/paths") == {
+        "#/components/schemas/Invoice",
+        "#/components/schemas/InvoiceLine",
+        "#/components/schemas/Party",
+        "#/components/schemas/Customer",
+        "#/components/schemas/Account",
+    }
+    assert "#/components/schemas/Invoice" in index.reachable("#/components/schemas/Invoice")
@@ -0,0 +1,57 @@
+import json
+import subprocess
+from pathlib import Path
+
+from rerp_tooling import runtime
+from rerp_tooling.registry import RegistryClient
+
+
+def test_registry_url_is_plain_http_only_for_local_registries() -> None:
+    assert RegistryClient("127.0.0.1:5000").base_url == "http://127.0.0.1:5000"
+    assert RegistryClient("10.177.76.220:5000").base_url == "http://10.177.76.220:5000"
+    assert RegistryClient("localhost:5001").base_url == "http://localhost:5001"
+    assert RegistryClient("ghcr.io").base_url == "https://ghcr.io"
+    assert RegistryClient("http://ghcr.io/").base_url == "http://ghcr.io"
+
+
+def _publish(monkeypatch, address: str, repo_digests: list[str]) -> list[list[str]]:
+    pushed = []
+    monkeypatch.setattr(runtime, "_docker_output", lambda command, root: json.dumps(repo_digests))
+
+    def run(command, cwd, check):
+        pushed.append(command)
+        return subprocess.CompletedProcess(command, 0)
+
+    monkeypatch.setattr(runtime.subprocess, "run", run)
+    target = f"{address}/rerp-invoice"
+    assert runtime.publish_image(Path("."), "rerp-invoice:tilt", target, "dev-2") == 0
+    return pushed
+
+
+def test_publish_retags_a_manifest_the_registry_already_has(
+    registry, monkeypatch, capsys
+) -> None:
+    digest, document = registry.manifest(("base", 5000), ("binary", 300))
+    registry.manifests = {digest: document}
+    registry.tags = {"rerp-invoice": {"dev-1": digest}}
+
+    repo_digest = f"{registry.address}/rerp-invoice@{digest}"
+    assert _publish(monkeypatch, registry.address, [repo_digest]) == []
+
+    assert "nothing uploaded" in capsys.readouterr().out
+    assert RegistryClient(registry.address).manifest("rerp-invoice", "dev-2") == (digest, document)
+
+
+def test_publish_pushes_when_the_registry_lacks_the_digest(registry, monkeypatch) -> None:
+    registry.manifests = {}
+    registry.tags = {"rerp-invoice": {}}
+    target = f"{registry.address}/rerp-invoice"
+
+    pushed = _publish(
+        monkeypatch, registry.address, [f"{target}@sha256:gone", "elsewhere/rerp-invoice@sha256:x"]
+    )
+
+    assert pushed == [
+        ["docker", "tag", "rerp-invoice:tilt", f"{target}:dev-2"],
+        ["docker", "push", f"{target}:dev-2"],
+    ]
@@ -12,12 +12,16 @@ crates are ``rerp_{suite}_{service}_gen``.
 """
 
 import importlib
+import multiprocessing
+import os
 import sys
 from pathlib import Path
 
 import pytest
 import yaml
 
+from rerp_tooling import runtime
+
 cli = importlib.import_module("rerp_tooling.cli.main")
 
 
@@ -59,7 +63,7 @@ def test_gen_stubs_forwards_full_gen_command(monkeypatch) -> None:
 def test_microservice_build_is_debug_by_default(monkeypatch, tmp_path: Path) -> None:
     observed = []
     monkeypatch.setattr(
-        cli,
+        runtime,
         "build_microservice",
         lambda root, suite, service, release: observed.append((root, suite, service, release)) or 0,
     )
@@ -220,6 +224,77 @@ services:
         cli._run_bff_generate_system(["--suite", "accounting"], project_root=tmp_path)
 
 
+def test_bff_ref_validation_reports_dangling_and_cyclic_refs(tmp_path: Path) -> None:
+    loop = '    Loop: {$ref: "#/components/schemas/Loop"}\n'
+    spec = (
+        """openapi: 3.1.0
+paths:
+  /invoices:
+    get:
+      responses:
+        "200":
+          content:
+            application/json:
+              schema: {$ref: "#/components/schemas/Invoice"}
+components:
+  schemas:
+    Invoice:
+      properties:
+        lines: {type: array, items: {$ref: "#/components/schemas/InvoiceLine"}}
+        parent: {$ref: "#/components/schemas/Invoice"}
+"""
+        + loop
+    )
+    bff = tmp_path / "openapi_bff.yaml"
+    bff.write_text(spec)
+
+    with pytest.raises(RuntimeError) as raised:
+        cli._validate_bff_refs(bff, project_root=tmp_path)
+
+    message = str(raised.value)
+    assert "#/components/schemas/Invoice/properties/lines/items -> unresolved $ref" in message
+    assert "#/components/schemas/Loop -> #/components/schemas/Loop -> " in message
+    assert "/parent" not in message
+
+    bff.write_text(spec.replace("InvoiceLine", "Invoice").replace(loop, ""))
+    cli._validate_bff_refs(bff, project_root=tmp_path)
+
+
+@pytest.mark.skipif(
+    multiprocessing.get_start_method() != "fork",
+    reason="workers inherit the patched generator only when forked",
+)
+def test_bff_generate_system_runs_suites_concurrently_and_reports_every_failure(
+    tmp_path: Path, monkeypatch, capfd
+) -> None:
+    for suite in ("accounting", "hr", "sales"):
+        config = tmp_path / "openapi" / suite / "bff-suite-config.yaml"
+        config.parent.mkdir(parents=True)
+        config.write_text(f"suite: {suite}\n")
+
+    def generate_bff_spec(suite_config_path, output_path, base_dir):
+        if suite_config_path.parent.name == "hr":
+            raise ValueError("Operation ID conflict: list_staff")
+        output_path.write_text(f"# pid {os.getpid()}\n")
+
+    generate = importlib.import_module("brrtrouter_tooling.bff.generate")
+    monkeypatch.setattr(generate, "generate_bff_spec", generate_bff_spec)
+    monkeypatch.setattr(cli, "_bff_suite_services", lambda *a: {})
+    monkeypatch.setattr(cli, "_validate_bff_operation_coverage", lambda *a, **k: None)
+
+    with pytest.raises(SystemExit) as exited:
+        cli._run_bff_generate_system(["--jobs", "3"], project_root=tmp_path)
+
+    assert exited.value.code == 1
+    for suite in ("accounting", "sales"):
+        output = (tmp_path / "openapi" / suite / "openapi_bff.yaml").read_text()
+        assert output != f"# pid {os.getpid()}\n"
+    captured = capfd.readouterr()
+    assert "Error: hr BFF: ValueError: Operation ID conflict: list_staff" in captured.err
+    assert "Generating RERP sales BFF spec" in captured.out
+    assert "Generated 3 suite BFF(s) with 3 worker(s)" in captured.out
+
+
 def test_bff_generate_suite_shorthand_uses_suite_config(tmp_path: Path) -> None:
     translated = cli._translate_bff_generate(["--suite", "accounting"], project_root=tmp_path)
 
@@ -1,6 +1,11 @@
 import hashlib
+import io
+import os
+import tarfile
 from pathlib import Path
 
+import pytest
+
 from rerp_tooling import runtime
 
 
@@ -79,6 +84,34 @@ def test_discovery_requires_suite_qualified_helm_values_outside_accounting(
     ]
 
 
+def test_cached_discovery_only_redescribes_changed_services(tmp_path: Path, monkeypatch) -> None:
+    _service(tmp_path, "accounting", "invoice", "rerp_accounting_invoice", "invoice")
+    _service(tmp_path, "accounting", "budget", "rerp_accounting_budget", "budget")
+    values = tmp_path / "helm" / "rerp-microservice" / "values"
+    values.mkdir(parents=True)
+    (values / "invoice.yaml").write_text("service: {}\n")
+    (values / "budget.yaml").write_text("service: {}\n")
+    cold = runtime.discover_services(tmp_path, cache=True)
+    described = []
+    original = runtime.describe_service
+    monkeypatch.setattr(
+        runtime,
+        "describe_service",
+        lambda root, suite, service: described.append(service) or original(root, suite, service),
+    )
+
+    assert runtime.discover_services(tmp_path, cache=True) == cold
+    assert described == []
+
+    manifest = tmp_path / "microservices" / "accounting" / "budget" / "impl" / "Cargo.toml"
+    manifest.write_text(manifest.read_text().replace('name = "budget"', 'name = "budget_api"'))
+    warm = runtime.discover_services(tmp_path, cache=True)
+
+    assert described == ["budget"]
+    assert [item["binary_name"] for item in warm] == ["budget_api", "invoice"]
+    assert (tmp_path / ".rerp-cache" / "runtime-descriptors.json").is_file()
+
+
 def test_image_build_uses_narrow_staged_context(tmp_path: Path, monkeypatch) -> None:
     _service(tmp_path, "accounting", "invoice", "rerp_accounting_invoice", "invoice")
     artifact = tmp_path / "build_artifacts" / "amd64" / "accounting" / "invoice"
@@ -105,6 +138,7 @@ def test_image_build_uses_narrow_staged_context(tmp_path: Path, monkeypatch) ->
         return Result()
 
     monkeypatch.setattr(runtime.subprocess, "run", fake_run)
+    monkeypatch.setattr(runtime, "_docker_output", lambda command, root: "")
 
     result = runtime.build_service_image(
         tmp_path,
@@ -122,6 +156,66 @@ def test_image_build_uses_narrow_staged_context(tmp_path: Path, monkeypatch) ->
     assert observed["files"] == ["amd64/service"]
 
 
+def test_image_build_retags_an_image_with_the_same_context_fingerprint(
+    tmp_path: Path, monkeypatch
+) -> None:
+    _service(tmp_path, "accounting", "invoice", "rerp_accounting_invoice", "invoice")
+    doc = tmp_path / "microservices" / "accounting" / "invoice" / "gen" / "doc"
+    (doc / "openapi.yaml").write_text("openapi: 3.1.0\n")
+    artifact = tmp_path / "invoice"
+    artifact.write_bytes(b"binary")
+    digest_file = tmp_path / "invoice.sha256"
+    digest_file.write_text(hashlib.sha256(b"binary").hexdigest())
+    dockerfile = tmp_path / "Dockerfile"
+    dockerfile.write_text("FROM scratch\n")
+    monkeypatch.setattr(runtime, "_docker_architecture", lambda: "amd64")
+    labelled = {}
+    commands = []
+
+    def fake_output(command, root):
+        if command[:3] == ["docker", "image", "inspect"]:
+            return "sha256:base"
+        label = command[-1].removeprefix("label=")
+        return labelled.get(label, "")
+
+    def fake_run(command, cwd, check):
+        commands.append(command)
+        if command[:2] == ["docker", "build"]:
+            labelled[command[command.index("--label") + 1]] = f"sha256:image{len(commands)}"
+
+        class Result:
+            returncode = 0
+
+        return Result()
+
+    monkeypatch.setattr(runtime, "_docker_output", fake_output)
+    monkeypatch.setattr(runtime.subprocess, "run", fake_run)
+
+    def build(**options) -> list[str]:
+        assert (
+            runtime.build_service_image(
+                tmp_path,
+                "rerp-accounting-invoice",
+                dockerfile,
+                digest_file,
+                artifact,
+                "accounting",
+                "invoice",
+                **options,
+            )
+            == 0
+        )
+        return commands[-1]
+
+    assert build()[:2] == ["docker", "build"]
+    assert build() == ["docker", "tag", "sha256:image1", "rerp-accounting-invoice:tilt"]
+    assert build(no_cache=True)[:2] == ["docker", "build"]
+
+    (doc / "openapi.yaml").write_text("openapi: 3.1.1\n")
+    assert build()[:2] == ["docker", "build"]
+    assert len(labelled) == 2
+
+
 def test_stage_multiarch_context_selects_each_architecture_binary(tmp_path: Path) -> None:
     _service(tmp_path, "accounting", "invoice", "rerp_accounting_invoice", "invoice")
     dockerfile = tmp_path / "docker" / "microservices" / "Dockerfile"
@@ -148,6 +242,151 @@ def test_stage_multiarch_context_selects_each_architecture_binary(tmp_path: Path
     assert (context / "Dockerfile").is_file()
 
 
+def test_verified_copy_hashes_and_writes_in_one_chunked_pass(tmp_path: Path, monkeypatch) -> None:
+    artifact = tmp_path / "invoice"
+    artifact.write_bytes(bytes(range(256)) * 40)
+    artifact.chmod(0o755)
+    digest_file = tmp_path / "invoice.sha256"
+    digest_file.write_text(hashlib.sha256(artifact.read_bytes()).hexdigest() + "  invoice\n")
+    monkeypatch.setattr(runtime, "CHUNK_SIZE", 1000)
+    monkeypatch.setattr(
+        Path, "read_bytes", lambda self: (_ for _ in ()).throw(AssertionError("whole-file read"))
+    )
+    destination = tmp_path / "context" / "amd64" / "service"
+
+    digest = runtime._verified_copy(artifact, digest_file, destination)
+
+    assert digest == digest_file.read_text().split()[0]
+    with destination.open("rb") as copied, artifact.open("rb") as original:
+        assert copied.read() == original.read()
+    assert destination.stat().st_mode & 0o777 == 0o755
+    assert sorted(path.name for path in destination.parent.iterdir()) == ["service"]
+
+    trusted = tmp_path / "context" / "arm64" / "service"
+    assert runtime._verified_copy(artifact, digest_file, trusted, trusted_digest=digest) == digest
+    with trusted.open("rb") as copied, artifact.open("rb") as original:
+        assert copied.read() == original.read()
+
+
+def test_verified_copy_leaves_no_destination_on_digest_mismatch(tmp_path: Path) -> None:
+    artifact = tmp_path / "invoice"
+    artifact.write_bytes(b"new")
+    digest_file = tmp_path / "invoice.sha256"
+    digest_file.write_text("0" * 64)
+    destination = tmp_path / "context" / "service"
+
+    with pytest.raises(ValueError, match="digest mismatch"):
+        runtime._verified_copy(artifact, digest_file, destination)
+    with pytest.raises(ValueError, match="digest mismatch"):
+        runtime._verified_copy(artifact, digest_file, destination, trusted_digest="1" * 64)
+
+    assert list(destination.parent.iterdir()) == []
+
+
+def test_unchanged_artifacts_are_not_rehashed(tmp_path: Path, monkeypatch) -> None:
+    artifact = tmp_path / "invoice"
+    artifact.write_bytes(b"binary")
+    digest_file = tmp_path / "invoice.sha256"
+    digest_file.write_text(hashlib.sha256(b"binary").hexdigest())
+    rebuilt_digest = hashlib.sha256(b"rebuilt").hexdigest()
+    runtime._verified_copy(artifact, digest_file, tmp_path / "first" / "service")
+    assert (tmp_path / "invoice.verified.json").is_file()
+
+    hashed = []
+    original_sha256 = runtime.hashlib.sha256
+    monkeypatch.setattr(
+        runtime.hashlib, "sha256", lambda *args: hashed.append(args) or original_sha256(*args)
+    )
+    runtime._verified_copy(artifact, digest_file, tmp_path / "second" / "service")
+    assert hashed == []
+    assert (tmp_path / "second" / "service").read_bytes() == b"binary"
+
+    artifact.write_bytes(b"rebuilt")
+    digest_file.write_text(rebuilt_digest)
+    runtime._verified_copy(artifact, digest_file, tmp_path / "third" / "service")
+    assert len(hashed) == 1
+    assert (tmp_path / "third" / "service").read_bytes() == b"rebuilt"
+
+
+def test_restaging_rewrites_only_changed_inputs(tmp_path: Path) -> None:
+    _service(tmp_path, "accounting", "invoice", "rerp_accounting_invoice", "invoice")
+    dockerfile = tmp_path / "docker" / "microservices" / "Dockerfile"
+    dockerfile.parent.mkdir(parents=True)
+    dockerfile.write_text("FROM scratch\n")
+    doc = tmp_path / "microservices" / "accounting" / "invoice" / "gen" / "doc"
+    (doc / "openapi.yaml").write_text("openapi: 3.1.0\n")
+    (doc / "old.html").write_text("old")
+    artifacts = tmp_path / "build_artifacts"
+    for architecture in ("amd64", "arm64", "arm"):
+        artifact = artifacts / architecture / "invoice"
+        artifact.parent.mkdir(parents=True)
+        artifact.write_bytes(architecture.encode())
+        Path(f"{artifact}.sha256").write_text(hashlib.sha256(artifact.read_bytes()).hexdigest())
+
+    def stage() -> None:
+        assert (
+            runtime.stage_multiarch_context(
+                tmp_path, ".docker-context/invoice", artifacts, "accounting", "invoice"
+            )
+            == 0
+        )
+
+    stage()
+    context = tmp_path / ".docker-context" / "invoice"
+    inodes = {
+        path: (context / path).stat().st_ino
+        for path in ("amd64/service", "arm64/service", "arm/service", "doc/openapi.yaml")
+    }
+
+    arm64 = artifacts / "arm64" / "invoice"
+    arm64.write_bytes(b"arm64-v2")
+    Path(f"{arm64}.sha256").write_text(hashlib.sha256(b"arm64-v2").hexdigest())
+    (doc / "old.html").unlink()
+    stage()
+
+    assert (context / "arm64" / "service").read_bytes() == b"arm64-v2"
+    assert (context / "arm64" / "service").stat().st_ino != inodes["arm64/service"]
+    for path in ("amd64/service", "arm/service", "doc/openapi.yaml"):
+        assert (context / path).stat().st_ino == inodes[path]
+    assert not (context / "doc" / "old.html").exists()
+    assert sorted(path.name for path in context.parent.iterdir()) == ["invoice"]
+
+
+def test_parallel_staging_reports_every_failure_and_keeps_previous_context(
+    tmp_path: Path, capsys
+) -> None:
+    _service(tmp_path, "accounting", "invoice", "rerp_accounting_invoice", "invoice")
+    dockerfile = tmp_path / "docker" / "microservices" / "Dockerfile"
+    dockerfile.parent.mkdir(parents=True)
+    dockerfile.write_text("FROM scratch\n")
+    artifacts = tmp_path / "build_artifacts"
+    for architecture in ("amd64", "arm64", "arm"):
+        artifact = artifacts / architecture / "invoice"
+        artifact.parent.mkdir(parents=True)
+        artifact.write_bytes(architecture.encode())
+        Path(f"{artifact}.sha256").write_text(hashlib.sha256(artifact.read_bytes()).hexdigest())
+
+    def stage() -> int:
+        return runtime.stage_multiarch_context(
+            tmp_path, ".docker-context/invoice", artifacts, "accounting", "invoice", workers=4
+        )
+
+    assert stage() == 0
+    output = capsys.readouterr().out
+    for name in ("amd64/service", "arm64/service", "arm/service", "doc", "Dockerfile"):
+        assert f"  {name} " in output and " ms" in output
+
+    for architecture in ("arm64", "arm"):
+        (artifacts / architecture / "invoice").write_bytes(b"tampered")
+    assert stage() == 1
+    errors = capsys.readouterr().err
+    assert "arm64" in errors and "/arm/" in errors
+
+    context = tmp_path / ".docker-context" / "invoice"
+    assert (context / "arm64" / "service").read_bytes() == b"arm64"
+    assert sorted(path.name for path in context.parent.iterdir()) == ["invoice"]
+
+
 def test_base_build_uses_only_the_canonical_local_tag(tmp_path: Path, monkeypatch) -> None:
     dockerfile = tmp_path / "docker" / "base" / "Dockerfile"
     dockerfile.parent.mkdir(parents=True)
@@ -182,6 +421,219 @@ def test_base_build_uses_only_the_canonical_local_tag(tmp_path: Path, monkeypatc
     ]
 
 
+class _FakeDockerBuild:
+    """``subprocess.Popen`` stand-in that captures the streamed context."""
+
+    builds: list = []
+
+    def __init__(self, command, cwd, stdin) -> None:
+        self.command = command
+        self.stdin = io.BytesIO()
+        self.stdin.close = lambda: None
+        self.killed = False
+        _FakeDockerBuild.builds.append(self)
+
+    def kill(self) -> None:
+        self.killed = True
+
+    def wait(self) -> int:
+        return 0
+
+
+def test_streamed_image_context_is_deterministic(tmp_path: Path, monkeypatch) -> None:
+    _service(tmp_path, "accounting", "invoice", "rerp_accounting_invoice", "invoice")
+    doc = tmp_path / "microservices" / "accounting" / "invoice" / "gen" / "doc"
+    (doc / "openapi.yaml").write_text("openapi: 3.1.0\n")
+    artifact = tmp_path / "build_artifacts" / "invoice"
+    artifact.parent.mkdir(parents=True)
+    artifact.write_bytes(b"binary")
+    artifact.chmod(0o755)
+    digest_file = tmp_path / "build_artifacts" / "invoice.sha256"
+    digest_file.write_text(hashlib.sha256(b"binary").hexdigest())
+    dockerfile = tmp_path / "docker" / "microservices" / "Dockerfile"
+    dockerfile.parent.mkdir(parents=True)
+    dockerfile.write_text("FROM scratch\n")
+    monkeypatch.setattr(runtime, "_docker_architecture", lambda: "amd64")
+    monkeypatch.setattr(runtime.subprocess, "Popen", _FakeDockerBuild)
+    monkeypatch.setattr(runtime, "_docker_output", lambda command, root: "")
+    _FakeDockerBuild.builds = []
+
+    def build() -> bytes:
+        result = runtime.build_service_image(
+            tmp_path,
+            "rerp-accounting-invoice",
+            dockerfile,
+            digest_file,
+            artifact,
+            "accounting",
+            "invoice",
+            stream_context=True,
+        )
+        assert result == 0
+        return _FakeDockerBuild.builds[-1].stdin.getvalue()
+
+    first = build()
+    os.utime(doc / "openapi.yaml", ns=(1, 1))
+    assert build() == first
+
+    command = _FakeDockerBuild.builds[-1].command
+    assert command[-1] == "-"
+    assert command[command.index("--file") + 1] == "Dockerfile"
+    with tarfile.open(fileobj=io.BytesIO(first)) as archive:
+        members = archive.getmembers()
+        assert [member.name for member in members] == sorted(member.name for member in members)
+        assert {member.mtime for member in members} == {0}
+        assert archive.extractfile("amd64/service").read() == b"binary"
+        assert archive.getmember("amd64/service").mode == 0o755
+        assert archive.getmember("doc/openapi.yaml").mode == 0o644
+        assert archive.getmember("config").isdir()
+
+
+def test_streamed_image_context_kills_docker_on_digest_mismatch(
+    tmp_path: Path, monkeypatch
+) -> None:
+    _service(tmp_path, "accounting", "invoice", "rerp_accounting_invoice", "invoice")
+    artifact = tmp_path / "invoice"
+    artifact.write_bytes(b"new")
+    digest_file = tmp_path / "invoice.sha256"
+    digest_file.write_text("0" * 64)
+    dockerfile = tmp_path / "Dockerfile"
+    dockerfile.write_text("FROM scratch\n")
+    monkeypatch.setattr(runtime.subprocess, "Popen", _FakeDockerBuild)
+    monkeypatch.setattr(runtime, "_docker_output", lambda command, root: "")
+    _FakeDockerBuild.builds = []
+
+    result = runtime.build_service_image(
+        tmp_path,
+        "image",
+        dockerfile,
+        digest_file,
+        artifact,
+        "accounting",
+        "invoice",
+        stream_context=True,
+    )
+
+    assert result == 1
+    assert _FakeDockerBuild.builds[-1].killed
+
+
+def test_build_images_shares_one_base_build_and_reports_timings(
+    tmp_path: Path, monkeypatch, capsys
+) -> None:
+    values = tmp_path / "helm" / "rerp-microservice" / "values"
+    values.mkdir(parents=True)
+    for service in ("invoice", "ledger", "payments"):
+        _service(tmp_path, "accounting", service, f"rerp_accounting_{service}", service)
+        (values / f"accounting-{service}.yaml").write_text("service: {}\n")
+    monkeypatch.setattr(runtime, "_docker_architecture", lambda: "amd64")
+    bases = []
+    built = []
+    monkeypatch.setattr(runtime, "build_base_image", lambda root: bases.append(root) or 0)
+
+    def fake_build(root, image, dockerfile, hash_path, artifact, suite, service, **options):
+        built.append((image, artifact, options["descriptor"]["service"]))
+        if service == "ledger":
+            raise ValueError("artifact digest mismatch")
+        return 1 if service == "payments" else 0
+
+    monkeypatch.setattr(runtime, "build_service_image", fake_build)
+
+    assert runtime.build_service_images(tmp_path, services=["invoice", "invioce"]) == 1
+    assert "no delivered service matches: invioce" in capsys.readouterr().err
+    assert bases == [] and built == []
+
+    result = runtime.build_service_images(
+        tmp_path, suite="accounting", services=["invoice", "payments"], jobs=2
+    )
+
+    assert result == 1
+    assert len(bases) == 1
+    assert sorted(built) == [
+        (
+            "rerp-accounting-invoice",
+            tmp_path / "build_artifacts" / "amd64" / "accounting" / "invoice",
+            "invoice",
+        ),
+        (
+            "rerp-accounting-payments",
+            tmp_path / "build_artifacts" / "amd64" / "accounting" / "payments",
+            "payments",
+        ),
+    ]
+    output = capsys.readouterr().out
+    assert "Built 2 image(s)" in output
+    assert "rerp-accounting-invoice" in output and "ok" in output
+    assert "rerp-accounting-payments" in output and "failed (1)" in output
+
+    built.clear()
+    assert runtime.build_service_images(tmp_path, build_base=False, jobs=3) == 1
+    captured = capsys.readouterr()
+    assert "Built 3 image(s)" in captured.out
+    assert "rerp-accounting-ledger: artifact digest mismatch" in captured.err
+
+    monkeypatch.setattr(runtime, "build_base_image", lambda root: 3)
+    built.clear()
+    assert runtime.build_service_images(tmp_path) == 3
+    assert built == []
+
+
+def test_batch_build_runs_one_cargo_build_and_fans_out_artifacts(
+    tmp_path: Path, monkeypatch, capsys
+) -> None:
+    for suite, service in (("accounting", "invoice"), ("accounting", "ledger"), ("crm", "leads")):
+        _service(tmp_path, suite, service, f"rerp_{suite}_{service}", service)
+    monkeypatch.setattr(runtime, "_docker_architecture", lambda: "amd64")
+    monkeypatch.setattr(runtime.platform, "system", lambda: "Linux")
+    output = tmp_path / "microservices" / "target" / "x86_64-unknown-linux-musl" / "debug"
+    commands = []
+
+    def cargo(command, cwd, check):
+        commands.append((command, cwd))
+        output.mkdir(parents=True, exist_ok=True)
+        for binary in ("invoice", "ledger"):
+            if not (output / binary).exists():
+                (output / binary).write_bytes(f"{binary}-v1".encode())
+        return runtime.subprocess.CompletedProcess(command, 0)
+
+    assert runtime.build_microservices(tmp_path, suite="accounting", runner=cargo) == 0
+
+    assert commands == [
+        (
+            [
+                "cargo",
+                "build",
+                "--target",
+                "x86_64-unknown-linux-musl",
+                "-p",
+                "rerp_accounting_invoice",
+                "-p",
+                "rerp_accounting_ledger",
+            ],
+            tmp_path / "microservices",
+        )
+    ]
+    artifacts = tmp_path / "build_artifacts" / "amd64" / "accounting"
+    for binary in ("invoice", "ledger"):
+        data = (artifacts / binary).read_bytes()
+        assert data == f"{binary}-v1".encode()
+        assert runtime._expected_digest(artifacts / f"{binary}.sha256") == (
+            hashlib.sha256(data).hexdigest()
+        )
+    capsys.readouterr()
+
+    os.utime(output / "ledger", ns=(1, 1))
+    ledger = (artifacts / "ledger").stat().st_mtime_ns
+    invoice = (artifacts / "invoice").stat().st_ino
+    assert runtime.build_microservices(tmp_path, suite="accounting", runner=cargo) == 0
+    assert (artifacts / "invoice").stat().st_ino == invoice
+    assert (artifacts / "ledger").stat().st_mtime_ns != ledger
+    log = capsys.readouterr().out
+    assert "accounting/invoice (unchanged)" in log and "accounting/ledger (updated" in log
+
+    assert runtime.build_microservices(tmp_path, services=["missing"], runner=cargo) == 1
+
+
 def test_image_build_rejects_stale_hash_before_docker(tmp_path: Path, monkeypatch) -> None:
     _service(tmp_path, "accounting", "invoice", "rerp_accounting_invoice", "invoice")
     artifact = tmp_path / "invoice"
@@ -195,6 +647,7 @@ def test_image_build_rejects_stale_hash_before_docker(tmp_path: Path, monkeypatc
         "run",
         lambda *args, **kwargs: (_ for _ in ()).throw(AssertionError("docker must not run")),
     )
+    monkeypatch.setattr(runtime, "_docker_output", lambda command, root: "")
 
     assert (
         runtime.build_service_image(
@@ -0,0 +1,89 @@
+import datetime
+from pathlib import Path
+
+import yaml
+
+from rerp_tooling import specs
+
+SPEC = """\
+openapi: 3.1.0
+info: {title: accounting, version: "1"}
+paths:
+  /invoices:
+    get:
+      operationId: list_invoices
+      responses:
+        200:
+          content:
+            application/json:
+              schema: {$ref: "#/components/schemas/Invoice"}
+components:
+  schemas:
+    Invoice:
+      type: object
+"""
+
+
+def _spec(tmp_path: Path, monkeypatch, text: str = SPEC) -> Path:
+    monkeypatch.setenv("RERP_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(specs, "_LOADED", {})
+    path = tmp_path / "openapi.yaml"
+    path.write_text(text)
+    return path
+
+
+def test_load_spec_matches_safe_load_and_keeps_integer_keys(tmp_path: Path, monkeypatch) -> None:
+    path = _spec(tmp_path, monkeypatch)
+    spec = specs.load_spec(path)
+
+    assert spec == yaml.safe_load(SPEC)
+    assert 200 in spec["paths"]["/invoices"]["get"]["responses"]
+    assert specs.load_spec(path) is spec
+
+    monkeypatch.setattr(specs, "_LOADED", {})
+    assert specs.load_spec(path) == yaml.safe_load(SPEC)
+
+
+def test_later_processes_reuse_the_parse_until_content_or_loader_changes(
+    tmp_path: Path, monkeypatch
+) -> None:
+    path = _spec(tmp_path, monkeypatch)
+    specs.load_spec(path)
+    assert len(list((tmp_path / "cache" / "specs").glob("*.marshal"))) == 1
+
+    parsed: list[Path] = []
+    real_parse = specs._parse
+    monkeypatch.setattr(
+        specs, "_parse", lambda *args: parsed.append(args[2]) or real_parse(*args)
+    )
+    monkeypatch.setattr(specs, "_LOADED", {})
+    assert specs.load_spec(path)["components"]["schemas"]["Invoice"]["type"] == "object"
+    assert parsed == []
+
+    path.write_text(SPEC.replace("list_invoices", "find_invoices"))
+    assert "find_invoices" in str(specs.load_spec(path)["paths"])
+    assert parsed == [path]
+
+    monkeypatch.setattr(specs, "VERSION", specs.VERSION + 1)
+    monkeypatch.setattr(specs, "_LOADED", {})
+    specs.load_spec(path)
+    assert parsed == [path, path]
+
+
+def test_corrupt_and_unmarshallable_entries_are_parsed_again(tmp_path: Path, monkeypatch) -> None:
+    path = _spec(tmp_path, monkeypatch)
+    specs.load_spec(path)
+    (entry,) = (tmp_path / "cache" / "specs").glob("*.marshal")
+    entry.write_bytes(b"\x00not marshal")
+    monkeypatch.setattr(specs, "_LOADED", {})
+    assert specs.load_spec(path) == yaml.safe_load(SPEC)
+
+    dated = _spec(tmp_path, monkeypatch, "info: {released: 2024-01-31}\n")
+    assert specs.load_spec(dated)["info"]["released"] == datetime.date(2024, 1, 31)
+    assert len(list((tmp_path / "cache" / "specs").glob("*.marshal"))) == 1
+
+
+def test_empty_documents_load_as_empty_specs(tmp_path: Path, monkeypatch) -> None:
+    path = _spec(tmp_path, monkeypatch, "")
+    assert specs.load_spec(path) == {}
+    assert specs.load_spec(path, cache=False) == {}